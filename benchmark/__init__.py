@@ -0,0 +1,5 @@
+"""
+합성 인스타그램 페이지로 수집 함수의 성능을 측정하는 오프라인 벤치마크
+
+실행: python -m benchmark
+"""
\ No newline at end of file
@@ -0,0 +1,57 @@
+import argparse
+import json
+import logging
+import sys
+
+STAGES = ["getinfo_http", "getinfo_browser", "findview", "findview_harvest", "comments", "accounts"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark with synthetic Instagram fixtures')
+    parser.add_argument('--comments', type=int, default=500, help='Number of comments on the fixture post (default: 500)')
+    parser.add_argument('--tiles', type=int, default=40, help='Number of reels in the fixture profile grid (default: 40)')
+    parser.add_argument('--load-delay', type=int, default=150, help='Lazy-loading delay for comments and tiles in ms (default: 150)')
+    parser.add_argument('--capture', choices=['dom', 'network'], default='dom', help='Comment capture mode to measure (default: dom)')
+    parser.add_argument('--scroll-wait-timeout', type=float, default=2.0, help='Max seconds to wait after each comment scroll (default: 2)')
+    parser.add_argument('--prune-comments', nargs='?', type=int, const=30, metavar='KEEP',
+                        help='Prune extracted comment nodes during the comments stage, keeping the last KEEP (default: 30)')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of get_post_info lookups per mode (default: 3)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, help='Stages to run (default: all)')
+    parser.add_argument('--headed', action='store_true', help='Show the browser window')
+    parser.add_argument('-o', '--output', help='Also write the full report (including per-method call counts) to this JSON file')
+    args = parser.parse_args()
+
+    # 수집 함수의 진행 메시지는 그대로 출력하고, 로그는 경고 이상만 표시
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        print("Playwright is required: pip install playwright && playwright install chromium")
+        sys.exit(1)
+
+    from benchmark.harness import format_report, run_benchmark
+
+    report = run_benchmark(
+        comments=args.comments,
+        tiles=args.tiles,
+        load_delay_ms=args.load_delay,
+        capture_mode=args.capture,
+        wait_timeout=args.scroll_wait_timeout,
+        repeat=args.repeat,
+        headless=not args.headed,
+        stages=args.stages,
+        prune_keep=args.prune_comments,
+    )
+
+    print()
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
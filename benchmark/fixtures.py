@@ -0,0 +1,296 @@
+import html
+import json
+import random
+import re
+
+from module.comment import COMMENTS_XPATH_TEMPLATE, COMMENT_LIST_SUBPATH, COMMENT_FIELD_XPATHS
+
+# 합성 게시물/프로필 기본값
+FIXTURE_USERNAME = "bench_creator"
+FIXTURE_POST_ID = "BenchPost01"
+FIXTURE_MEDIA_PK = "3141592653"
+FIXTURE_MOUNT_ID = "mount_0_0_Bx"
+
+_STEP_RE = re.compile(r'^([a-z]+)(?:\[(\d+)\])?$')
+
+
+class _Node:
+    """XPath 경로들로부터 만든 HTML 트리 노드"""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.children = {}
+        self.attrs = {}
+        self.text = ""
+
+    def child(self, tag, position):
+        key = (tag, position)
+        if key not in self.children:
+            self.children[key] = _Node(tag)
+        return self.children[key]
+
+    def render(self):
+        attrs = "".join(f' {name}="{html.escape(value)}"' for name, value in self.attrs.items())
+        inner = [self.text]
+        # 태그별로 1..최대 위치까지 렌더링 (빈 위치는 같은 태그의 빈 요소로 채워 XPath 인덱스 유지)
+        tags = []
+        for tag, _ in self.children:
+            if tag not in tags:
+                tags.append(tag)
+        for tag in tags:
+            last = max(position for child_tag, position in self.children if child_tag == tag)
+            for position in range(1, last + 1):
+                node = self.children.get((tag, position))
+                inner.append(node.render() if node else f"<{tag}></{tag}>")
+        return f"<{self.tag}{attrs}>{''.join(inner)}</{self.tag}>"
+
+
+def _walk(root, path):
+    """'/div/div[2]/span' 형식의 경로를 따라 노드를 만들고 마지막 노드 반환"""
+    node = root
+    for step in path.strip("./").split("/"):
+        match = _STEP_RE.match(step)
+        if not match:
+            raise ValueError(f"Unsupported XPath step: {step}")
+        node = node.child(match.group(1), int(match.group(2) or 1))
+    return node
+
+
+def _comment_item_template():
+    """COMMENT_FIELD_XPATHS 구조를 따르는 댓글 요소 HTML ({{field}} 자리표시자 포함)"""
+    item = _Node("div")
+    item.attrs["style"] = "min-height: 64px;"
+    for field, path in COMMENT_FIELD_XPATHS.items():
+        _walk(item, path).text = "{{%s}}" % field
+    return item.render()
+
+
+def generate_comments(count, seed=0):
+    """
+    합성 댓글 데이터를 생성하는 함수
+
+    Returns:
+        list: {"pk", "author", "content", "created_at", "likes"} 딕셔너리 리스트
+    """
+    rng = random.Random(seed)
+    words = ["좋아요", "대박", "멋져요", "wow", "최고", "ㅋㅋㅋ", "nice", "love", "감사합니다", "🔥"]
+    base_time = 1735689600
+    return [
+        {
+            "pk": str(10**17 + i),
+            "author": f"user_{rng.randrange(count * 2 or 1):05d}",
+            "content": f"{' '.join(rng.choice(words) for _ in range(rng.randint(1, 8)))} #{i}",
+            "created_at": base_time + i * 37,
+            "likes": rng.choice([0, 0, 1, 2, 5, 13, 120]),
+        }
+        for i in range(count)
+    ]
+
+
+def _comment_dom_row(comment):
+    return [
+        comment["author"],
+        comment["content"],
+        "1주",
+        f"좋아요 {comment['likes']}개" if comment["likes"] else "답글 달기",
+    ]
+
+
+def comments_api_payload(comments):
+    """댓글 API 응답 형식({"comments": [...]})으로 변환 (module.capture가 파싱하는 구조)"""
+    return {
+        "comments": [
+            {
+                "pk": comment["pk"],
+                "text": comment["content"],
+                "user": {"username": comment["author"]},
+                "created_at": comment["created_at"],
+                "comment_like_count": comment["likes"],
+            }
+            for comment in comments
+        ],
+        "has_more_comments": False,
+    }
+
+
+def post_page_html(comments, initial=15, batch=15, load_delay_ms=150,
+                   username=FIXTURE_USERNAME, post_id=FIXTURE_POST_ID, media_pk=FIXTURE_MEDIA_PK):
+    """
+    mount_* 구조, og:description 메타 태그, 지연 로딩 댓글 패널을 가진 게시물 페이지
+
+    처음 initial개 댓글만 렌더링하고, 패널이 바닥 근처까지 스크롤되면 댓글 API를 fetch로 호출해
+    batch개씩 load_delay_ms 뒤에 추가 (실제 사이트처럼 응답 캡처와 DOM 추출 모두 가능)
+    """
+    mount = _Node("div")
+    mount.attrs["id"] = FIXTURE_MOUNT_ID
+    panel_path = COMMENTS_XPATH_TEMPLATE.split("']", 1)[1]
+    panel = _walk(mount, panel_path)
+    panel.attrs["style"] = "height: 600px; overflow-y: auto;"
+    comment_list = _walk(panel, COMMENT_LIST_SUBPATH)
+    comment_list.text = "{{comment_list}}"
+    # 게시물 본문 대기 선택자(div.x5yr21d)용 요소
+    _walk(mount, "/div/div/div[1]").attrs["class"] = "x5yr21d"
+    _walk(mount, "/div/div/div[1]").text = "post media"
+
+    template = _comment_item_template()
+
+    def render_item(comment):
+        author, content, date, likes = _comment_dom_row(comment)
+        return (template.replace("{{author}}", html.escape(author))
+                .replace("{{content}}", html.escape(content))
+                .replace("{{date}}", html.escape(date))
+                .replace("{{likes}}", html.escape(likes)))
+
+    initial_html = "".join(render_item(comment) for comment in comments[:initial])
+    body = mount.render().replace("{{comment_list}}", initial_html)
+
+    total = len(comments)
+    likes_total = 1234 + total
+    description = (f"{likes_total:,} likes, {total} comments - {username} on January 1, 2025: "
+                   f"\"benchmark fixture post\"")
+
+    script = f"""
+<script>
+(() => {{
+    const template = {json.dumps(template)};
+    const escape = (s) => String(s).replace(/[&<>"]/g, c => ({{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}})[c]);
+    const xpath = {json.dumps(COMMENTS_XPATH_TEMPLATE.format(mount_id=FIXTURE_MOUNT_ID))};
+    const panel = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const list = document.evaluate(xpath + {json.dumps(COMMENT_LIST_SUBPATH)}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    let offset = {min(initial, total)};
+    let loading = false;
+    panel.addEventListener('scroll', () => {{
+        if (loading || offset >= {total}) return;
+        if (panel.scrollTop + panel.clientHeight < panel.scrollHeight - 200) return;
+        loading = true;
+        fetch('/api/v1/media/{media_pk}/comments/?offset=' + offset + '&count={batch}')
+            .then(r => r.json())
+            .then(data => setTimeout(() => {{
+                for (const c of data.comments) {{
+                    const likes = c.comment_like_count ? '좋아요 ' + c.comment_like_count + '개' : '답글 달기';
+                    const item = template.replace('{{{{author}}}}', escape(c.user.username))
+                        .replace('{{{{content}}}}', escape(c.text))
+                        .replace('{{{{date}}}}', '1주')
+                        .replace('{{{{likes}}}}', escape(likes));
+                    list.insertAdjacentHTML('beforeend', item);
+                }}
+                offset += data.comments.length;
+                loading = false;
+            }}, {load_delay_ms}));
+    }});
+}})();
+</script>"""
+
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            f"<meta property=\"og:description\" content=\"{html.escape(description)}\">"
+            f"<title>{html.escape(username)} on Instagram</title></head>"
+            f"<body>{body}{script}</body></html>")
+
+
+def _tile_html(username, post_id, views):
+    """a > div[2]/div[2]/div/div/div/span/span 경로에 조회수가 있는 릴스 타일"""
+    tile = _Node("a")
+    tile.attrs["href"] = f"/{username}/reel/{post_id}/"
+    tile.attrs["style"] = "display: block; height: 320px;"
+    _walk(tile, "/div[1]").text = "thumbnail"
+    _walk(tile, "/div[2]/div[2]/div/div/div/span/span").text = views
+    return tile.render()
+
+
+def generate_tiles(count, seed=0):
+    """합성 릴스 타일 (post_id, 조회수 텍스트) 리스트"""
+    rng = random.Random(seed)
+    tiles = []
+    for i in range(count):
+        views = rng.choice([f"{rng.randint(1, 999)}", f"{rng.randint(1, 99)}.{rng.randint(0, 9)}만",
+                            f"{rng.randint(1, 9)},{rng.randint(100, 999)}"])
+        tiles.append((f"BenchReel{i:04d}", views))
+    return tiles
+
+
+def reels_grid_html(tiles, initial=12, batch=12, load_delay_ms=150, username=FIXTURE_USERNAME):
+    """
+    스크롤 시 타일이 batch개씩 지연 추가되는 프로필 reels 그리드 페이지
+    """
+    initial_html = "".join(_tile_html(username, post_id, views) for post_id, views in tiles[:initial])
+    rest = [_tile_html(username, post_id, views) for post_id, views in tiles[initial:]]
+    script = f"""
+<script>
+(() => {{
+    const rest = {json.dumps(rest)};
+    const grid = document.getElementById('grid');
+    let loading = false;
+    window.addEventListener('scroll', () => {{
+        if (loading || rest.length === 0) return;
+        if (window.scrollY + window.innerHeight < document.body.scrollHeight - 400) return;
+        loading = true;
+        setTimeout(() => {{
+            grid.insertAdjacentHTML('beforeend', rest.splice(0, {batch}).join(''));
+            loading = false;
+        }}, {load_delay_ms});
+    }});
+}})();
+</script>"""
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(username)}</title></head>"
+            f"<body><div id=\"{FIXTURE_MOUNT_ID}\"><main><div id=\"grid\">{initial_html}</div></main></div>"
+            f"{script}</body></html>")
+
+
+def home_page_html():
+    return "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Instagram</title></head><body><main>home</main></body></html>"
+
+
+def rate_limited_html():
+    return ("<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Instagram</title></head>"
+            "<body><main>Please wait a few minutes before you try again.</main></body></html>")
+
+
+class FixtureSite:
+    """
+    합성 인스타그램 사이트 (경로 → 응답 생성)
+
+    page.route 핸들러와 로컬 HTTP 서버가 같은 응답을 사용
+    """
+
+    def __init__(self, comments=500, tiles=60, load_delay_ms=150, seed=0, challenge_every=0):
+        self.comments = generate_comments(comments, seed)
+        self.tiles = generate_tiles(tiles, seed)
+        self.load_delay_ms = load_delay_ms
+        self.post_url = f"https://www.instagram.com/p/{FIXTURE_POST_ID}/"
+        self.requests_served = 0
+        # 게시물 페이지 요청 challenge_every번마다 한 번씩 제한 페이지(429) 응답 (0이면 사용 안 함)
+        self.challenge_every = challenge_every
+        self.post_requests = 0
+        self._post_html = post_page_html(self.comments, load_delay_ms=load_delay_ms)
+        self._grid_html = reels_grid_html(self.tiles, load_delay_ms=load_delay_ms)
+
+    @property
+    def target_reel(self):
+        """조회수 탐색 대상 타일 (처음 렌더링된 범위 밖이라 몇 번의 스크롤이 필요한 위치)"""
+        return self.tiles[min(len(self.tiles) - 1, 20)]
+
+    def respond(self, path):
+        """
+        요청 경로에 대한 응답을 생성하는 함수
+
+        Returns:
+            tuple: (상태 코드, content-type, 본문 문자열)
+        """
+        self.requests_served += 1
+        route_path, _, query = path.partition("?")
+        if route_path in ("", "/"):
+            return 200, "text/html; charset=utf-8", home_page_html()
+        if re.match(r'^/(p|reel|reels)/[^/]+/?$', route_path):
+            self.post_requests += 1
+            if self.challenge_every and self.post_requests % self.challenge_every == 0:
+                return 429, "text/html; charset=utf-8", rate_limited_html()
+            return 200, "text/html; charset=utf-8", self._post_html
+        if route_path.rstrip("/") == f"/{FIXTURE_USERNAME}/reels":
+            return 200, "text/html; charset=utf-8", self._grid_html
+        if route_path.startswith(f"/api/v1/media/{FIXTURE_MEDIA_PK}/comments"):
+            params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+            offset = int(params.get("offset", 0))
+            count = int(params.get("count", 15))
+            payload = comments_api_payload(self.comments[offset:offset + count])
+            return 200, "application/json", json.dumps(payload, ensure_ascii=False)
+        return 404, "text/plain", "not found"
\ No newline at end of file
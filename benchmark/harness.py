@@ -0,0 +1,368 @@
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import logging
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # Linux에서는 /proc에서 직접 읽음
+    psutil = None
+
+from benchmark.fixtures import FIXTURE_USERNAME, FixtureSite
+from module.comment import collect_instagram_comments
+from module.accounts import AccountChallenged, AccountPool
+from module.findview import ViewCountCache, find_post_views, find_posts_views
+from module.getinfo import get_post_info
+from module.http_client import KeepAliveClient
+from module.metrics import CountingProxy
+
+
+def peak_rss_kb():
+    """현재 프로세스와 종료된 자식 프로세스(브라우저)의 최대 RSS (KB, 측정 불가 시 None)"""
+    if resource is None:
+        return {"self": None, "children": None}
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+# 단계 실행 중 브라우저 RSS를 측정하는 간격 (초)
+RSS_SAMPLE_INTERVAL = 0.1
+
+
+def _proc_status(pid):
+    """/proc/<pid>/status에서 (부모 PID, RSS KB) 읽기 (프로세스가 이미 종료되었으면 None)"""
+    ppid, rss = None, 0
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("PPid:"):
+                    ppid = int(line.split()[1])
+                elif line.startswith("VmRSS:"):
+                    rss = int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return ppid, rss
+
+
+def browser_rss_kb(root_pid=None):
+    """
+    현재 프로세스의 하위 프로세스(Playwright 드라이버와 브라우저)의 현재 RSS 합계
+
+    Returns:
+        int: RSS 합계 (KB) 또는 psutil도 /proc도 없으면 None
+    """
+    root_pid = root_pid or os.getpid()
+    if psutil is not None:
+        total = 0
+        try:
+            children = psutil.Process(root_pid).children(recursive=True)
+        except psutil.Error:
+            return None
+        for child in children:
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total // 1024
+    if not os.path.isdir("/proc"):
+        return None
+
+    processes = {}
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            status = _proc_status(name)
+            if status is not None:
+                processes[int(name)] = status
+    total = 0
+    parents = {root_pid}
+    # 부모가 이미 찾은 하위 프로세스인 프로세스를 더 이상 늘지 않을 때까지 추가
+    while True:
+        found = {pid for pid, (ppid, _) in processes.items() if ppid in parents and pid not in parents}
+        if not found:
+            break
+        total += sum(processes[pid][1] for pid in found)
+        parents |= found
+    return total
+
+
+class RssSampler:
+    """별도 스레드에서 브라우저 RSS를 주기적으로 측정해 최댓값을 기록하는 클래스"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL, sample=browser_rss_kb):
+        self.interval = interval
+        self.sample = sample
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _record(self):
+        rss = self.sample()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._record()
+
+    def start(self):
+        self._record()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """측정을 멈추고 최대 RSS (KB, 측정 불가 시 None)를 반환"""
+        self._stop.set()
+        self._thread.join()
+        self._record()
+        return self.peak
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    site = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status, content_type, body = self.site.respond(self.path)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(site):
+    """
+    합성 사이트를 제공하는 로컬 HTTP 서버 실행 (HTTP 모드 get_post_info 측정용)
+
+    Returns:
+        tuple: (서버, base_url)
+    """
+    handler = type("FixtureHandler", (_FixtureHandler,), {"site": site})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def install_fixture_routes(page, site):
+    """page.route로 instagram.com 요청은 합성 응답으로, 그 외 요청은 차단"""
+    def handle(route):
+        parts = urlsplit(route.request.url)
+        if not parts.hostname or not parts.hostname.endswith("instagram.com"):
+            return route.abort()
+        path = parts.path + ("?" + parts.query if parts.query else "")
+        status, content_type, body = site.respond(path)
+        return route.fulfill(status=status, content_type=content_type, body=body)
+    page.route("**/*", handle)
+
+
+def _fixture_login(browser, username, password, session_dir=None, resource_policy=None):
+    """로그인 폼 없이 계정별 새 컨텍스트를 여는 대역 로그인 (AccountPool의 login 인자용)"""
+    context = browser.new_context()
+    return context.new_page(), True
+
+
+class Stage:
+    """
+    단계 하나의 벽시계 시간, Playwright 왕복 횟수, 단계 중 브라우저 최대 RSS 측정
+
+    단계에서 발생한 Exception은 결과의 error에 기록하고 다음 단계로 진행 (KeyboardInterrupt 등은 그대로 전달)
+    """
+
+    def __init__(self, name, counter):
+        self.name = name
+        self.counter = counter
+        self.result = {"stage": name}
+
+    def __enter__(self):
+        self.counter.clear()
+        self.sampler = RssSampler()
+        self.sampler.start()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.result["wall_seconds"] = round(time.perf_counter() - self.started, 3)
+        self.result["round_trips"] = sum(self.counter.values())
+        self.result["calls"] = dict(self.counter.most_common())
+        self.result["browser_peak_rss_kb"] = self.sampler.stop()
+        if exc is not None:
+            self.result["error"] = f"{exc_type.__name__}: {exc}"
+        return exc_type is not None and issubclass(exc_type, Exception)
+
+
+def run_benchmark(comments=500, tiles=40, load_delay_ms=150, capture_mode="dom", wait_timeout=2.0,
+                  repeat=3, headless=True, stages=None, accounts=3, account_posts=12, challenge_every=5,
+                  prune_keep=None):
+    """
+    합성 사이트에서 get_post_info, find_post_views, collect_instagram_comments를 측정하는 함수
+
+    Args:
+        comments: 게시물의 댓글 수
+        tiles: 프로필 reels 그리드의 타일 수
+        load_delay_ms: 댓글/타일 지연 로딩 시간 (ms)
+        capture_mode: 댓글 수집 경로 ('dom' 또는 'network')
+        wait_timeout: 스크롤 후 댓글 패널 변화 대기 시간 (초)
+        repeat: get_post_info 반복 횟수
+        headless: 헤드리스 브라우저 사용 여부
+        stages: 실행할 단계 이름 목록 (없으면 모두)
+        accounts: 계정 풀 단계의 대역 계정 수
+        account_posts: 계정 풀 단계에서 배정할 게시물 수
+        challenge_every: 계정 풀 단계에서 게시물 페이지 요청 몇 번마다 제한 페이지(429)를 응답할지
+        prune_keep: 댓글 단계에서 DOM 정리를 사용할 때 남겨 둘 댓글 요소 수 (None이면 정리하지 않음)
+
+    Returns:
+        dict: 설정과 단계별 측정 결과
+    """
+    from playwright.sync_api import sync_playwright
+
+    logger = logging.getLogger("benchmark")
+    site = FixtureSite(comments, tiles, load_delay_ms)
+    counter = Counter()
+    selected = set(stages or ["getinfo_http", "getinfo_browser", "findview", "findview_harvest", "comments", "accounts"])
+    results = []
+    started = time.perf_counter()
+
+    if "getinfo_http" in selected:
+        server, base_url = start_fixture_server(site)
+        client = KeepAliveClient(base_url=base_url)
+        try:
+            with Stage("getinfo_http", counter) as stage:
+                for _ in range(repeat):
+                    info = get_post_info(site.post_url, logger, fetch_mode="http", http_client=client)
+                stage.result["calls_per_lookup"] = repeat
+                stage.result["http_requests"] = client.requests_sent
+                stage.result["http_connections"] = client.connections_opened
+                stage.result["ok"] = bool(info)
+            results.append(stage.result)
+        finally:
+            client.close()
+            server.shutdown()
+
+    with sync_playwright() as p:
+        browser = CountingProxy(p.chromium.launch(headless=headless), counter,
+                                on_page=lambda page: install_fixture_routes(page, site))
+        try:
+            if "getinfo_browser" in selected:
+                with Stage("getinfo_browser", counter) as stage:
+                    for _ in range(repeat):
+                        info = get_post_info(site.post_url, logger, browser=browser)
+                    stage.result["calls_per_lookup"] = repeat
+                    stage.result["ok"] = bool(info)
+                results.append(stage.result)
+
+            target_id, target_views = site.target_reel
+            if "findview" in selected:
+                page = browser.new_page()
+                with Stage("findview", counter) as stage:
+                    views = find_post_views(FIXTURE_USERNAME, target_id, logger, page=page)
+                    stage.result["ok"] = views == target_views
+                results.append(stage.result)
+                page.close()
+
+            if "findview_harvest" in selected:
+                page = browser.new_page()
+                cache = ViewCountCache()
+                with Stage("findview_harvest", counter) as stage:
+                    wanted = [post_id for post_id, _ in site.tiles]
+                    found = find_posts_views(FIXTURE_USERNAME, wanted, logger, page=page, view_cache=cache)
+                    stage.result["tiles_found"] = sum(1 for views in found.values() if views)
+                    stage.result["tiles_total"] = len(wanted)
+                    stage.result["ok"] = found.get(target_id) == target_views
+                results.append(stage.result)
+                page.close()
+
+            if "comments" in selected:
+                page = browser.new_page()
+                with Stage("comments", counter) as stage:
+                    data = collect_instagram_comments(page, site.post_url, capture_mode=capture_mode,
+                                                      wait_timeout=wait_timeout, prune_keep=prune_keep)
+                    collected = data["metadata"]["total_comments"]
+                    elapsed = time.perf_counter() - stage.started
+                    stage.result["comments_collected"] = collected
+                    stage.result["comments_total"] = comments
+                    stage.result["comments_per_second"] = round(collected / elapsed, 2) if elapsed else None
+                    stage.result["scrolls"] = data["metadata"]["total_scrolls"]
+                    stage.result["scroll_wait_total"] = data["metadata"].get("scroll_wait_total")
+                    if prune_keep is not None:
+                        stage.result["pruned_nodes"] = data["metadata"].get("pruned_nodes")
+                results.append(stage.result)
+                page.close()
+
+            if "accounts" in selected:
+                # 대역 계정들로 게시물을 나눠 처리하면서 제한 페이지를 만난 계정의 쿨다운과 재배정 확인
+                pool = AccountPool([(f"bench_account_{i}", "-") for i in range(accounts)],
+                                   navigations_per_minute=600, burst=2, cooldown=1.0,
+                                   session_dir=None, login=_fixture_login)
+                urls = [f"https://www.instagram.com/p/BenchPost{i:02d}/" for i in range(account_posts)]
+                site.challenge_every = challenge_every
+                with Stage("accounts", counter) as stage:
+                    done = 0
+                    for url, page in pool.assign(browser, urls):
+                        if page is None:
+                            continue
+                        try:
+                            page.goto(url)
+                            done += 1
+                        except AccountChallenged as e:
+                            pool.requeue(url, e)
+                    stage.result["posts_done"] = done
+                    stage.result["posts_total"] = account_posts
+                    stage.result["ok"] = done == account_posts
+                    stage.result.update(pool.summary())
+                results.append(stage.result)
+                site.challenge_every = 0
+                pool.close()
+        finally:
+            browser.close()
+
+    return {
+        "config": {
+            "comments": comments,
+            "tiles": tiles,
+            "load_delay_ms": load_delay_ms,
+            "capture_mode": capture_mode,
+            "wait_timeout": wait_timeout,
+            "repeat": repeat,
+            "headless": headless,
+            "prune_keep": prune_keep,
+        },
+        "stages": results,
+        "fixture_requests": site.requests_served,
+        "total_wall_seconds": round(time.perf_counter() - started, 3),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def format_report(report):
+    """측정 결과를 표 형식 문자열로 변환"""
+    lines = [
+        f"{'stage':<18}{'wall(s)':>10}{'round trips':>13}{'browser RSS(MB)':>17}  details",
+        "-" * 80,
+    ]
+    for stage in report["stages"]:
+        rss = stage.get("browser_peak_rss_kb")
+        details = {key: value for key, value in stage.items()
+                   if key not in ("stage", "wall_seconds", "round_trips", "calls", "browser_peak_rss_kb")}
+        lines.append(
+            f"{stage['stage']:<18}{stage['wall_seconds']:>10.3f}{stage['round_trips']:>13}"
+            f"{(rss / 1024 if rss else 0):>17.1f}  {details}"
+        )
+    rss = report["peak_rss_kb"]
+    lines.append("-" * 80)
+    lines.append(f"total wall: {report['total_wall_seconds']}s, fixture requests: {report['fixture_requests']}, "
+                 f"peak RSS python: {(rss['self'] or 0) / 1024:.1f}MB, browser (largest child): {(rss['children'] or 0) / 1024:.1f}MB")
+    return "\n".join(lines)
\ No newline at end of file
@@ -3,17 +3,894 @@
 
 from playwright.sync_api import sync_playwright
 import argparse
+import contextlib
+import asyncio
 import json
+import multiprocessing
 import os
+import socket
 import time
 import datetime
 import sys
 
 # 모듈 가져오기
 from module.getinfo import get_post_info, normalize_instagram_url, save_to_json, setup_logging
-from module.login import instagram_login
-from module.comment import collect_instagram_comments
-from module.findview import find_post_views
+from module.session import open_logged_in_page, DEFAULT_SESSION_DIR
+from module.comment import collect_instagram_comments, DEFAULT_PRUNE_KEEP
+from module.findview import find_post_views, ViewCountCache
+from module.async_api import crawl_posts_concurrently
+from module.routing import ResourcePolicy, RESOURCE_PRESETS
+from module.stream import JsonlWriter
+from module.checkpoint import CommentCheckpoint, DEFAULT_CHECKPOINT_DIR
+from module.result import create_result_data, prepare_comment_options, apply_comments_result
+from module.cache import PostInfoCache, DEFAULT_CACHE_DIR
+from module.storage import SqliteStore, save_to_sqlite
+from module.metrics import MetricsRecorder
+from module.accounts import AccountPool, AccountChallenged, read_accounts_file
+from module.workers import ShardedCrawl
+from module.daemon import CrawlDaemon, DEFAULT_PORT as DEFAULT_DAEMON_PORT
+from module.jobqueue import JobQueue, DEFAULT_LEASE_TIMEOUT, DEFAULT_MAX_ATTEMPTS
+from module.columnar import export_columnar, load_results, is_available as columnar_available
+from module.browserserver import serve_browser, launch_or_connect, DEFAULT_PORT, DEFAULT_SERVER_FILE
+from module.budget import LatencyBudget, DEFAULT_BUDGET_FILE, DEFAULT_NAV_RETRIES, DEFAULT_POST_DEADLINE
+from module import budget, metrics
+
+
+# 작업 큐에 처리 가능한 작업이 없을 때 다시 확인하는 최대 간격 (초)
+QUEUE_POLL_INTERVAL = 10
+
+# 실행 모드별로 지원하지 않아 무시되는 옵션
+UNSUPPORTED_OPTIONS = {
+    "--daemon": ("--url", "--url-file", "--stream", "--resume", "--accounts", "--columnar"),
+    "--queue": ("--concurrency", "--accounts", "--stream", "--resume", "--columnar"),
+    "--workers": ("--concurrency", "--accounts", "--stream", "--resume"),
+    "--accounts": ("--concurrency",),
+    "--concurrency": ("--stream", "--connect"),
+}
+
+
+def open_stream_writer(output_file, post_info, stream_options):
+    """
+    게시물별 JSONL 스트림 파일을 열고 post_info 레코드를 먼저 기록하는 함수
+
+    Args:
+        output_file: 출력 JSON 파일 이름 (확장자를 .jsonl로 바꾸고 게시물 ID와 타임스탬프를 붙임)
+        post_info: 기본 포스트 정보
+        stream_options: JsonlWriter 옵션 (flush_interval 등)
+
+    Returns:
+        JsonlWriter: 열린 스트림 writer
+    """
+    base_name, _ = os.path.splitext(output_file)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    writer = JsonlWriter(f"{base_name}_{post_info['post_id']}_{timestamp}.jsonl", **stream_options)
+    writer.write("post_info", post_info)
+    writer.flush()
+    print(f"Streaming results to: {writer.path}")
+    return writer
+
+
+def close_stream_writer(writer, result_data):
+    """마지막 metadata 레코드(조회수 포함)를 기록하고 스트림을 닫는 함수"""
+    post_info = result_data["post_info"] or {}
+    writer.write("metadata", {"views": post_info.get("views"), **result_data["metadata"]})
+    writer.close()
+
+
+def collect_logged_in_data(page, url, result_data, content_type, logger, comment_options=None, resource_policy=None, writer=None, checkpoint_options=None, view_cache=None, delta_options=None, with_comments=True):
+    """
+    로그인된 페이지에서 조회수와 댓글을 수집해 결과 데이터에 채우는 함수
+
+    Args:
+        page: 로그인된 Playwright 페이지 인스턴스
+        url: 정규화된 게시물 URL
+        result_data: post_info가 채워진 결과 데이터
+        content_type: 컨텐츠 타입 ('post' 또는 'reels')
+        logger: 로거 인스턴스
+        comment_options: collect_instagram_comments에 전달할 추가 옵션 (capture_mode, wait_timeout 등)
+        resource_policy: 단계별 리소스 차단 정책 (없으면 모든 리소스 로드)
+        writer: 댓글을 발견 즉시 기록할 JsonlWriter (있으면 댓글을 메모리에 보관하지 않음)
+        checkpoint_options: 댓글 수집 체크포인트 옵션 (checkpoint_dir, interval, resume)
+        view_cache: 조회수 그리드 수집 캐시 (있으면 프로필 그리드 전체를 한 번에 수집해 재사용)
+        delta_options: 델타 수집 옵션 (store: 이미 저장된 댓글 ID를 읽을 SqliteStore, threshold: 스크롤을 멈추는 연속 기존 댓글 수)
+        with_comments: False이면 조회수만 확인하고 댓글 수집은 건너뜀
+
+    Returns:
+        CommentCheckpoint: 체크포인트 (체크포인트를 쓰지 않으면 None, metadata의 comments_completed가 True일 때만 결과 저장 후 삭제)
+    """
+    post_info = result_data["post_info"]
+
+    # 3단계: 로그인 후 조회수 확인 (reels인 경우에만)
+    view_count = None
+
+    if content_type == 'reels':
+        print("\n3. Finding view count for the reels...")
+
+        if post_info["username"]:
+            print(f"Looking for reels {post_info['post_id']} in profile of {post_info['username']}...")
+
+            # findview.py 모듈의 함수 사용 (content_type 파라미터와 page 객체 전달)
+            with metrics.span("findview"):
+                view_count = find_post_views(post_info["username"], post_info["post_id"], logger, content_type, page, resource_policy,
+                                             view_cache)
+
+            if view_count:
+                print(f"Extracted view count: {view_count}")
+            else:
+                print(f"Could not extract view count for reels {post_info['post_id']}")
+        else:
+            print("Username not found in post info, skipping view count collection")
+    else:
+        print("\n3. Skipping view count extraction for normal post")
+
+    # 결과 데이터에 조회수 저장
+    post_info["views"] = view_count
+
+    if not with_comments:
+        print("\n4. Skipping comment collection")
+        return None
+
+    # 조회수 단계에서 게시물 시간 예산을 다 썼으면 댓글 수집을 건너뜀 (--adaptive-timeouts)
+    if budget.expired():
+        print("\n4. Post deadline reached; skipping comment collection")
+        result_data["metadata"]["deadline_reached"] = True
+        return None
+
+    # 4단계: 댓글 수집 (같은 브라우저 세션 사용)
+    print("\n4. Collecting comments...")
+
+    # 게시물 URL로 이동
+    print("\nNavigating to the post page for comment collection...")
+
+    # 게시물 이동 전부터 댓글 단계 차단 정책 적용
+    if resource_policy is not None:
+        resource_policy.apply(page, "comment")
+
+    # 세션 유지를 위해 먼저 인스타그램 홈페이지 다시 방문
+    budget.goto(page, "https://www.instagram.com/", "home")
+    print("Visited homepage to ensure session continuity")
+    budget.settle("home", 2)
+
+    # 이제 게시물 URL로 이동
+    print(f"Going to post URL: {url}")
+    budget.goto(page, url, "post.navigation")
+    print("Waiting for post page to fully load...")
+    budget.settle("post.navigation", 5)  # Longer wait for better stability
+
+    # 게시물별 체크포인트와 델타 수집 옵션
+    checkpoint, post_kwargs = prepare_comment_options(post_info["post_id"], checkpoint_options, delta_options)
+
+    # 댓글 수집
+    with metrics.span("comments"):
+        if writer is not None:
+            comments_data = collect_instagram_comments(
+                page, url, resource_policy=resource_policy, writer=writer, keep_in_memory=False,
+                **post_kwargs, **(comment_options or {})
+            )
+        else:
+            comments_data = collect_instagram_comments(
+                page, url, resource_policy=resource_policy, **post_kwargs, **(comment_options or {})
+            )
+
+    # 결과 데이터에 댓글 정보 추가 (스트림 모드에서는 댓글이 JSONL 파일에만 기록됨)
+    apply_comments_result(result_data, comments_data, streamed=writer is not None)
+
+    print(f"Total of {comments_data['metadata']['total_comments']} comments were collected.")
+    return checkpoint
+
+
+def warn_unsupported_options(mode, used_options):
+    """
+    실행 모드에서 지원하지 않는 옵션이 지정되었으면 무시된다고 알리는 함수
+
+    Args:
+        mode: 실행 모드 옵션 (UNSUPPORTED_OPTIONS의 키)
+        used_options: 옵션 이름 → 지정 여부
+    """
+    for option in UNSUPPORTED_OPTIONS[mode]:
+        if used_options.get(option):
+            print(f"{option} is not supported with {mode} and is ignored.")
+
+
+def read_url_list(url_file):
+    """
+    URL 목록 파일(또는 '-'인 경우 표준 입력)에서 URL을 읽는 함수
+
+    빈 줄과 '#'으로 시작하는 줄은 무시하며, 정규화 후 중복 URL은 한 번만 처리
+
+    Args:
+        url_file: URL 목록 파일 경로 또는 '-'
+
+    Returns:
+        list: 정규화된 URL 리스트
+    """
+    if url_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(url_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    seen = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if "instagram.com" not in line:
+            print(f"Skipping invalid Instagram URL: {line}")
+            continue
+        url = normalize_instagram_url(line)
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def new_batch_summary(urls, content_type, with_login, db_store=None, run_options=None, **extra):
+    """
+    배치 실행 요약 데이터를 초기화하는 함수 (모든 배치 모드 공용)
+
+    Args:
+        urls: 처리할 URL 리스트
+        content_type: 컨텐츠 타입 ('post' 또는 'reels')
+        with_login: 로그인해서 수집하는지 여부
+        db_store: 실행 기록을 남길 SqliteStore (있으면 db_run_id 추가)
+        run_options: SqliteStore 실행 기록에 남길 옵션
+        extra: 요약에 추가할 값 (concurrency, workers 등)
+
+    Returns:
+        dict: 실행 요약 데이터
+    """
+    summary = {
+        "started_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_urls": len(urls),
+        "succeeded": 0,
+        "failed": 0,
+        "with_login": with_login,
+        "content_type": content_type,
+        **extra,
+        "posts": []
+    }
+    if db_store is not None:
+        summary["db_run_id"] = db_store.start_run(content_type, with_login, run_options or {})
+    return summary
+
+
+def save_post_result(result_data, output_file, entry, logger, db_store=None, run_id=None, writer=None, checkpoint=None):
+    """
+    게시물 결과를 게시물별 JSON 파일(과 SQLite)에 저장하고 요약 항목을 갱신하는 함수 (모든 배치 모드 공용)
+
+    Args:
+        result_data: post_info가 채워진 결과 데이터
+        output_file: 출력 JSON 파일 이름 (게시물별 파일은 {이름}_{POSTID}.json)
+        entry: 요약의 게시물 항목 (status, output_file, comments_collected 또는 error를 기록)
+        logger: 로거 인스턴스
+        db_store: 결과를 함께 기록할 SqliteStore
+        run_id: SqliteStore 실행 ID
+        writer: 스트림 writer (SQLite 기록 전에 flush)
+        checkpoint: 댓글 수집이 완료되어 저장되면 삭제할 체크포인트
+
+    Returns:
+        str: 저장된 파일 경로 또는 저장 실패 시 None
+    """
+    base_name, ext = os.path.splitext(output_file)
+    entry["post_id"] = result_data["post_info"]["post_id"]
+    with metrics.span("save"):
+        saved_file = save_to_json(result_data, f"{base_name}_{entry['post_id']}{ext}", logger)
+        if db_store is not None:
+            # 스트림 모드의 댓글은 JSONL 파일에서 읽으므로 먼저 flush
+            if writer is not None:
+                writer.flush()
+            save_to_sqlite(result_data, logger=logger, run_id=run_id, store=db_store)
+
+    if not saved_file:
+        entry["error"] = "failed to save data"
+        return None
+    entry["status"] = "ok"
+    entry["output_file"] = saved_file
+    entry["comments_collected"] = result_data["metadata"].get("comments_collected", 0)
+    # 댓글 수집이 끝까지 완료되어 저장되었으면 더 이상 이어서 수집할 필요 없음
+    if checkpoint is not None and result_data["metadata"].get("comments_completed"):
+        checkpoint.delete()
+    return saved_file
+
+
+def add_summary_entry(summary, entry):
+    """게시물 항목을 요약에 추가하고 성공/실패 수를 갱신"""
+    if entry["status"] == "ok":
+        summary["succeeded"] += 1
+    else:
+        summary["failed"] += 1
+    summary["posts"].append(entry)
+
+
+def collect_run_stats(output_file, logger, resource_policy=None, post_info_cache=None, view_cache=None, account_pool=None):
+    """
+    이 프로세스에서 누적된 실행 통계를 모으고 시간 예산과 지표 파일을 기록하는 함수
+
+    Returns:
+        dict: 요약에 추가할 통계 (resource_policy, post_info_cache, view_cache, account_pool, latency_budget, metrics)
+    """
+    stats = {}
+    if resource_policy is not None:
+        stats["resource_policy"] = resource_policy.summary()
+    if post_info_cache is not None:
+        stats["post_info_cache"] = post_info_cache.stats()
+    if view_cache is not None:
+        stats["view_cache"] = view_cache.stats()
+    if account_pool is not None:
+        stats["account_pool"] = account_pool.summary()
+    if budget.get_budget() is not None:
+        stats["latency_budget"] = budget.summary()
+        budget.save(logger)
+    if metrics.get_recorder() is not None:
+        stats["metrics"] = metrics.summary()
+        metrics.write_reports(output_file, logger)
+    return stats
+
+
+def finish_batch_summary(summary, started, output_file, logger, db_store=None, stats=None):
+    """
+    실행 요약을 마무리해 {출력 이름}_summary 파일로 저장하고 결과를 출력하는 함수 (모든 배치 모드 공용)
+
+    Args:
+        summary: new_batch_summary로 만든 실행 요약
+        started: 실행 시작 시각 (time.time())
+        output_file: 출력 JSON 파일 이름
+        logger: 로거 인스턴스
+        db_store: 실행 기록을 마칠 SqliteStore
+        stats: 요약에 추가할 통계 (collect_run_stats 등)
+
+    Returns:
+        dict: 실행 요약 데이터
+    """
+    base_name, ext = os.path.splitext(output_file)
+    summary["finished_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    summary["elapsed_seconds"] = round(time.time() - started, 2)
+    summary.update(stats or {})
+    if db_store is not None:
+        db_store.finish_run(summary["db_run_id"])
+
+    print("\nSaving batch summary...")
+    summary_file = save_to_json(summary, f"{base_name}_summary{ext}", logger)
+    print(f"\nBatch finished: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    if summary_file:
+        print(f"Summary file: {summary_file}")
+
+    return summary
+
+
+def run_batch(urls, output_file, logger, options, account_pool=None):
+    """
+    하나의 Playwright 인스턴스와 브라우저로 여러 URL을 순서대로 수집하는 함수
+
+    게시물별 결과는 개별 JSON 파일로, 전체 실행 요약은 별도의 summary 파일로 저장
+
+    Args:
+        urls: 정규화된 URL 리스트
+        output_file: 출력 JSON 파일 이름 (게시물 ID와 타임스탬프가 붙음)
+        logger: 로거 인스턴스
+        options: 배치 수집 옵션 딕셔너리 (main에서 생성)
+            - username, password: 인스타그램 계정 (없으면 로그인 없이 기본 정보만 수집)
+            - content_type: 컨텐츠 타입 ('post' 또는 'reels')
+            - comment_options: collect_instagram_comments에 전달할 추가 옵션
+            - session_dir: 로그인 세션 저장 디렉터리 (None이면 저장된 세션을 사용하지 않음)
+            - resource_policy: 단계별 리소스 차단 정책 (없으면 모든 리소스 로드)
+            - fetch_mode: 기본 정보 수집 방식 ('browser' 또는 'http')
+            - stream_options: JsonlWriter 옵션 (있으면 게시물별 결과를 JSONL로 스트리밍)
+            - checkpoint_options: 댓글 수집 체크포인트 옵션 (checkpoint_dir, interval, resume)
+            - post_info_cache, bypass_cache: 포스트 정보 캐시와 캐시 조회 생략 여부
+            - db_store: 결과를 함께 기록할 SqliteStore (없으면 JSON만 저장)
+            - view_cache: 조회수 그리드 수집 캐시 (없으면 게시물별 탐색)
+            - delta_options: 델타 수집 옵션 (collect_logged_in_data 참고)
+            - browser_endpoint: 공유 브라우저 엔드포인트 (None이면 새로 실행, 빈 문자열이면 접속 정보 파일에서 읽음)
+            - concurrency: run_concurrent_batch에서 동시에 처리할 게시물 수
+        account_pool: 여러 계정에 게시물을 나눠 배정하는 스케줄러 (module.accounts.AccountPool, 있으면 username/password 대신 사용)
+
+    Returns:
+        dict: 실행 요약 데이터
+    """
+    username, password = options["username"], options["password"]
+    content_type = options["content_type"]
+    resource_policy = options["resource_policy"]
+    db_store = options["db_store"]
+    need_login = bool(username and password) or account_pool is not None
+    started = time.time()
+
+    summary = new_batch_summary(urls, content_type, need_login, db_store,
+                                {"fetch_mode": options["fetch_mode"], **(options["comment_options"] or {})})
+
+    with sync_playwright() as p:
+        # 로그인이 필요한 경우 기존 단일 실행과 동일하게 헤드풀 브라우저 사용 (공유 브라우저는 헤드리스)
+        if options["browser_endpoint"] is not None:
+            browser = metrics.instrument(launch_or_connect(p, options["browser_endpoint"], headless=not need_login))
+        else:
+            browser = metrics.instrument(p.chromium.launch(headless=not need_login))
+        page = None
+
+        try:
+            if account_pool is not None:
+                # 계정별 컨텍스트로 로그인하고 게시물마다 처리할 계정의 페이지를 배정
+                assignments = account_pool.assign(browser, urls)
+            else:
+                if need_login:
+                    print("\nLogging into Instagram once for the whole batch...")
+                    with metrics.span("login"):
+                        page, login_success = open_logged_in_page(browser, username, password, options["session_dir"],
+                                                                  resource_policy)
+                    if login_success:
+                        print("Login successful!")
+                    else:
+                        print("Login failed. Skipping view count and comment collection for all posts.")
+                        page = None
+                assignments = ((url, page) for url in urls)
+
+            for position, (url, page) in enumerate(assignments, 1):
+                print(f"\n=== [{position}/{len(urls)}] Processing URL: {url} ===")
+                post_started = time.time()
+                entry = {"url": url, "status": "failed", "output_file": None}
+                writer = None
+                checkpoint = None
+                requeued = False
+                metrics_mark = metrics.mark()
+                budget.start_post()
+
+                try:
+                    result_data = create_result_data(page is not None, content_type)
+
+                    print("\n1. Collecting basic post information...")
+                    with metrics.span("getinfo"):
+                        post_info = get_post_info(url, logger, browser=browser, resource_policy=resource_policy,
+                                                  fetch_mode=options["fetch_mode"], cache=options["post_info_cache"],
+                                                  bypass_cache=options["bypass_cache"])
+
+                    if not post_info:
+                        print("Could not retrieve post information. Skipping this URL.")
+                        entry["error"] = "post info not available"
+                    else:
+                        post_info["content_type"] = content_type
+                        result_data["post_info"] = post_info
+                        entry["post_id"] = post_info["post_id"]
+
+                        if options["stream_options"] is not None:
+                            writer = open_stream_writer(output_file, post_info, options["stream_options"])
+                            entry["stream_file"] = writer.path
+
+                        if page is not None:
+                            checkpoint = collect_logged_in_data(page, url, result_data, content_type, logger,
+                                                                options["comment_options"], resource_policy, writer,
+                                                                options["checkpoint_options"], options["view_cache"],
+                                                                options["delta_options"])
+                            if account_pool is not None:
+                                # 수집 중 확인/제한 페이지가 감지되었으면 저장하지 않고 다른 계정에 다시 배정
+                                account_pool.raise_if_challenged()
+                        else:
+                            post_info["views"] = None
+
+                        # 이 게시물을 처리하는 동안 기록된 단계별 시간과 Playwright 호출 수
+                        if metrics_mark is not None:
+                            result_data["metadata"]["metrics"] = metrics.summary(since=metrics_mark)
+
+                        save_post_result(result_data, output_file, entry, logger, db_store, summary.get("db_run_id"),
+                                         writer, checkpoint)
+                except AccountChallenged as e:
+                    logger.warning(f"URL: {url}, 계정 확인/제한 페이지 감지: {str(e)}")
+                    requeued = account_pool.requeue(url, e)
+                    if requeued:
+                        print(f"Account {e.username} was challenged ({e.reason}); retrying this URL with another account later.")
+                    entry["error"] = f"account challenged: {e.reason}"
+                except Exception as e:
+                    logger.error(f"URL: {url}, 배치 처리 중 에러 발생: {str(e)}")
+                    print(f"Processing error: {e}")
+                    entry["error"] = str(e)
+                finally:
+                    budget.end_post()
+                    if writer is not None:
+                        close_stream_writer(writer, result_data)
+
+                if requeued:
+                    continue
+
+                entry["elapsed_seconds"] = round(time.time() - post_started, 2)
+                add_summary_entry(summary, entry)
+        finally:
+            if account_pool is not None:
+                account_pool.close()
+            browser.close()
+
+    stats = collect_run_stats(output_file, logger, resource_policy, options["post_info_cache"], options["view_cache"],
+                              account_pool)
+    return finish_batch_summary(summary, started, output_file, logger, db_store, stats)
+
+
+def run_concurrent_batch(urls, output_file, logger, options):
+    """
+    async 드라이버로 여러 URL을 동시에 수집하고 run_batch와 같은 형식으로 저장하는 함수
+
+    Args:
+        (인자는 run_batch와 동일, stream_options와 browser_endpoint는 사용하지 않음)
+
+    Returns:
+        dict: 실행 요약 데이터
+    """
+    content_type = options["content_type"]
+    concurrency = options["concurrency"]
+    checkpoint_options = options["checkpoint_options"]
+    db_store = options["db_store"]
+    started = time.time()
+
+    summary = new_batch_summary(urls, content_type, bool(options["username"] and options["password"]), db_store,
+                                {"fetch_mode": options["fetch_mode"], "concurrency": concurrency,
+                                 **(options["comment_options"] or {})},
+                                concurrency=concurrency)
+
+    results = asyncio.run(crawl_posts_concurrently(
+        urls, options["username"], options["password"], content_type,
+        concurrency=concurrency, logger=logger, comment_options=options["comment_options"],
+        session_dir=options["session_dir"], resource_policy=options["resource_policy"], fetch_mode=options["fetch_mode"],
+        cache=options["post_info_cache"], bypass_cache=options["bypass_cache"], view_cache=options["view_cache"],
+        checkpoint_options=checkpoint_options, delta_options=options["delta_options"]
+    ))
+
+    for url, result_data in zip(urls, results):
+        entry = {"url": url, "status": "failed", "output_file": None}
+        post_info = result_data["post_info"] if result_data else None
+
+        if not post_info:
+            entry["error"] = result_data["metadata"].get("error", "post info not available") if result_data else "not processed"
+        else:
+            checkpoint = None
+            if checkpoint_options is not None:
+                checkpoint = CommentCheckpoint.for_post(
+                    post_info["post_id"], checkpoint_options["checkpoint_dir"], checkpoint_options["interval"]
+                )
+            save_post_result(result_data, output_file, entry, logger, db_store, summary.get("db_run_id"),
+                             checkpoint=checkpoint)
+        add_summary_entry(summary, entry)
+
+    stats = collect_run_stats(output_file, logger, options["resource_policy"], options["post_info_cache"],
+                              options["view_cache"])
+    return finish_batch_summary(summary, started, output_file, logger, db_store, stats)
+
+
+def export_batch_columnar(summary, output_file, fmt, logger):
+    """배치 요약에 기록된 게시물별 결과 파일을 읽어 컬럼 형식(posts/comments)으로 저장하는 함수"""
+    result_files = [entry["output_file"] for entry in summary["posts"] if entry.get("output_file")]
+    if not result_files:
+        print("No saved results to export in columnar format.")
+        return None
+    return export_columnar(load_results(result_files), output_file, fmt, logger)
+
+
+def build_worker_options(args, username, password, comment_options, session_dir, log_file):
+    """
+    --workers 워커 프로세스와 --daemon 작업 스레드가 shard_worker_setup에 전달할 옵션 (pickle 가능한 값만)
+
+    Returns:
+        dict: 워커 옵션
+    """
+    return {
+        "username": username,
+        "password": password,
+        "content_type": args.type,
+        "fetch_mode": args.fetch,
+        "comment_options": comment_options,
+        "session_dir": session_dir,
+        "block_resources": args.block_resources,
+        "cache_dir": args.cache_dir,
+        "bypass_cache": args.no_cache,
+        "harvest_views": args.harvest_views,
+        "view_cache_ttl": args.view_cache_ttl,
+        "metrics": args.metrics,
+        "log_file": log_file,
+        "login_stagger": 5,
+        "delta": {"db_path": args.sqlite, "threshold": args.delta_threshold} if args.delta else None,
+        "connect": args.connect,
+        "sqlite": args.sqlite,
+        "budget": ({"path": args.latency_file, "retries": args.nav_retries, "post_deadline": args.post_deadline}
+                   if args.adaptive_timeouts else None),
+    }
+
+
+def shard_worker_setup(options):
+    """
+    --workers 모드의 워커 프로세스마다 한 번 실행: 자신만의 Playwright 인스턴스, 브라우저, 로그인 페이지 준비
+
+    Args:
+        options: run_sharded_batch가 만든 워커 옵션 (worker_id 포함)
+
+    Returns:
+        dict: shard_worker_crawl에 전달할 상태
+    """
+    logger = setup_logging(options["log_file"])
+    need_login = bool(options["username"] and options["password"])
+    if options["metrics"]:
+        metrics.set_recorder(MetricsRecorder())
+    if options["budget"]:
+        budget.set_budget(LatencyBudget(options["budget"]["path"], retries=options["budget"]["retries"],
+                                        post_deadline=options["budget"]["post_deadline"]))
+    resource_policy = None
+    if options["block_resources"] is not None:
+        resource_policy = ResourcePolicy(stages=options["block_resources"] or None)
+
+    playwright = sync_playwright().start()
+    if options["connect"] is not None:
+        # 워커마다 공유 브라우저에 연결해 각자의 컨텍스트만 만듦
+        browser = metrics.instrument(launch_or_connect(playwright, options["connect"], headless=not need_login))
+    else:
+        browser = metrics.instrument(playwright.chromium.launch(headless=not need_login))
+
+    def close():
+        browser.close()
+        playwright.stop()
+        # 이 워커가 측정한 단계별 지연 시간을 다음 실행을 위해 저장
+        budget.save(logger)
+        if state.get("delta_options"):
+            state["delta_options"]["store"].close()
+
+    page = None
+    if need_login:
+        # 같은 계정으로 동시에 폼 로그인하지 않도록 워커마다 시작 시점을 조금씩 늦춤
+        time.sleep(options["worker_id"] * options["login_stagger"])
+        with metrics.span("login"):
+            page, login_success = open_logged_in_page(browser, options["username"], options["password"],
+                                                      options["session_dir"], resource_policy)
+        if not login_success:
+            print(f"Worker {options['worker_id']}: login failed; collecting basic post info only.")
+            page = None
+
+    state = {
+        "browser": browser,
+        "page": page,
+        "close": close,
+        "logger": logger,
+        "resource_policy": resource_policy,
+        "post_info_cache": PostInfoCache(options["cache_dir"]),
+        "view_cache": ViewCountCache(options["view_cache_ttl"]) if options["harvest_views"] else None,
+        # 기존 댓글 ID는 워커마다 읽기 연결로 조회 (기록은 부모 프로세스에서만)
+        "delta_options": ({"store": SqliteStore(options["delta"]["db_path"]), "threshold": options["delta"]["threshold"]}
+                          if options["delta"] else None),
+    }
+    return state
+
+
+def shard_worker_crawl(state, url, options):
+    """
+    --workers 모드의 워커 프로세스에서 게시물 하나를 수집해 결과 데이터를 반환하는 함수
+
+    결과 저장은 부모 프로세스가 결과를 받는 즉시 수행
+    """
+    logger = state["logger"]
+    metrics_mark = metrics.mark()
+    result_data = create_result_data(state["page"] is not None, options["content_type"])
+
+    budget.start_post()
+    try:
+        with metrics.span("getinfo"):
+            post_info = get_post_info(url, logger, browser=state["browser"], resource_policy=state["resource_policy"],
+                                      fetch_mode=options["fetch_mode"], cache=state["post_info_cache"],
+                                      bypass_cache=options["bypass_cache"])
+        if not post_info:
+            result_data["metadata"]["error"] = "post info not available"
+            return result_data
+
+        post_info["content_type"] = options["content_type"]
+        result_data["post_info"] = post_info
+        if state["page"] is not None:
+            collect_logged_in_data(state["page"], url, result_data, options["content_type"], logger, options["comment_options"],
+                                   state["resource_policy"], view_cache=state["view_cache"], delta_options=state["delta_options"],
+                                   with_comments=options.get("with_comments", True))
+        else:
+            post_info["views"] = None
+    finally:
+        budget.end_post()
+
+    if metrics_mark is not None:
+        result_data["metadata"]["metrics"] = metrics.summary(since=metrics_mark)
+    return result_data
+
+
+def daemon_crawl(state, job, options):
+    """
+    --daemon 모드의 작업 스레드에서 작업 하나(url, type, with_comments)를 수집해 결과 데이터를 반환하는 함수
+
+    shard_worker_setup으로 준비한 로그인 페이지와 브라우저를 작업마다 재사용
+    """
+    url = normalize_instagram_url(job["url"])
+    return shard_worker_crawl(state, url, {**options, "content_type": job["type"], "with_comments": job["with_comments"]})
+
+
+def run_queue_worker(queue_options, output_file, worker_options):
+    """
+    --queue 모드 워커: 작업 큐에서 게시물을 하나씩 가져와(lease) 수집하고, 결과를 저장한 뒤 완료/실패를 기록하는 함수
+
+    처리 중에는 lease를 계속 연장하므로 다른 워커(프로세스)가 같은 게시물을 동시에 수집하지 않고,
+    프로세스가 중단되면 lease가 만료된 뒤 다른 워커가 이어서 처리
+    실패한 게시물은 지수 백오프 후 다시 시도되며, 대기/처리 중인 작업이 모두 끝나면 종료
+
+    Args:
+        queue_options: 작업 큐 옵션 (db_path, lease_timeout, max_attempts)
+        output_file: 출력 JSON 파일 이름 (게시물별 파일은 {이름}_{POSTID}.json)
+        worker_options: shard_worker_setup에 전달할 옵션 (worker_id 포함)
+
+    Returns:
+        dict: 이 워커의 처리 요약
+    """
+    logger = setup_logging(worker_options["log_file"])
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    summary = {"owner": owner, "succeeded": 0, "failed": 0, "retried": 0, "posts": []}
+
+    job_queue = JobQueue(queue_options["db_path"], queue_options["lease_timeout"], queue_options["max_attempts"])
+    db_store = SqliteStore(worker_options["sqlite"]) if worker_options["sqlite"] else None
+    state = shard_worker_setup(worker_options)
+    try:
+        while True:
+            job = job_queue.lease(owner)
+            if job is None:
+                # 백오프 중이거나 다른 워커가 처리 중인 작업이 있으면 기다렸다가 다시 확인
+                wait = job_queue.next_available_in()
+                if wait is None:
+                    break
+                time.sleep(min(max(wait, 1.0), QUEUE_POLL_INTERVAL))
+                continue
+
+            print(f"\n=== Job {job['post_id']} (priority {job['priority']}, attempt {job['attempts']}/{job['max_attempts']}): {job['url']} ===")
+            entry = {"post_id": job["post_id"], "url": job["url"], "attempt": job["attempts"], "status": "failed"}
+            error = None
+            saved_file = None
+            try:
+                with job_queue.hold(job):
+                    result_data = shard_worker_crawl(state, job["url"], {**worker_options, "content_type": job["content_type"]})
+                    if not result_data.get("post_info"):
+                        error = result_data["metadata"].get("error", "post info not available")
+                    else:
+                        saved_file = save_post_result(result_data, output_file, entry, logger, db_store)
+                        if not saved_file:
+                            error = entry["error"]
+            except KeyboardInterrupt:
+                # 중단된 작업은 시도 횟수를 되돌려 바로 다시 처리할 수 있게 반환
+                job_queue.release(job["post_id"], owner)
+                raise
+            except Exception as e:
+                logger.error(f"URL: {job['url']}, 작업 처리 중 에러 발생: {str(e)}")
+                error = f"{type(e).__name__}: {e}"
+
+            if error is None:
+                job_queue.complete(job["post_id"], owner, saved_file)
+                summary["succeeded"] += 1
+            else:
+                entry["error"] = error
+                delay = job_queue.fail(job["post_id"], owner, error)
+                if delay is not None:
+                    print(f"Job {job['post_id']} failed ({error}); retrying in {delay:.0f}s")
+                    entry["status"] = "retry"
+                    summary["retried"] += 1
+                else:
+                    print(f"Job {job['post_id']} failed ({error}); no attempts left")
+                    summary["failed"] += 1
+            summary["posts"].append(entry)
+    finally:
+        if state.get("close"):
+            state["close"]()
+        if db_store is not None:
+            db_store.close()
+        job_queue.close()
+
+    print(f"\nQueue worker {owner} finished: {summary['succeeded']} succeeded, {summary['failed']} failed, {summary['retried']} retried")
+    return summary
+
+
+def _queue_worker_main(queue_options, output_file, worker_options):
+    """--queue --workers 모드의 워커 프로세스 진입점 (spawn 방식으로 실행되므로 모듈 최상위 함수)"""
+    try:
+        run_queue_worker(queue_options, output_file, worker_options)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_queue(queue_options, output_file, logger, worker_options, workers=1):
+    """
+    작업 큐의 게시물을 workers개의 워커(프로세스)로 모두 처리하고 요약을 저장하는 함수
+
+    Args:
+        queue_options: 작업 큐 옵션 (db_path, lease_timeout, max_attempts)
+        output_file: 출력 JSON 파일 이름
+        logger: 로거 인스턴스
+        worker_options: shard_worker_setup에 전달할 옵션
+        workers: 워커 수 (1이면 현재 프로세스에서 처리)
+
+    Returns:
+        dict: 실행 요약 데이터 (queue: 상태별 작업 수)
+    """
+    base_name, ext = os.path.splitext(output_file)
+    summary = {"started_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "queue_file": queue_options["db_path"],
+               "workers": workers}
+    started = time.time()
+
+    if workers > 1:
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_queue_worker_main, args=(queue_options, output_file, {**worker_options, "worker_id": worker_id}),
+                            name=f"queue-worker-{worker_id}")
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    else:
+        summary["worker"] = run_queue_worker(queue_options, output_file, {**worker_options, "worker_id": 0})
+
+    with JobQueue(queue_options["db_path"], queue_options["lease_timeout"], queue_options["max_attempts"]) as job_queue:
+        summary["queue"] = job_queue.counts()
+        summary["failed_jobs"] = job_queue.jobs(status="failed")
+    summary["finished_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    summary["elapsed_seconds"] = round(time.time() - started, 2)
+
+    print("\nSaving queue summary...")
+    summary_file = save_to_json(summary, f"{base_name}_summary{ext}", logger)
+    counts = summary["queue"]
+    print(f"\nQueue finished: {counts['done']} done, {counts['failed']} failed, {counts['queued']} queued, {counts['leased']} in progress")
+    if summary_file:
+        print(f"Summary file: {summary_file}")
+    return summary
+
+
+def run_sharded_batch(urls, output_file, logger, worker_options, workers=4, max_attempts=2, db_store=None):
+    """
+    URL 목록을 여러 워커 프로세스(프로세스마다 브라우저 하나)에 나눠 수집하고 결과를 한 곳에 모으는 함수
+
+    워커가 게시물 하나를 끝낼 때마다 결과가 전달되어 바로 게시물별 JSON 파일과 합본 JSONL 파일
+    ({출력 이름}_results.jsonl)에 기록되며, 실패한 URL은 다른 워커에서 다시 시도
+
+    Args:
+        urls: 정규화된 URL 리스트
+        output_file: 출력 JSON 파일 이름
+        logger: 로거 인스턴스
+        worker_options: 워커 프로세스에 전달할 옵션 (shard_worker_setup 참고)
+        workers: 워커 프로세스 수
+        max_attempts: URL 하나를 시도하는 최대 횟수
+        db_store: 결과를 함께 기록할 SqliteStore (부모 프로세스에서만 기록)
+
+    Returns:
+        dict: 실행 요약 데이터
+    """
+    base_name, _ = os.path.splitext(output_file)
+    started = time.time()
+    content_type = worker_options["content_type"]
+    with_login = bool(worker_options["username"] and worker_options["password"])
+
+    summary = new_batch_summary(urls, content_type, with_login, db_store,
+                                {"fetch_mode": worker_options["fetch_mode"], "workers": workers,
+                                 **worker_options["comment_options"]},
+                                workers=workers)
+
+    sharded = ShardedCrawl(shard_worker_setup, shard_worker_crawl, workers, max_attempts, worker_options)
+    merged = JsonlWriter(f"{base_name}_results.jsonl")
+    print(f"Merging results into: {merged.path}")
+
+    try:
+        for position, item in enumerate(sharded.run(urls), 1):
+            url = item["url"]
+            result_data = item["result_data"]
+            post_info = result_data["post_info"] if result_data else None
+            print(f"\n=== [{position}/{len(urls)}] Finished by worker {item['worker']}: {url} ===")
+            entry = {"url": url, "status": "failed", "output_file": None,
+                     "worker": item["worker"], "attempts": item["attempts"]}
+
+            if not post_info:
+                entry["error"] = item["error"] or (result_data["metadata"].get("error", "post info not available")
+                                                   if result_data else "not processed")
+            else:
+                merged.write("result", {"url": url, **result_data})
+                save_post_result(result_data, output_file, entry, logger, db_store, summary.get("db_run_id"))
+            add_summary_entry(summary, entry)
+    finally:
+        merged.close()
+
+    # 시간 예산과 지표는 각 워커 프로세스가 기록
+    stats = {"merged_file": merged.path, "shards": sharded.summary()}
+    return finish_batch_summary(summary, started, output_file, logger, db_store, stats)
 
 
 def main():
@@ -22,36 +899,214 @@ def main():
     parser.add_argument('-u', '--username', help='Instagram username')
     parser.add_argument('-p', '--password', help='Instagram password')
     parser.add_argument('-url', '--url', help='Instagram post URL')
+    parser.add_argument('-f', '--url-file', help="File with one Instagram URL per line ('-' reads from stdin); enables batch mode")
     parser.add_argument('-o', '--output', default='instagram_data.json', help='Output JSON filename')
     parser.add_argument('--no-log', action='store_true', help='Disable log file creation')
     parser.add_argument('-t', '--type', choices=['post', 'reels'], default='reels', help='Content type: post or reels (default: reels)')
-    
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of worker processes (each with its own browser) to shard a URL list across in batch mode (default: 1)')
+    parser.add_argument('--worker-retries', type=int, default=1, help='Times a failed URL is retried on another worker in --workers mode (default: 1)')
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help='Number of posts to crawl at once in batch mode (default: 1)')
+    parser.add_argument('--fetch', choices=['browser', 'http'], default='browser', help='Basic post info: load the page in Chromium or read meta tags over HTTP with browser fallback (default: browser)')
+    parser.add_argument('--block-resources', nargs='*', choices=sorted(RESOURCE_PRESETS), metavar='STAGE',
+                        help=f'Block images, media, fonts and third-party trackers per stage ({", ".join(sorted(RESOURCE_PRESETS))}); no value blocks in all stages')
+    parser.add_argument('--stream', action='store_true', help='Append post info, each comment and metadata to a JSONL file as they are collected')
+    parser.add_argument('--stream-flush-interval', type=float, default=1.0, help='Seconds between JSONL flushes in --stream mode (default: 1)')
+    parser.add_argument('--session-dir', default=DEFAULT_SESSION_DIR, help=f'Directory for saved login sessions (default: {DEFAULT_SESSION_DIR})')
+    parser.add_argument('--no-session', action='store_true', help='Ignore saved login sessions and always log in with the form')
+    parser.add_argument('--harvest-views', action='store_true', help="Collect view counts of every reel in the creator's grid in one visit and reuse them for other posts")
+    parser.add_argument('--view-cache-ttl', type=int, default=600, help='Seconds to reuse a harvested reels grid (default: 600)')
+    parser.add_argument('--sqlite', metavar='DB_PATH', help='Also upsert post info, views and comments into this SQLite database')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'Directory for cached post info (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the post info cache and fetch fresh data (the cache is still refreshed)')
+    parser.add_argument('--resume', action='store_true', help='Continue comment collection from the last checkpoint and skip comments already captured')
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help=f'Directory for comment crawl checkpoints (default: {DEFAULT_CHECKPOINT_DIR})')
+    parser.add_argument('--checkpoint-interval', type=int, default=5, help='Save a comment checkpoint every N scrolls (default: 5)')
+    parser.add_argument('--capture', choices=['dom', 'network'], default='dom', help='Comment capture: scrape rendered DOM or parse comment API responses (default: dom)')
+    parser.add_argument('--accounts', metavar='FILE', help="File with one 'username:password' per line; batch posts are spread across these accounts")
+    parser.add_argument('--account-rate', type=float, default=6, help='Page navigations per minute allowed for each account in --accounts mode (default: 6)')
+    parser.add_argument('--account-burst', type=int, default=3, help='Navigations each account may make back to back before rate limiting (default: 3)')
+    parser.add_argument('--account-cooldown', type=int, default=900, help='Seconds to rest an account after a challenge or rate-limit page (default: 900)')
+    parser.add_argument('--columnar', choices=['parquet', 'arrow'], help='Also export posts and comments as columnar files with normalized integer counts and absolute comment timestamps (requires pyarrow)')
+    parser.add_argument('--delta', action='store_true', help='Only collect comments not yet stored in the --sqlite database and stop scrolling once stored comments are reached')
+    parser.add_argument('--delta-threshold', type=int, default=10, help='Consecutive already-stored comments that end a --delta crawl (default: 10)')
+    parser.add_argument('--metrics', action='store_true', help='Record per-stage timings and Playwright call counts; writes <output>_metrics.jsonl and <output>_metrics.prom')
+    parser.add_argument('--prune-comments', nargs='?', type=int, const=DEFAULT_PRUNE_KEEP, metavar='KEEP',
+                        help=f'Replace already-extracted comment nodes with empty placeholders to keep browser memory flat on very long posts; keeps the last KEEP nodes (default: {DEFAULT_PRUNE_KEEP})')
+    parser.add_argument('--daemon', action='store_true', help='Keep a logged-in browser warm and accept crawl jobs over a local HTTP JSON API (POST /jobs, GET /jobs/<id>, GET /status)')
+    parser.add_argument('--daemon-port', type=int, default=DEFAULT_DAEMON_PORT, help=f'Port for the --daemon API on 127.0.0.1 (default: {DEFAULT_DAEMON_PORT})')
+    parser.add_argument('--queue', metavar='DB_PATH', help='Durable SQLite job queue: --url/--url-file posts are added if absent, then workers lease and crawl queued posts until none are left')
+    parser.add_argument('--enqueue-only', action='store_true', help='With --queue, only add the given URLs and exit')
+    parser.add_argument('--priority', type=int, help='Queue priority for added URLs, higher first (default: reels 10, post 0)')
+    parser.add_argument('--recrawl', action='store_true', help='With --queue, re-queue posts that are already done or failed')
+    parser.add_argument('--lease-timeout', type=int, default=DEFAULT_LEASE_TIMEOUT, help=f'Seconds before a job held by an unresponsive worker is handed to another (default: {DEFAULT_LEASE_TIMEOUT})')
+    parser.add_argument('--queue-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, help=f'Attempts per queued post, with exponential backoff between them (default: {DEFAULT_MAX_ATTEMPTS})')
+    parser.add_argument('--serve-browser', action='store_true', help='Run a long-lived headless browser that later runs attach to with --connect (stop with Ctrl+C)')
+    parser.add_argument('--browser-port', type=int, default=DEFAULT_PORT, help=f'Remote debugging port for --serve-browser (default: {DEFAULT_PORT})')
+    parser.add_argument('--connect', nargs='?', const='', metavar='ENDPOINT',
+                        help=f'Attach to the shared browser from --serve-browser instead of launching one (endpoint from {DEFAULT_SERVER_FILE} unless given); falls back to launching')
+    parser.add_argument('--max-scrolls', type=int, default=50, help='Max comment panel scrolls per post; a post that reaches it is recorded as incomplete and keeps its checkpoint (default: 50)')
+    parser.add_argument('--scroll-wait-timeout', type=float, default=5.0, help='Max seconds to wait for new comments after each scroll (default: 5)')
+    parser.add_argument('--adaptive-timeouts', action='store_true', help='Set navigation and element-wait timeouts and post-load waits from per-stage latency percentiles learned over recent runs instead of the fixed values')
+    parser.add_argument('--latency-file', default=DEFAULT_BUDGET_FILE, help=f'File where --adaptive-timeouts keeps recent per-stage latencies (default: {DEFAULT_BUDGET_FILE})')
+    parser.add_argument('--nav-retries', type=int, default=DEFAULT_NAV_RETRIES, help=f'Extra attempts for a failed page navigation with --adaptive-timeouts (default: {DEFAULT_NAV_RETRIES})')
+    parser.add_argument('--post-deadline', type=float, default=DEFAULT_POST_DEADLINE, help=f'Overall seconds allowed per post with --adaptive-timeouts; when reached, scrolling stops and the comments collected so far are kept (default: {DEFAULT_POST_DEADLINE})')
+
     args = parser.parse_args()
-    
+
+    # 공유 브라우저 모드: 브라우저만 실행하고 종료될 때까지 대기
+    if args.serve_browser:
+        serve_browser(args.browser_port)
+        return
+
     # 로거 설정
     log_file = None if args.no_log else 'instagram_scraping.log'
     logger = setup_logging(log_file)
     print("Instagram crawler started")
-    
+
     # 입력값 처리
     username = args.username
     password = args.password
     url = args.url
     output_file = args.output
-    
+    session_dir = None if args.no_session else args.session_dir
+    comment_options = {
+        "capture_mode": args.capture,
+        "wait_timeout": args.scroll_wait_timeout,
+        "max_scrolls": args.max_scrolls,
+    }
+    if args.prune_comments is not None:
+        comment_options["prune_keep"] = args.prune_comments
+    resource_policy = None
+    if args.block_resources is not None:
+        # 단계를 지정하지 않으면 모든 단계에 프리셋 적용
+        resource_policy = ResourcePolicy(stages=args.block_resources or None)
+    stream_options = {"flush_interval": args.stream_flush_interval} if args.stream else None
+    # 같은 게시물을 반복 조회할 때 브라우저 실행을 줄이기 위한 포스트 정보 캐시
+    post_info_cache = PostInfoCache(args.cache_dir)
+    view_cache = ViewCountCache(args.view_cache_ttl) if args.harvest_views else None
+    checkpoint_options = {
+        "checkpoint_dir": args.checkpoint_dir,
+        "interval": args.checkpoint_interval,
+        "resume": args.resume,
+    }
+    if args.metrics:
+        metrics.set_recorder(MetricsRecorder())
+    if args.adaptive_timeouts:
+        budget.set_budget(LatencyBudget(args.latency_file, retries=args.nav_retries, post_deadline=args.post_deadline))
+    if args.delta and not args.sqlite:
+        print("--delta requires --sqlite (stored comment IDs are read from the database).")
+        sys.exit(1)
+    if args.columnar and not columnar_available():
+        print("--columnar requires pyarrow (pip install pyarrow).")
+        sys.exit(1)
+    # 실행 모드마다 지원하지 않는 옵션을 알리기 위한 지정 여부
+    used_options = {
+        "--url": bool(url),
+        "--url-file": bool(args.url_file),
+        "--stream": stream_options is not None,
+        "--resume": args.resume,
+        "--accounts": bool(args.accounts),
+        "--columnar": bool(args.columnar),
+        "--concurrency": args.concurrency > 1,
+        "--connect": args.connect is not None,
+    }
+
+    # 데몬 모드: 로그인된 브라우저를 유지하고 로컬 HTTP API로 받은 작업을 하나씩 처리 (대화식 입력 없음)
+    if args.daemon:
+        warn_unsupported_options("--daemon", used_options)
+        if not (username and password):
+            print("No login credentials given; the daemon collects basic post info only.")
+        daemon_options = build_worker_options(args, username, password, comment_options, session_dir, log_file)
+        CrawlDaemon(shard_worker_setup, daemon_crawl, {**daemon_options, "worker_id": 0}, port=args.daemon_port).serve_forever()
+        return
+
+    # 작업 큐 모드: URL을 영속 큐에 추가(이미 있으면 건너뜀)하고 큐가 빌 때까지 처리 (대화식 입력 없음)
+    if args.queue:
+        queue_options = {"db_path": args.queue, "lease_timeout": args.lease_timeout, "max_attempts": args.queue_attempts}
+        urls = read_url_list(args.url_file) if args.url_file else []
+        if url:
+            urls.append(normalize_instagram_url(url))
+        with JobQueue(args.queue, args.lease_timeout, args.queue_attempts) as job_queue:
+            added = job_queue.enqueue_many(urls, args.type, args.priority, args.recrawl)
+            counts = job_queue.counts()
+        print(f"Queue {args.queue}: {added} of {len(urls)} URLs added "
+              f"({counts['queued']} queued, {counts['leased']} in progress, {counts['done']} done, {counts['failed']} failed)")
+        if args.enqueue_only:
+            return
+        warn_unsupported_options("--queue", used_options)
+        worker_options = build_worker_options(args, username, password, comment_options, session_dir, log_file)
+        run_queue(queue_options, output_file, logger, worker_options, args.workers)
+        return
+
+    # 배치 모드: 하나의 브라우저로 URL 목록 전체를 처리 (대화식 입력 없음)
+    if args.url_file:
+        urls = read_url_list(args.url_file)
+        if not urls:
+            print("No valid Instagram URLs found in the URL list.")
+            sys.exit(1)
+        print(f"Batch mode: {len(urls)} URLs to process")
+        db_store = SqliteStore(args.sqlite) if args.sqlite else None
+        account_pool = None
+        if args.accounts:
+            credentials = read_accounts_file(args.accounts)
+            if not credentials:
+                print("No valid accounts found in the accounts file.")
+                sys.exit(1)
+            print(f"Account pool: {len(credentials)} accounts")
+            account_pool = AccountPool(credentials, args.account_rate, args.account_burst, args.account_cooldown,
+                                       session_dir=session_dir, resource_policy=resource_policy)
+        # 배치 수집 함수들이 공유하는 옵션 (run_batch, run_concurrent_batch)
+        batch_options = {
+            "username": username,
+            "password": password,
+            "content_type": args.type,
+            "comment_options": comment_options,
+            "session_dir": session_dir,
+            "resource_policy": resource_policy,
+            "fetch_mode": args.fetch,
+            "stream_options": stream_options,
+            "checkpoint_options": checkpoint_options,
+            "post_info_cache": post_info_cache,
+            "bypass_cache": args.no_cache,
+            "db_store": db_store,
+            "view_cache": view_cache,
+            "delta_options": {"store": db_store, "threshold": args.delta_threshold} if args.delta else None,
+            "browser_endpoint": args.connect,
+            "concurrency": args.concurrency,
+        }
+        try:
+            if args.workers > 1:
+                warn_unsupported_options("--workers", used_options)
+                worker_options = build_worker_options(args, username, password, comment_options, session_dir, log_file)
+                summary = run_sharded_batch(urls, output_file, logger, worker_options, args.workers, args.worker_retries + 1, db_store)
+            elif account_pool is not None:
+                warn_unsupported_options("--accounts", used_options)
+                summary = run_batch(urls, output_file, logger, batch_options, account_pool)
+            elif args.concurrency > 1:
+                warn_unsupported_options("--concurrency", used_options)
+                summary = run_concurrent_batch(urls, output_file, logger, batch_options)
+            else:
+                summary = run_batch(urls, output_file, logger, batch_options)
+        finally:
+            if db_store is not None:
+                db_store.close()
+        if args.columnar:
+            export_batch_columnar(summary, output_file, args.columnar, logger)
+        return
+
     # 명령행으로 URL이 제공되지 않은 경우 대화식으로 입력받기
     if not url:
         url = input("Enter Instagram post URL: ")
-    
+
     # URL 유효성 검사
     if not url or "instagram.com" not in url:
         print("Valid Instagram URL is required.")
         sys.exit(1)
-    
+
     # URL 정규화 (reel/reels -> p 형식)
     url = normalize_instagram_url(url)
     print(f"Processing URL: {url}")
-    
+
     # 로그인 필요 여부 확인
     need_login = False
     if username and password:
@@ -62,143 +1117,128 @@ def main():
             username = input("Enter Instagram username: ")
             password = input("Enter Instagram password: ")
             need_login = True
-    
+
     # 결과 데이터 구조 초기화
-    result_data = {
-        "post_info": None,
-        "comments": None,
-        "metadata": {
-            "collected_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "with_login": need_login,
-            "content_type": args.type
-        }
-    }
-    
+    result_data = create_result_data(need_login, args.type)
+
+    # 게시물 시간 예산은 로그인 입력을 받은 뒤부터 계산 (--adaptive-timeouts)
+    budget.start_post()
+
+    # 공유 브라우저에 연결하면 기본 정보와 로그인 단계가 같은 연결을 사용 (실행마다 새 컨텍스트만 생성)
+    playwright = None
+    shared_browser = None
+    if args.connect is not None:
+        playwright = sync_playwright().start()
+        shared_browser = metrics.instrument(launch_or_connect(playwright, args.connect, headless=not need_login))
+
     # 1단계: 게시물 정보 수집 (로그인 불필요)
     print("\n1. Collecting basic post information...")
-    post_info = get_post_info(url, logger)
-    
+    with metrics.span("getinfo"):
+        post_info = get_post_info(url, logger, browser=shared_browser, resource_policy=resource_policy, fetch_mode=args.fetch,
+                                  cache=post_info_cache, bypass_cache=args.no_cache)
+
     if not post_info:
         print("Could not retrieve post information. Exiting program.")
         sys.exit(1)
-    
+
     print("Post information collection complete!")
     print(f"Post ID: {post_info['post_id']}")
     print(f"Author: {post_info['username']}")
     print(f"Likes: {post_info['likes']}")
     print(f"Comments: {post_info['comments_count']}")
-    
+
     # 결과 데이터에 게시물 정보 추가
     post_info["content_type"] = args.type
     result_data["post_info"] = post_info
-    
+
+    # 스트림 모드: post_info를 먼저 기록하고 댓글은 수집 즉시 추가
+    writer = open_stream_writer(output_file, post_info, stream_options) if stream_options is not None else None
+
     # 2단계: 로그인, 조회수 확인, 댓글 수집 (같은 브라우저 세션에서)
+    checkpoint = None
     if need_login:
         print("\n2. Logging into Instagram...")
-        
-        with sync_playwright() as p:
-            # 안정적인 세션 처리를 위한 브라우저 설정
-            browser = p.chromium.launch(headless=False)
-            
-            # 적절한 세션 처리를 위한 컨텍스트 구성 - Asia/Seoul 시간대 사용
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 800},
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-                locale="ko-KR",
-                timezone_id="Asia/Seoul",
-                accept_downloads=True
-            )
-            
-            # 세션 안정성 향상을 위한 쿠키 설정 (모든 쿠키 허용)
-            context.add_cookies([{
-                "name": "ig_cb", 
-                "value": "1",
-                "domain": ".instagram.com",
-                "path": "/",
-            }])
-            
-            # 적절한 세션 처리를 위한 페이지 생성
-            page = context.new_page()
-            
+
+        with contextlib.ExitStack() as stack:
+            if shared_browser is not None:
+                browser = shared_browser
+            else:
+                # 안정적인 세션 처리를 위한 브라우저 설정
+                p = stack.enter_context(sync_playwright())
+                browser = metrics.instrument(p.chromium.launch(headless=False))
+
             try:
-                # 먼저 로그인 수행
-                login_success = instagram_login(page, username, password)
-                
+                # 저장된 세션이 유효하면 재사용하고, 아니면 로그인 수행
+                with metrics.span("login"):
+                    page, login_success = open_logged_in_page(browser, username, password, session_dir, resource_policy)
+
                 if not login_success:
                     print("Login failed. Skipping view count and comment collection.")
                 else:
                     print("Login successful!")
-                    
-                    # 3단계: 로그인 후 조회수 확인 (reels인 경우에만)
-                    view_count = None
-                    
-                    if args.type == 'reels':
-                        print("\n3. Finding view count for the reels...")
-                        
-                        if post_info["username"]:
-                            print(f"Looking for reels {post_info['post_id']} in profile of {post_info['username']}...")
-                            
-                            # findview.py 모듈의 함수 사용 (content_type 파라미터와 page 객체 전달)
-                            view_count = find_post_views(post_info["username"], post_info["post_id"], logger, args.type, page)
-                            
-                            if view_count:
-                                print(f"Extracted view count: {view_count}")
-                            else:
-                                print(f"Could not extract view count for reels {post_info['post_id']}")
-                        else:
-                            print("Username not found in post info, skipping view count collection")
+
+                    # 3~4단계: 조회수 확인 및 댓글 수집 (델타 모드면 저장된 댓글 ID를 읽기 위해 DB를 잠시 엶)
+                    if args.delta:
+                        with SqliteStore(args.sqlite) as delta_store:
+                            checkpoint = collect_logged_in_data(page, url, result_data, args.type, logger, comment_options,
+                                                                resource_policy, writer, checkpoint_options, view_cache,
+                                                                {"store": delta_store, "threshold": args.delta_threshold})
                     else:
-                        print("\n3. Skipping view count extraction for normal post")
-                    
-                    # 결과 데이터에 조회수 저장
-                    result_data["post_info"]["views"] = view_count
-                    
-                    # 4단계: 댓글 수집 (같은 브라우저 세션 사용)
-                    print("\n4. Collecting comments...")
-                    
-                    # 게시물 URL로 이동
-                    print("\nNavigating to the post page for comment collection...")
-                    
-                    # 세션 유지를 위해 먼저 인스타그램 홈페이지 다시 방문
-                    page.goto("https://www.instagram.com/")
-                    print("Visited homepage to ensure session continuity")
-                    time.sleep(2)
-                    
-                    # 이제 게시물 URL로 이동
-                    print(f"Going to post URL: {url}")
-                    page.goto(url)
-                    print("Waiting 5 seconds for post page to fully load...")
-                    time.sleep(5)  # Longer wait for better stability
-                    
-                    # 댓글 수집
-                    comments_data = collect_instagram_comments(page, url)
-                    
-                    # 결과 데이터에 댓글 정보 추가
-                    result_data["comments"] = comments_data["comments"]
-                    result_data["metadata"]["comments_collected"] = len(comments_data["comments"])
-                    result_data["metadata"]["total_scrolls"] = comments_data["metadata"]["total_scrolls"]
-                    
-                    print(f"Total of {len(comments_data['comments'])} comments were collected.")
-                
-                # 자동 종료 전 페이지를 볼 수 있도록 짧게 일시 정지
-                print("Browser will close automatically in 3 seconds...")
-                time.sleep(3)
-                
+                        checkpoint = collect_logged_in_data(page, url, result_data, args.type, logger, comment_options,
+                                                            resource_policy, writer, checkpoint_options, view_cache)
+
+                # 자동 종료 전 페이지를 볼 수 있도록 짧게 일시 정지 (공유 브라우저는 헤드리스이므로 생략)
+                if shared_browser is None:
+                    print("Browser will close automatically in 3 seconds...")
+                    time.sleep(3)
+
             except Exception as e:
                 print(f"Processing error: {e}")
-            
+
             finally:
                 browser.close()
     else:
         # 로그인하지 않은 경우 조회수 및 댓글 수집 건너뛰기
         print("Login credentials not provided. Skipping view count and comment collection.")
         result_data["post_info"]["views"] = None
-    
+
+    # 공유 브라우저 연결 해제 (이 실행의 컨텍스트만 정리되고 브라우저는 계속 실행)
+    if playwright is not None:
+        if not need_login:
+            shared_browser.close()
+        playwright.stop()
+
+    if resource_policy is not None:
+        result_data["metadata"]["resource_policy"] = resource_policy.summary()
+
+    if budget.get_budget() is not None:
+        budget.end_post()
+        result_data["metadata"]["latency_budget"] = budget.summary()
+        budget.save(logger)
+
+    if metrics.get_recorder() is not None:
+        result_data["metadata"]["metrics"] = metrics.summary()
+
+    if writer is not None:
+        close_stream_writer(writer, result_data)
+
     # 5단계: 결과를 JSON으로 저장 (마지막 단계)
     print("\n5. Saving collected data...")
-    saved_file = save_to_json(result_data, output_file, logger)
-    
+    with metrics.span("save"):
+        saved_file = save_to_json(result_data, output_file, logger)
+        if args.sqlite:
+            save_to_sqlite(result_data, args.sqlite, logger)
+        if args.columnar and saved_file:
+            export_columnar([result_data], output_file, args.columnar, logger)
+    metrics.write_reports(output_file, logger)
+
     if saved_file:
+        # 댓글 수집이 완료된 결과가 저장되었으면 체크포인트 삭제 (실패/중단된 경우 --resume으로 이어서 수집 가능)
+        if checkpoint is not None:
+            if result_data["metadata"].get("comments_completed"):
+                checkpoint.delete()
+            else:
+                print(f"Comment collection did not finish; checkpoint kept for --resume: {checkpoint.path}")
         print(f"\nAll tasks completed successfully!")
         print(f"Result file: {saved_file}")
     else:
@@ -3,7 +3,26 @@ Instagram Scraping Modules
 
 This package contains modules for scraping Instagram:
 - login: Functions for logging into Instagram
+- session: Logged-in browser contexts restored from saved session files
 - comment: Functions for collecting comments from Instagram posts
+- capture: Parsing comments from captured API/GraphQL responses
 - getinfo: Functions for extracting information from Instagram posts/reels
 - findview: Functions for finding view counts of posts/reels
+- async_api: Async Playwright versions of the collectors for concurrent crawls
+- result: Per-post result data shared by the sync and async crawls
+- http_client: Keep-alive HTTP client for fetching posts without a browser
+- routing: Resource blocking policy for page requests
+- accounts: Account pool with per-account rate limits and challenge cooldowns
+- workers: Sharded crawls across worker processes
+- browserserver: Shared headless Chromium that crawls attach to over CDP
+- daemon: Long-running crawler that takes jobs over a local HTTP JSON API
+- jobqueue: SQLite job queue with leases, retries and priorities
+- budget: Time and navigation budgets for a crawl
+- metrics: Timing spans and counters reported after a crawl
+- checkpoint: Checkpoints for resuming interrupted comment collection
+- stream: Streaming comment output to JSONL files
+- cache: Post info cache with per-field freshness
+- storage: SQLite storage for posts, comments and run snapshots
+- normalize: Parsing counts and dates into numbers and datetimes
+- columnar: Exporting comments to columnar (Parquet) files
 """
\ No newline at end of file
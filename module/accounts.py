@@ -0,0 +1,415 @@
+from collections import deque
+import time
+
+from module import metrics
+
+# 계정별 storage_state 파일 디렉터리 (module.session.DEFAULT_SESSION_DIR과 같은 값)
+# module.session은 Playwright를 불러오므로 로그인할 때만 가져옴 (토큰 버킷/스케줄러는 Playwright 없이 사용 가능)
+DEFAULT_SESSION_DIR = ".sessions"
+
+# 계정별 기본 페이지 이동 한도 (분당 이동 수, 연속 허용 수)
+DEFAULT_NAVIGATIONS_PER_MINUTE = 6
+DEFAULT_BURST = 3
+
+# 확인(challenge)/제한 페이지를 만났을 때 계정을 쉬게 하는 시간 (초)
+DEFAULT_COOLDOWN = 900
+
+# 이동 후 URL에 포함되면 확인/제한 상태로 판단하는 경로
+CHALLENGE_URL_MARKERS = {
+    "/challenge/": "challenge",
+    "/accounts/suspended": "suspended",
+    "/accounts/disabled": "disabled",
+    "/accounts/login": "logged_out",
+}
+
+# 제한 안내 문구 (안내 대화상자 안에서만 검사 - 댓글이나 캡션에 같은 문구가 있어도 감지하지 않음)
+CHALLENGE_TEXT_MARKERS = [
+    "Please wait a few minutes before you try again",
+    "몇 분 후에 다시 시도하세요",
+    "Try Again Later",
+    "잠시 후 다시 시도",
+    "We restrict certain activity",
+    "특정 활동을 제한",
+]
+
+# 제한 안내가 표시되는 대화상자
+CHALLENGE_DIALOG_SELECTOR = '[role="dialog"], [role="alertdialog"]'
+
+# 이동 응답이 오류 상태(4xx/5xx)일 때만 본문 전체를 안내 페이지로 보고 검사
+ERROR_PAGE_SELECTOR = "body"
+
+# selector에 해당하는 요소들의 앞부분에서 안내 문구를 찾음
+CHALLENGE_TEXT_JS = """
+([markers, selector]) => {
+    for (const element of document.querySelectorAll(selector)) {
+        const text = element.innerText.slice(0, 3000);
+        const found = markers.find(marker => text.includes(marker));
+        if (found) {
+            return found;
+        }
+    }
+    return null;
+}
+"""
+
+# 토큰을 소비하는 페이지 이동 메서드
+NAVIGATION_METHODS = {"goto", "reload", "go_back", "go_forward"}
+
+
+class AccountChallenged(Exception):
+    """계정이 확인/제한 페이지를 만나 현재 게시물 처리를 중단해야 할 때 발생하는 예외"""
+
+    def __init__(self, username, reason):
+        super().__init__(f"{username}: {reason}")
+        self.username = username
+        self.reason = reason
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷
+
+    clock과 sleep을 바꿔 끼우면 실제 시간 없이 동작을 확인할 수 있음
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate: 초당 채워지는 토큰 수
+            capacity: 최대 토큰 수 (연속으로 허용되는 요청 수)
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens=1):
+        """토큰을 얻을 수 있을 때까지 남은 시간 (초)"""
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def try_acquire(self, tokens=1):
+        """토큰이 있으면 소비하고 True, 없으면 기다리지 않고 False"""
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def acquire(self, tokens=1):
+        """
+        토큰을 얻을 때까지 기다린 뒤 소비하는 함수
+
+        Returns:
+            float: 기다린 시간 (초)
+        """
+        waited = 0.0
+        while not self.try_acquire(tokens):
+            delay = self.wait_time(tokens)
+            self._sleep(delay)
+            waited += delay
+        return waited
+
+
+def detect_challenge(page, response=None):
+    """
+    현재 페이지가 확인(challenge)/제한 페이지인지 확인하는 함수
+
+    안내 문구는 대화상자 안에서만 찾고, 본문 전체는 이동 응답이 오류 상태일 때만 검사
+    (정상 게시물 페이지의 댓글에 "Try Again Later" 같은 문구가 있어도 계정을 제한 상태로 보지 않음)
+
+    Args:
+        page: Playwright 페이지 인스턴스
+        response: 직전 page.goto()의 응답 (있으면 상태 코드도 확인)
+
+    Returns:
+        str: 감지된 사유 ('rate_limited', 'challenge', 'logged_out' 등) 또는 정상이면 None
+    """
+    if response is not None and response.status == 429:
+        return "rate_limited"
+    for marker, reason in CHALLENGE_URL_MARKERS.items():
+        if marker in page.url:
+            return reason
+    selector = CHALLENGE_DIALOG_SELECTOR
+    if response is not None and response.status >= 400:
+        selector = f"{CHALLENGE_DIALOG_SELECTOR}, {ERROR_PAGE_SELECTOR}"
+    try:
+        if page.evaluate(CHALLENGE_TEXT_JS, [CHALLENGE_TEXT_MARKERS, selector]):
+            return "rate_limited"
+    except Exception:
+        # 이동 직후 컨텍스트가 바뀌는 경우 등은 정상으로 간주
+        pass
+    return None
+
+
+class RateLimitedPage:
+    """
+    계정 페이지를 감싸 페이지 이동마다 토큰을 소비하고, 이동 후 확인/제한 페이지면
+    AccountChallenged를 발생시키는 프록시
+
+    수집 함수들이 예외를 잡아 부분 결과를 반환하더라도 감지 결과는 계정(account.challenge)에 남고,
+    이후의 이동은 바로 AccountChallenged로 중단되므로 제한된 계정으로 요청을 더 보내지 않음
+    이동 외의 메서드와 속성은 원래 페이지로 그대로 전달
+    """
+
+    def __init__(self, page, account):
+        self._page = page
+        self._account = account
+
+    # 원래 페이지와 같은 키로 취급 (ResourcePolicy가 페이지별로 route를 한 번만 설치하도록)
+    def __eq__(self, other):
+        if isinstance(other, RateLimitedPage):
+            other = other._page
+        return self._page == other
+
+    def __hash__(self):
+        return hash(self._page)
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        if name not in NAVIGATION_METHODS:
+            return attr
+
+        def navigate(*args, **kwargs):
+            account = self._account
+            if account.challenge is not None:
+                raise AccountChallenged(account.username, account.challenge)
+            account.stats["wait_seconds"] += account.bucket.acquire()
+            account.stats["navigations"] += 1
+            response = attr(*args, **kwargs)
+            reason = detect_challenge(self._page, response)
+            if reason is not None:
+                account.challenge = reason
+                raise AccountChallenged(account.username, reason)
+            return response
+        return navigate
+
+
+class Account:
+    """풀에 속한 계정 하나의 로그인 페이지, 토큰 버킷, 쿨다운 상태"""
+
+    def __init__(self, username, password, bucket):
+        self.username = username
+        self.password = password
+        self.bucket = bucket
+        self.page = None
+        self.cooldown_until = 0.0
+        self.disabled = False
+        # 현재 게시물 처리 중 감지된 확인/제한 사유 (requeue()에서 초기화)
+        self.challenge = None
+        self.stats = {
+            "posts": 0,
+            "navigations": 0,
+            "wait_seconds": 0.0,
+            "challenges": 0,
+            "logins": 0,
+            "login_failures": 0,
+        }
+
+
+def _open_logged_in_page(browser, username, password, session_dir, resource_policy):
+    """AccountPool의 기본 로그인 함수 (module.session.open_logged_in_page를 처음 로그인할 때 불러옴)"""
+    from module.session import open_logged_in_page
+    return open_logged_in_page(browser, username, password, session_dir, resource_policy)
+
+
+def read_accounts_file(path):
+    """
+    계정 목록 파일을 읽는 함수 (한 줄에 'username:password', 빈 줄과 '#' 주석 무시)
+
+    Returns:
+        list: (username, password) 튜플 리스트
+    """
+    credentials = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            username, sep, password = line.partition(":")
+            if not sep or not username.strip() or not password:
+                print(f"Skipping invalid account line (expected username:password): {username.strip()}")
+                continue
+            credentials.append((username.strip(), password))
+    return credentials
+
+
+class AccountPool:
+    """
+    여러 계정에 게시물을 나눠 배정하는 스케줄러
+
+    계정마다 별도의 브라우저 컨텍스트(open_logged_in_page)를 사용하고, 페이지 이동은 계정별 토큰 버킷으로
+    제한함. 다음 게시물은 쿨다운 중이 아닌 계정 중 토큰을 가장 빨리 얻을 수 있는 계정에 배정하고,
+    확인/제한 페이지를 만난 계정은 cooldown초 동안 쉬게 한 뒤 해당 게시물을 다른 계정에 다시 배정함
+
+    sync API는 한 스레드에서만 사용할 수 있으므로 게시물은 순서대로 처리되며,
+    한 계정의 한도가 다 찼을 때 다른 계정으로 넘어가 대기 시간을 줄이는 방식으로 처리량을 높임
+    """
+
+    def __init__(self, credentials, navigations_per_minute=DEFAULT_NAVIGATIONS_PER_MINUTE, burst=DEFAULT_BURST,
+                 cooldown=DEFAULT_COOLDOWN, max_challenges=3, max_attempts=3, session_dir=DEFAULT_SESSION_DIR,
+                 resource_policy=None, login=_open_logged_in_page, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            credentials: (username, password) 튜플 리스트
+            navigations_per_minute: 계정별 분당 페이지 이동 한도
+            burst: 계정별 연속 허용 이동 수
+            cooldown: 확인/제한 페이지 감지 시 계정 휴식 시간 (초)
+            max_challenges: 이 횟수만큼 확인/제한 페이지를 만난 계정은 더 이상 사용하지 않음
+            max_attempts: 게시물 하나를 다시 배정하는 최대 횟수
+            session_dir: 세션 파일 디렉터리
+            resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy)
+            login: (browser, username, password, session_dir, resource_policy) -> (page, 성공 여부)
+                   로컬 대역 서버로 확인할 때 바꿔 끼울 수 있음
+        """
+        self.accounts = [
+            Account(username, password, TokenBucket(navigations_per_minute / 60.0, burst, clock, sleep))
+            for username, password in credentials
+        ]
+        self.cooldown = cooldown
+        self.max_challenges = max_challenges
+        self.max_attempts = max_attempts
+        self.session_dir = session_dir
+        self.resource_policy = resource_policy
+        self._login = login
+        self._clock = clock
+        self._sleep = sleep
+        self._queue = deque()
+        self._attempts = {}
+        self._current = None
+        self.requeued = 0
+
+    def _ensure_page(self, account, browser):
+        """계정의 로그인 페이지를 준비하는 함수 (실패하면 계정 비활성화)"""
+        if account.page is not None:
+            return True
+        print(f"\nLogging into Instagram as {account.username}...")
+        account.stats["logins"] += 1
+        with metrics.span("login", account=account.username):
+            page, login_success = self._login(browser, account.username, account.password,
+                                              self.session_dir, self.resource_policy)
+        if not login_success:
+            account.stats["login_failures"] += 1
+            account.disabled = True
+            print(f"Login failed for {account.username}; this account will not be used.")
+            self._close_page(page)
+            return False
+        account.page = RateLimitedPage(page, account)
+        return True
+
+    def _close_page(self, page):
+        try:
+            if page is not None:
+                page.context.close()
+        except Exception:
+            pass
+
+    def _pick_account(self):
+        """
+        다음 게시물을 처리할 계정 선택 (쿨다운이 끝나지 않았으면 가장 빨리 끝나는 계정을 기다림)
+
+        Returns:
+            Account: 선택된 계정 또는 사용할 수 있는 계정이 없으면 None
+        """
+        usable = [account for account in self.accounts if not account.disabled]
+        if not usable:
+            return None
+        now = self._clock()
+        ready = [account for account in usable if account.cooldown_until <= now]
+        if not ready:
+            account = min(usable, key=lambda account: account.cooldown_until)
+            delay = account.cooldown_until - now
+            print(f"All accounts are cooling down; waiting {delay:.0f}s for {account.username}...")
+            self._sleep(delay)
+            return account
+        return min(ready, key=lambda account: account.bucket.wait_time())
+
+    def assign(self, browser, urls):
+        """
+        URL마다 처리할 계정의 페이지를 배정하는 제너레이터
+
+        확인/제한으로 중단된 URL은 requeue()로 다시 넣으면 이후 다른 계정에 배정됨
+        로그인 가능한 계정이 없으면 남은 URL은 페이지 없이(None) 반환
+
+        Yields:
+            tuple: (url, 로그인된 페이지 또는 None)
+        """
+        self._queue.extend(urls)
+        while self._queue:
+            url = self._queue.popleft()
+            account = self._pick_account()
+            while account is not None and not self._ensure_page(account, browser):
+                account = self._pick_account()
+            self._current = account
+            if account is None:
+                yield url, None
+                continue
+            account.stats["posts"] += 1
+            self._attempts[url] = self._attempts.get(url, 0) + 1
+            yield url, account.page
+
+    def raise_if_challenged(self):
+        """현재 게시물 처리 중 확인/제한 페이지가 감지되었으면 AccountChallenged 발생"""
+        account = self._current
+        if account is not None and account.challenge is not None:
+            raise AccountChallenged(account.username, account.challenge)
+
+    def requeue(self, url, error):
+        """
+        현재 계정을 쿨다운시키고 URL을 다시 배정 대기열에 넣는 함수
+
+        Args:
+            url: 처리하지 못한 URL
+            error: 발생한 AccountChallenged 예외
+
+        Returns:
+            bool: 다시 넣었으면 True, 최대 시도 횟수를 넘었으면 False
+        """
+        account = self._current
+        if account is not None:
+            account.challenge = None
+            account.stats["challenges"] += 1
+            account.cooldown_until = self._clock() + self.cooldown
+            metrics.count("account_challenges")
+            print(f"{account.username} hit a {error.reason} page; cooling down for {self.cooldown}s")
+            # 다음 사용 시 저장된 세션으로 새 컨텍스트를 열도록 현재 컨텍스트 정리
+            self._close_page(account.page)
+            account.page = None
+            if account.stats["challenges"] >= self.max_challenges:
+                account.disabled = True
+                print(f"{account.username} reached {self.max_challenges} challenges; this account will not be used.")
+
+        if self._attempts.get(url, 0) >= self.max_attempts:
+            return False
+        self._queue.append(url)
+        self.requeued += 1
+        return True
+
+    def close(self):
+        """모든 계정의 컨텍스트 종료"""
+        for account in self.accounts:
+            self._close_page(account.page)
+            account.page = None
+
+    def summary(self):
+        """계정별 처리 게시물 수, 이동 수, 대기 시간, 확인/제한 횟수 요약"""
+        return {
+            "accounts": {
+                account.username: {
+                    **account.stats,
+                    "wait_seconds": round(account.stats["wait_seconds"], 2),
+                    "disabled": account.disabled,
+                }
+                for account in self.accounts
+            },
+            "requeued": self.requeued,
+        }
\ No newline at end of file
@@ -0,0 +1,750 @@
+from playwright.async_api import async_playwright, TimeoutError
+import asyncio
+import os
+import time
+
+from module.getinfo import (
+    OG_DESCRIPTION_JS,
+    _cached_post_info,
+    _post_info_from_og,
+    _post_info_wait_until,
+    extract_reel_id,
+    fetch_post_info_http,
+    normalize_instagram_url,
+    setup_logging,
+)
+from module.login import (
+    LOGIN_CONTEXT_OPTIONS,
+    SESSION_COOKIES,
+    LOGIN_URL,
+    COOKIE_ACCEPT_SELECTOR,
+    USERNAME_INPUT_SELECTOR,
+    PASSWORD_INPUT_SELECTOR,
+    SUBMIT_BUTTON_SELECTOR,
+    HOME_ICON_SELECTOR,
+    NOT_NOW_SELECTORS,
+)
+from module.session import (
+    DEFAULT_SESSION_DIR,
+    SESSION_CHECK_URL,
+    LOGIN_PATH_MARKER,
+    load_session_state,
+    prepare_session_file,
+)
+from module.findview import (
+    HOME_URL,
+    PROFILE_TIMEOUT_MS,
+    GRID_SCROLL_JS,
+    GRID_SCROLL_WAIT_SECONDS,
+    DEFAULT_GRID_SCROLLS,
+    WATCH_ANCHORS_JS,
+    SCAN_NEW_ANCHORS_JS,
+    reels_grid_url,
+    get_view_cache,
+    _grid_scroll_done,
+    _harvest_scan,
+    _lookup_cached_views,
+    _store_harvest,
+    _view_count_from_match,
+)
+from module.comment import (
+    POST_CONTENT_SELECTOR,
+    MOUNT_ID_JS,
+    SCROLL_BY_JS,
+    PANEL_CHANGED_JS,
+    EXTRACT_COMMENTS_JS,
+    PRUNE_COMMENTS_JS,
+    _CommentCrawl,
+    _comments_xpath,
+    _extract_comments_args,
+    _rows_to_comments,
+    _add_network_comments,
+    _prune_args,
+    _scroll_args,
+    _panel_changed_args,
+    _panel_wait_timeout_ms,
+    _panel_wait_outcome,
+)
+from module.capture import CommentResponseCollector
+from module.result import create_result_data, prepare_comment_options, apply_comments_result
+from module import budget, metrics
+
+
+async def async_get_post_info(url, logger=None, browser=None, resource_policy=None, fetch_mode="browser",
+                              cache=None, bypass_cache=False):
+    """
+    get_post_info의 async_api 버전
+
+    Args:
+        url: Instagram 포스트의 URL
+        logger: 로거 인스턴스 (없으면 새로 생성)
+        browser: 재사용할 async 브라우저 (없으면 새로 실행 후 종료)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy)
+        fetch_mode: 'browser' 또는 'http' (HTTP 요청은 스레드 풀에서 실행, 실패 시 브라우저로 재시도)
+        cache: 게시물 ID 기준 포스트 정보 캐시 (module.cache.PostInfoCache)
+            - 좋아요/댓글 수만 만료되었으면 나머지 필드는 캐시에서 쓰고, 수는 브라우저 없이 HTTP 요청으로 갱신
+        bypass_cache: True이면 캐시를 조회하지 않고 새로 수집한 결과로 캐시 갱신
+
+    Returns:
+        dict: 포스트 정보를 담은 딕셔너리 또는 실패 시 None
+    """
+    if logger is None:
+        logger = setup_logging()
+
+    url = normalize_instagram_url(url)
+    logger.info(f"정규화된 URL: {url}")
+
+    if cache is None:
+        return await _async_fetch_post_info(url, logger, browser, resource_policy, fetch_mode)
+
+    post_id = extract_reel_id(url)
+    if not bypass_cache:
+        # 좋아요/댓글 수만 만료된 경우의 HTTP 갱신은 블로킹 요청이므로 스레드 풀에서 실행
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, _cached_post_info, cache, post_id, url, logger)
+        if cached is not None:
+            return cached
+
+    result = await _async_fetch_post_info(url, logger, browser, resource_policy, fetch_mode)
+    if result:
+        cache.put(post_id, result)
+    return result
+
+
+async def _async_fetch_post_info(url, logger, browser=None, resource_policy=None, fetch_mode="browser"):
+    """정규화된 URL의 포스트 정보를 HTTP 또는 브라우저로 새로 수집 (async)"""
+    if fetch_mode == "http":
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, fetch_post_info_http, url, logger)
+        if result:
+            return result
+        logger.info(f"URL: {url}, Playwright 모드로 재시도")
+
+    if browser is not None:
+        page = await browser.new_page()
+        try:
+            return await _async_post_info_logic(page, url, logger, resource_policy)
+        finally:
+            await page.close()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        try:
+            return await _async_post_info_logic(page, url, logger, resource_policy)
+        finally:
+            await browser.close()
+
+
+async def _async_post_info_logic(page, url, logger, resource_policy=None):
+    """포스트 정보 추출 로직 (async)"""
+    try:
+        if resource_policy is not None:
+            await resource_policy.apply_async(page, "getinfo")
+
+        with metrics.span("getinfo.navigation"):
+            await budget.goto_async(page, url, "getinfo.navigation", wait_until=_post_info_wait_until(resource_policy))
+
+        with metrics.span("getinfo.extract"):
+            og_description = await page.evaluate(OG_DESCRIPTION_JS)
+
+        return _post_info_from_og(og_description, url, logger)
+
+    except Exception as e:
+        logger.error(f"URL: {url}, 에러 발생: {str(e)}")
+        return None
+
+
+async def _dismiss_not_now(page):
+    """로그인 후 팝업의 "나중에 하기" 버튼 처리 (없으면 무시)"""
+    try:
+        for selector in NOT_NOW_SELECTORS:
+            if await page.is_visible(selector):
+                await page.click(selector)
+                break
+    except Exception:
+        pass
+
+
+async def async_instagram_login(page, username, password):
+    """
+    instagram_login의 async_api 버전
+
+    Args:
+        page: async Playwright 페이지 인스턴스
+        username: 인스타그램 사용자 이름
+        password: 인스타그램 비밀번호
+
+    Returns:
+        bool: 로그인이 성공하면 True, 그렇지 않으면 False
+    """
+    try:
+        print("인스타그램 로그인 페이지로 이동 중...")
+        await budget.goto_async(page, LOGIN_URL, "login.navigation", wait_until="load")
+
+        # 쿠키 수락 처리
+        try:
+            if await page.is_visible(COOKIE_ACCEPT_SELECTOR):
+                await page.click(COOKIE_ACCEPT_SELECTOR)
+        except Exception:
+            pass
+
+        try:
+            await budget.wait_for_selector_async(page, USERNAME_INPUT_SELECTOR, "login.form", timeout=10000,
+                                                 state="visible")
+            print("로그인 페이지 로드됨")
+        except TimeoutError:
+            print("로그인 폼을 찾을 수 없습니다. 계속 진행합니다...")
+
+        await budget.settle_async("login.form", 3)
+
+        print(f"{username}으로 로그인 중...")
+        await page.fill(USERNAME_INPUT_SELECTOR, username)
+        await page.fill(PASSWORD_INPUT_SELECTOR, password)
+        await page.click(SUBMIT_BUTTON_SELECTOR)
+
+        try:
+            await budget.wait_for_selector_async(page, HOME_ICON_SELECTOR, "login.home", timeout=15000,
+                                                 state="visible")
+            print("로그인 성공 - 홈 아이콘 확인됨")
+        except TimeoutError:
+            print("홈 아이콘을 찾을 수 없습니다. 로그인은 되었을 수 있으니 계속 진행합니다...")
+
+        # 로그인 후 팝업 처리 (두 번째 팝업이 뒤이어 뜨는 경우가 있어 한 번 더 확인)
+        await _dismiss_not_now(page)
+        await asyncio.sleep(2)
+        await _dismiss_not_now(page)
+
+        print("로그인 처리 완료!")
+        await asyncio.sleep(3)
+        return True
+
+    except Exception as e:
+        print(f"로그인 중 오류 발생: {e}")
+        return False
+
+
+async def async_is_session_valid(page, timeout=5000):
+    """is_session_valid의 async_api 버전"""
+    try:
+        await budget.goto_async(page, SESSION_CHECK_URL, "session.navigation", wait_until="domcontentloaded")
+        if LOGIN_PATH_MARKER in page.url:
+            return False
+        await budget.wait_for_selector_async(page, HOME_ICON_SELECTOR, "session.check", timeout=timeout,
+                                             state="visible")
+        return True
+    except TimeoutError:
+        return False
+    except Exception as e:
+        print(f"세션 확인 중 오류 발생: {e}")
+        return False
+
+
+async def _async_create_login_context(browser, storage_state=None):
+    """create_login_context의 async_api 버전"""
+    context = await browser.new_context(storage_state=storage_state, **LOGIN_CONTEXT_OPTIONS)
+    await context.add_cookies(SESSION_COOKIES)
+    return context
+
+
+async def async_open_logged_in_context(browser, username, password, session_dir=DEFAULT_SESSION_DIR,
+                                       resource_policy=None):
+    """
+    open_logged_in_page의 async_api 버전
+
+    Returns:
+        tuple: (컨텍스트, 로그인된 페이지, 로그인 성공 여부)
+    """
+    if session_dir is not None:
+        state_file = load_session_state(username, session_dir)
+        if state_file:
+            context = await _async_create_login_context(browser, state_file)
+            page = await context.new_page()
+            if resource_policy is not None:
+                await resource_policy.apply_async(page, "login")
+            with metrics.span("login.session_check"):
+                session_ok = await async_is_session_valid(page)
+            if session_ok:
+                metrics.count("session_reused")
+                print(f"저장된 세션으로 로그인 상태 확인됨: {username}")
+                return context, page, True
+            print("저장된 세션이 만료되었습니다. 다시 로그인합니다...")
+            await context.close()
+
+    context = await _async_create_login_context(browser)
+    page = await context.new_page()
+    if resource_policy is not None:
+        await resource_policy.apply_async(page, "login")
+    with metrics.span("login.form"):
+        login_success = await async_instagram_login(page, username, password)
+
+    if login_success and session_dir is not None:
+        try:
+            state_file = prepare_session_file(username, session_dir)
+            await context.storage_state(path=state_file)
+            os.chmod(state_file, 0o600)
+            print(f"세션 저장 완료: {state_file}")
+        except Exception as e:
+            print(f"세션 저장 중 오류 발생: {e}")
+
+    return context, page, login_success
+
+
+async def async_find_post_views(username, post_id, logger=None, content_type='reels', page=None,
+                                resource_policy=None, view_cache=None):
+    """
+    find_post_views의 async_api 버전
+
+    Args:
+        username: 인스타그램 사용자 이름
+        post_id: 찾고자 하는 포스트/릴 ID
+        logger: 로거 인스턴스 (없으면 새로 생성)
+        content_type: 컨텐츠 타입 ('post' 또는 'reels', 기본값: 'reels')
+        page: 로그인된 async 페이지 객체 (없으면 새 브라우저 실행)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy)
+        view_cache: 지정하면 그리드 수집 모드로 동작 (module.findview.ViewCountCache)
+
+    Returns:
+        str: 포스트 조회수 (원본 문자열 그대로, 예: "3.8만") 또는 찾지 못한 경우 None
+    """
+    if logger is None:
+        logger = setup_logging()
+
+    if content_type == 'post':
+        logger.info("Content type is 'post', skipping view count extraction")
+        return None
+
+    if view_cache is not None:
+        results = await async_find_posts_views(username, [post_id], logger, page, resource_policy, view_cache)
+        return results[post_id]
+
+    if page is not None:
+        return await _async_find_views_logic(page, username, post_id, logger, resource_policy)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=False)
+        context = await browser.new_context(viewport={"width": 1280, "height": 800})
+        page = await context.new_page()
+        try:
+            return await _async_find_views_logic(page, username, post_id, logger, resource_policy)
+        finally:
+            await browser.close()
+
+
+async def async_find_posts_views(username, post_ids, logger=None, page=None, resource_policy=None, view_cache=None,
+                                 max_scrolls=DEFAULT_GRID_SCROLLS):
+    """
+    find_posts_views의 async_api 버전
+
+    Returns:
+        dict: post_id → 조회수 문자열 (찾지 못한 경우 None)
+    """
+    if logger is None:
+        logger = setup_logging()
+    if view_cache is None:
+        view_cache = get_view_cache()
+
+    results, pending = _lookup_cached_views(view_cache, username, post_ids)
+    if not pending:
+        return results
+
+    if page is None:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=False)
+            context = await browser.new_context(viewport={"width": 1280, "height": 800})
+            try:
+                harvested = await _async_harvest_views_logic(await context.new_page(), username, logger,
+                                                             resource_policy, max_scrolls)
+            finally:
+                await browser.close()
+    else:
+        harvested = await _async_harvest_views_logic(page, username, logger, resource_policy, max_scrolls)
+
+    return _store_harvest(view_cache, username, harvested, pending, results, logger)
+
+
+async def _async_open_reels_grid(page, username, logger, resource_policy=None):
+    """홈페이지를 거쳐 사용자의 reels 그리드 페이지로 이동 (async)"""
+    with metrics.span("findview.navigation"):
+        if resource_policy is not None:
+            await resource_policy.apply_async(page, "findview")
+
+        profile_url = reels_grid_url(username)
+        logger.info(f"Navigating to: {profile_url}")
+
+        await budget.goto_async(page, HOME_URL, "home")
+        await budget.settle_async("home", 2)
+
+        try:
+            await budget.goto_async(page, profile_url, "findview.profile", timeout=PROFILE_TIMEOUT_MS,
+                                    wait_until="load")
+            await budget.settle_async("findview.profile", 5)
+        except budget.DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Navigation timeout, but continuing anyway: {e}")
+
+
+async def _async_harvest_views_logic(page, username, logger, resource_policy=None, max_scrolls=DEFAULT_GRID_SCROLLS):
+    """reels 그리드의 모든 타일 조회수를 수집 (async, 실패 시 None)"""
+    try:
+        await _async_open_reels_grid(page, username, logger, resource_policy)
+
+        await page.evaluate(WATCH_ANCHORS_JS)
+        harvested = {}
+        scroll_count = 0
+        while True:
+            with metrics.span("findview.scan"):
+                scan = await page.evaluate(SCAN_NEW_ANCHORS_JS, None)
+            if _harvest_scan(harvested, scan, username, scroll_count, max_scrolls):
+                break
+
+            scroll_count += 1
+            logger.info(f"Scrolling down ({scroll_count}/{max_scrolls})")
+            with metrics.span("findview.scroll"):
+                await page.evaluate(GRID_SCROLL_JS)
+                await asyncio.sleep(GRID_SCROLL_WAIT_SECONDS)
+
+        logger.info(f"Harvested view counts for {len(harvested)} reels of {username} in {scroll_count} scrolls")
+        return harvested
+
+    except Exception as e:
+        logger.error(f"Error during reels grid harvest: {e}")
+        return None
+
+
+async def _async_find_views_logic(page, username, post_id, logger, resource_policy=None, max_scrolls=DEFAULT_GRID_SCROLLS):
+    """조회수 추출 로직 (async)"""
+    try:
+        await _async_open_reels_grid(page, username, logger, resource_policy)
+
+        # 새로 추가된 링크만 한 번의 evaluate로 검사 (조회수 추출 포함)
+        await page.evaluate(WATCH_ANCHORS_JS)
+        scroll_count = 0
+        anchors_scanned = 0
+        match = None
+
+        while True:
+            with metrics.span("findview.scan"):
+                scanned, rows = await page.evaluate(SCAN_NEW_ANCHORS_JS, post_id)
+            anchors_scanned += scanned
+            metrics.count("findview_anchors_scanned", scanned)
+            if rows:
+                match = rows[0]
+                break
+            if _grid_scroll_done(scroll_count, max_scrolls, "search"):
+                break
+
+            scroll_count += 1
+            logger.info(f"Scrolling down ({scroll_count}/{max_scrolls})")
+            with metrics.span("findview.scroll"):
+                await page.evaluate(GRID_SCROLL_JS)
+                await asyncio.sleep(GRID_SCROLL_WAIT_SECONDS)
+
+        logger.info(f"Scanned {anchors_scanned} links in {scroll_count} scrolls")
+        return _view_count_from_match(match, post_id, max_scrolls, logger)
+
+    except Exception as e:
+        logger.error(f"Error during post view search: {e}")
+        return None
+
+
+async def _async_scroll_comments(page, comments_xpath):
+    """댓글 영역을 스크롤하고 스크롤 직전 패널 상태 [scrollHeight, 댓글 수]를 반환 (async)"""
+    with metrics.span("comments.scroll"):
+        return await page.evaluate(SCROLL_BY_JS, _scroll_args(comments_xpath))
+
+
+async def _async_wait_for_panel_change(page, comments_xpath, panel_state, timeout):
+    """
+    스크롤 후 댓글 패널 변화를 기다리는 함수 (async, 대기 중에는 이벤트 루프가 다른 페이지 작업을 진행)
+
+    Returns:
+        tuple: (변화 감지 여부, 실제 대기 시간(초), 시간 초과 여부)
+    """
+    started = time.time()
+    with metrics.span("comments.wait"):
+        try:
+            handle = await page.wait_for_function(
+                PANEL_CHANGED_JS,
+                arg=_panel_changed_args(comments_xpath, panel_state),
+                timeout=_panel_wait_timeout_ms(timeout),
+                polling=100
+            )
+            outcome = await handle.json_value()
+        except TimeoutError:
+            outcome = None
+        changed, timed_out = _panel_wait_outcome(outcome)
+    return changed, time.time() - started, timed_out
+
+
+async def _async_fast_forward_scrolls(page, comments_xpath, scrolls, wait_timeout, max_idle_waits):
+    """
+    체크포인트의 스크롤 위치까지 댓글 추출 없이 스크롤만 반복하는 함수 (async)
+
+    Returns:
+        int: 실제로 수행한 스크롤 횟수
+    """
+    idle_waits = 0
+    performed = 0
+    for _ in range(scrolls):
+        panel_state = await _async_scroll_comments(page, comments_xpath)
+        performed += 1
+        changed, _, _ = await _async_wait_for_panel_change(page, comments_xpath, panel_state, wait_timeout)
+        if changed:
+            idle_waits = 0
+        else:
+            idle_waits += 1
+            if idle_waits >= max_idle_waits:
+                break
+    return performed
+
+
+async def async_collect_instagram_comments(page, post_url, capture_mode="dom", max_scrolls=50,
+                                           wait_timeout=5.0, max_idle_waits=2, resource_policy=None,
+                                           writer=None, keep_in_memory=True, checkpoint=None, resume=False,
+                                           known_ids=None, delta_threshold=10, prune_keep=None):
+    """
+    collect_instagram_comments의 async_api 버전 (댓글 추출은 bulk 방식 사용)
+
+    체크포인트/이어서 수집, 델타 모드, 게시물 시간 예산, 결과 metadata는 sync 버전과 같음
+    (인자 설명은 collect_instagram_comments 참고)
+
+    Args:
+        page: 로그인된 async 페이지 인스턴스
+        post_url: 스크래핑할 인스타그램 게시물의 URL
+
+    Returns:
+        dict: 수집된 댓글과 메타데이터를 포함하는 사전
+    """
+    crawl = _CommentCrawl(post_url, "bulk", capture_mode, max_scrolls, wait_timeout, max_idle_waits,
+                          writer, keep_in_memory, checkpoint, resume, known_ids, delta_threshold, prune_keep)
+
+    # 체크포인트에서 이전 수집 상태 복원 (이미 끝난 수집이면 저장된 결과 반환)
+    restored = crawl.restore()
+    if restored is not None:
+        return restored
+
+    if resource_policy is not None:
+        await resource_policy.apply_async(page, "comment")
+
+    if capture_mode == "network":
+        crawl.collector = CommentResponseCollector(page).attach()
+    collector = crawl.collector
+
+    try:
+        print(f"릴 페이지로 이동 중: {post_url}")
+        with metrics.span("comments.navigation"):
+            await budget.goto_async(page, post_url, "comments.navigation", wait_until="load")
+
+            try:
+                await budget.wait_for_selector_async(page, POST_CONTENT_SELECTOR, "comments.content",
+                                                     timeout=15000, state="visible")
+            except TimeoutError:
+                print("페이지 주요 콘텐츠를 찾을 수 없습니다. 계속 진행합니다...")
+
+            await budget.settle_async("comments.content", 5)
+
+        comments_xpath = _comments_xpath(await page.evaluate(MOUNT_ID_JS))
+
+        try:
+            comment_area = page.locator(f"xpath={comments_xpath}")
+            if await comment_area.is_visible():
+                await comment_area.hover()
+                await asyncio.sleep(1)
+
+                if crawl.resumed_scrolls > 0:
+                    print(f"체크포인트 위치까지 스크롤 중... ({crawl.resumed_scrolls}회)")
+                    crawl.scroll_count = await _async_fast_forward_scrolls(
+                        page, comments_xpath, crawl.fast_forward_scrolls, wait_timeout, max_idle_waits
+                    )
+
+                while crawl.should_scroll():
+                    network_comments = await collector.drain_async() if collector is not None else ()
+                    extracted_comments = None
+                    if crawl.needs_dom():
+                        with metrics.span("comments.extract"):
+                            rows = await page.evaluate(EXTRACT_COMMENTS_JS, _extract_comments_args(comments_xpath))
+                        extracted_comments = _rows_to_comments(rows)
+                    new_comments_this_scroll, prune_upto = crawl.add_comments(network_comments, extracted_comments)
+
+                    if crawl.delta_done():
+                        break
+
+                    if prune_keep is not None:
+                        with metrics.span("comments.prune"):
+                            crawl.pruned_nodes += await page.evaluate(
+                                PRUNE_COMMENTS_JS, _prune_args(comments_xpath, prune_upto, prune_keep)
+                            )
+
+                    panel_state = await _async_scroll_comments(page, comments_xpath)
+                    crawl.record_scroll(panel_state)
+
+                    changed, waited, timed_out = await _async_wait_for_panel_change(
+                        page, comments_xpath, panel_state, wait_timeout
+                    )
+                    if crawl.record_wait(new_comments_this_scroll, changed, waited, timed_out):
+                        break
+            else:
+                print(f"XPath로 댓글 영역을 찾을 수 없습니다: {post_url}")
+
+        except Exception as e:
+            print(f"댓글 수집 중 오류 발생: {e}")
+            crawl.scroll_error = e
+
+        if collector is not None:
+            _add_network_comments(await collector.drain_async(), crawl.store)
+
+        return crawl.finish()
+
+    except Exception as e:
+        return crawl.error_result(e)
+
+    finally:
+        if collector is not None:
+            collector.detach()
+
+
+async def _async_crawl_post(browser, page, url, content_type, logger, comment_options, resource_policy=None,
+                            fetch_mode="browser", cache=None, bypass_cache=False, view_cache=None,
+                            checkpoint_options=None, delta_options=None):
+    """
+    게시물 하나를 수집해 crawler.py와 동일한 구조의 결과 데이터를 반환하는 함수
+
+    Args:
+        browser: 기본 정보 수집용 async 브라우저
+        page: 로그인된 페이지 (없으면 기본 정보만 수집)
+        comment_options: async_collect_instagram_comments에 전달할 추가 옵션
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy)
+        fetch_mode: 기본 정보 수집 방식 ('browser' 또는 'http')
+        cache: 포스트 정보 캐시 (module.cache.PostInfoCache)
+        bypass_cache: True이면 캐시를 조회하지 않음
+        view_cache: 조회수 그리드 수집 캐시 (module.findview.ViewCountCache, 없으면 게시물별 탐색)
+        checkpoint_options: 댓글 수집 체크포인트 옵션 (checkpoint_dir, interval, resume)
+        delta_options: 델타 수집 옵션 (module.result.prepare_comment_options 참고)
+    """
+    result_data = create_result_data(page is not None, content_type)
+
+    # 동시에 실행되는 태스크의 구간은 겹쳐서 기록됨 (contextvars로 태스크별 부모 구간 유지)
+    with metrics.span("getinfo"):
+        post_info = await async_get_post_info(url, logger, browser=browser, resource_policy=resource_policy,
+                                              fetch_mode=fetch_mode, cache=cache, bypass_cache=bypass_cache)
+    if not post_info:
+        result_data["metadata"]["error"] = "post info not available"
+        return result_data
+
+    post_info["content_type"] = content_type
+    post_info["views"] = None
+    result_data["post_info"] = post_info
+
+    if page is None:
+        return result_data
+
+    if content_type == 'reels' and post_info["username"]:
+        with metrics.span("findview"):
+            post_info["views"] = await async_find_post_views(
+                post_info["username"], post_info["post_id"], logger, content_type, page, resource_policy, view_cache
+            )
+
+    # 조회수 단계에서 게시물 시간 예산을 다 썼으면 댓글 수집을 건너뜀
+    if budget.expired():
+        result_data["metadata"]["deadline_reached"] = True
+        return result_data
+
+    _, post_kwargs = prepare_comment_options(post_info["post_id"], checkpoint_options, delta_options)
+    with metrics.span("comments"):
+        comments_data = await async_collect_instagram_comments(
+            page, url, resource_policy=resource_policy, **post_kwargs, **(comment_options or {})
+        )
+    apply_comments_result(result_data, comments_data)
+    return result_data
+
+
+async def crawl_posts_concurrently(urls, username=None, password=None, content_type='reels',
+                                   concurrency=3, logger=None, comment_options=None, headless=None,
+                                   session_dir=DEFAULT_SESSION_DIR, resource_policy=None, fetch_mode="browser",
+                                   cache=None, bypass_cache=False, view_cache=None, checkpoint_options=None,
+                                   delta_options=None):
+    """
+    하나의 브라우저와 하나의 로그인 컨텍스트에서 여러 게시물을 동시에 수집하는 함수
+
+    concurrency 개수만큼의 페이지를 만들고, 각 페이지가 작업 큐에서 URL을 하나씩 가져가 처리
+    (게시물 시간 예산은 태스크별로 따로 적용)
+
+    Args:
+        urls: Instagram 포스트 URL 리스트
+        username: 인스타그램 사용자 이름 (없으면 기본 정보만 수집)
+        password: 인스타그램 비밀번호
+        content_type: 컨텐츠 타입 ('post' 또는 'reels')
+        concurrency: 동시에 처리할 게시물(페이지) 수
+        logger: 로거 인스턴스 (없으면 새로 생성)
+        comment_options: async_collect_instagram_comments에 전달할 추가 옵션 (capture_mode, wait_timeout 등)
+        headless: 헤드리스 여부 (None이면 로그인 시 False, 아니면 True)
+        session_dir: 로그인 세션 저장 디렉터리 (None이면 저장된 세션을 사용하지 않음)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy)
+        fetch_mode: 기본 정보 수집 방식 ('browser' 또는 'http')
+        cache: 포스트 정보 캐시 (module.cache.PostInfoCache)
+        bypass_cache: True이면 캐시를 조회하지 않고 새로 수집한 결과로 갱신
+        view_cache: 조회수 그리드 수집 캐시 (module.findview.ViewCountCache)
+        checkpoint_options: 댓글 수집 체크포인트 옵션 (checkpoint_dir, interval, resume)
+        delta_options: 델타 수집 옵션 (module.result.prepare_comment_options 참고)
+
+    Returns:
+        list: urls와 같은 순서의 결과 데이터 리스트
+    """
+    if logger is None:
+        logger = setup_logging()
+
+    urls = [normalize_instagram_url(url) for url in urls]
+    need_login = bool(username and password)
+    if headless is None:
+        headless = not need_login
+    concurrency = max(1, min(concurrency, len(urls) or 1))
+
+    results = [None] * len(urls)
+    queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        queue.put_nowait((index, url))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+
+        try:
+            pages = [None] * concurrency
+            if need_login:
+                # 쿠키는 컨텍스트 단위로 공유되므로 한 번만 로그인
+                with metrics.span("login"):
+                    context, login_page, login_success = await async_open_logged_in_context(
+                        browser, username, password, session_dir, resource_policy
+                    )
+                if login_success:
+                    pages = [login_page] + [await context.new_page() for _ in range(concurrency - 1)]
+                else:
+                    print("Login failed. Skipping view count and comment collection for all posts.")
+
+            async def worker(page):
+                while True:
+                    try:
+                        index, url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    # 각 worker는 별도 태스크이므로 게시물 시간 예산도 태스크마다 따로 유지됨
+                    budget.start_post()
+                    try:
+                        results[index] = await _async_crawl_post(
+                            browser, page, url, content_type, logger, comment_options, resource_policy, fetch_mode,
+                            cache, bypass_cache, view_cache, checkpoint_options, delta_options
+                        )
+                    except Exception as e:
+                        logger.error(f"URL: {url}, 동시 수집 중 에러 발생: {str(e)}")
+                        results[index] = create_result_data(page is not None, content_type)
+                        results[index]["metadata"]["error"] = str(e)
+                    finally:
+                        budget.end_post()
+                    print(f"Finished {url} ({sum(r is not None for r in results)}/{len(urls)})")
+
+            await asyncio.gather(*(worker(page) for page in pages))
+        finally:
+            await browser.close()
+
+    return results
\ No newline at end of file
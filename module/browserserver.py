@@ -0,0 +1,206 @@
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from module import metrics
+
+# 실행 중인 공유 브라우저의 접속 정보를 기록하는 기본 파일
+DEFAULT_SERVER_FILE = ".browser_server.json"
+
+# 원격 디버깅(CDP) 기본 포트
+DEFAULT_PORT = 9222
+
+# 크롤링에 필요 없는 백그라운드 기능을 끈 헤드리스 Chromium 실행 인자
+LEAN_CHROMIUM_ARGS = [
+    "--headless=new",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-breakpad",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--password-store=basic",
+    "--use-mock-keychain",
+]
+
+
+def _read_version(endpoint, timeout=1.0):
+    """CDP 엔드포인트의 /json/version 응답 (응답이 없으면 None)"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (OSError, ValueError, urllib.error.URLError):
+        return None
+
+
+def start_browser_server(port=DEFAULT_PORT, state_file=DEFAULT_SERVER_FILE, executable_path=None, startup_timeout=15):
+    """
+    공유 브라우저(원격 디버깅 포트를 연 헤드리스 Chromium)를 실행하는 함수
+
+    Python Playwright에는 launch_server가 없으므로 Playwright가 설치한 Chromium을 직접 실행하고,
+    이후 실행은 connect_over_cdp로 이 브라우저에 연결해 실행마다 새 컨텍스트만 만듦
+
+    Args:
+        port: 원격 디버깅 포트 (127.0.0.1에서만 열림)
+        state_file: 접속 정보를 기록할 파일
+        executable_path: Chromium 실행 파일 (없으면 Playwright가 설치한 Chromium)
+        startup_timeout: 브라우저가 응답할 때까지 기다리는 최대 시간 (초)
+
+    Returns:
+        tuple: (subprocess.Popen, 접속 정보 딕셔너리)
+    """
+    if executable_path is None:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            executable_path = p.chromium.executable_path
+
+    endpoint = f"http://127.0.0.1:{port}"
+    if _read_version(endpoint) is not None:
+        raise RuntimeError(f"Port {port} is already in use by another browser ({endpoint})")
+
+    user_data_dir = tempfile.mkdtemp(prefix="instagram-crawler-browser-")
+    process = subprocess.Popen(
+        [executable_path, f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1",
+         f"--user-data-dir={user_data_dir}", *LEAN_CHROMIUM_ARGS, "about:blank"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.time() + startup_timeout
+    version = None
+    while time.time() < deadline and process.poll() is None:
+        version = _read_version(endpoint)
+        if version is not None:
+            break
+        time.sleep(0.2)
+    if version is None:
+        process.kill()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        raise RuntimeError(f"Browser did not start listening on {endpoint} within {startup_timeout}s")
+
+    info = {
+        "endpoint": endpoint,
+        "pid": process.pid,
+        "browser": version.get("Browser"),
+        "user_data_dir": user_data_dir,
+        "started_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    return process, info
+
+
+def stop_browser_server(process, info, state_file=DEFAULT_SERVER_FILE):
+    """공유 브라우저를 종료하고 접속 정보 파일과 임시 프로필을 삭제하는 함수"""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    try:
+        os.remove(state_file)
+    except OSError:
+        pass
+    shutil.rmtree(info["user_data_dir"], ignore_errors=True)
+
+
+def serve_browser(port=DEFAULT_PORT, state_file=DEFAULT_SERVER_FILE):
+    """
+    공유 브라우저를 실행하고 Ctrl+C로 중단하거나 브라우저가 종료될 때까지 유지하는 함수 (--serve-browser)
+
+    Args:
+        port: 원격 디버깅 포트
+        state_file: 접속 정보를 기록할 파일
+    """
+    process, info = start_browser_server(port, state_file)
+    print(f"Shared browser ready: {info['browser']} at {info['endpoint']} (pid {info['pid']})")
+    print(f"Other runs attach with --connect (endpoint recorded in {state_file}). Press Ctrl+C to stop.")
+    try:
+        process.wait()
+        print("Shared browser exited.")
+    except KeyboardInterrupt:
+        print("\nStopping shared browser...")
+    finally:
+        stop_browser_server(process, info, state_file)
+
+
+def read_server_endpoint(state_file=DEFAULT_SERVER_FILE):
+    """
+    접속 정보 파일에 기록된 공유 브라우저 엔드포인트를 반환하는 함수
+
+    Returns:
+        str: 응답하는 엔드포인트 또는 파일이 없거나 브라우저가 응답하지 않으면 None
+    """
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            endpoint = json.load(f).get("endpoint")
+    except (OSError, ValueError):
+        return None
+    if endpoint and _read_version(endpoint) is not None:
+        return endpoint
+    return None
+
+
+def connect_browser(playwright, endpoint=None, state_file=DEFAULT_SERVER_FILE, timeout=5000):
+    """
+    실행 중인 공유 브라우저에 연결하는 함수
+
+    연결된 브라우저에서 browser.new_page()/new_context()는 실행마다 독립된 새 컨텍스트를 만들고,
+    browser.close()는 이 실행이 만든 컨텍스트만 정리하고 연결을 끊음 (공유 브라우저는 계속 실행)
+
+    Args:
+        playwright: sync_playwright()로 시작한 Playwright 인스턴스
+        endpoint: CDP 엔드포인트 (없으면 state_file에서 읽음)
+        state_file: 접속 정보 파일
+        timeout: 연결 대기 시간 (ms)
+
+    Returns:
+        Browser: 연결된 브라우저 또는 연결할 수 없으면 None
+    """
+    endpoint = endpoint or read_server_endpoint(state_file)
+    if not endpoint:
+        return None
+    try:
+        with metrics.span("browser.connect"):
+            return playwright.chromium.connect_over_cdp(endpoint, timeout=timeout)
+    except Exception as e:
+        print(f"Could not attach to shared browser at {endpoint}: {e}")
+        return None
+
+
+def launch_or_connect(playwright, endpoint=None, headless=True, state_file=DEFAULT_SERVER_FILE):
+    """
+    공유 브라우저에 연결하고, 연결할 수 없으면 새 브라우저를 실행하는 함수
+
+    Args:
+        playwright: sync_playwright()로 시작한 Playwright 인스턴스
+        endpoint: CDP 엔드포인트 (빈 문자열/None이면 state_file에서 읽음)
+        headless: 새로 실행할 때의 헤드리스 여부
+        state_file: 접속 정보 파일
+
+    Returns:
+        Browser: 연결되었거나 새로 실행한 브라우저
+    """
+    browser = connect_browser(playwright, endpoint, state_file)
+    if browser is not None:
+        print("Attached to shared browser.")
+        return browser
+    print("Shared browser not available; launching a new browser.")
+    return playwright.chromium.launch(headless=headless)
\ No newline at end of file
@@ -0,0 +1,428 @@
+import asyncio
+import collections
+import contextvars
+import datetime
+import json
+import math
+import os
+import time
+
+from module import metrics
+
+# 단계별 지연 시간 기록 파일 (실행 사이에 학습 결과 유지)
+DEFAULT_BUDGET_FILE = os.path.join(".cache", "latency.json")
+
+# 단계별로 보관하는 최근 측정값 수
+DEFAULT_WINDOW = 50
+
+# 이보다 측정값이 적은 단계는 기존 고정 시간 초과를 그대로 사용
+DEFAULT_MIN_SAMPLES = 5
+
+# 시간 초과 = p95 × 배수 (기존 고정 값을 넘지 않고 하한보다 짧아지지 않음)
+DEFAULT_MULTIPLIER = 2.0
+DEFAULT_FLOOR_MS = 2000
+
+# 페이지 이동 실패 시 추가 시도 횟수
+DEFAULT_NAV_RETRIES = 1
+
+# 게시물 하나에 허용하는 전체 시간 (초)
+DEFAULT_POST_DEADLINE = 600
+
+# 안정화 대기의 최소 시간 (초)
+MIN_SETTLE_SECONDS = 0.5
+
+# timeout을 지정하지 않은 Playwright 호출의 기본 시간 초과 (밀리초)
+PLAYWRIGHT_DEFAULT_TIMEOUT_MS = 30000
+
+
+class DeadlineExceeded(Exception):
+    """게시물별 전체 시간 예산을 모두 사용했을 때 발생하는 예외"""
+
+
+def _is_timeout(error):
+    # Playwright의 TimeoutError (모듈을 가져오지 않고 이름으로 판별)
+    return type(error).__name__ == "TimeoutError"
+
+
+class LatencyBudget:
+    """
+    최근 실행에서 측정한 단계별 지연 시간 분포로 시간 초과를 정하고, 게시물별 전체 시간 예산을 관리하는 클래스
+
+    - 단계별 시간 초과: clamp(p95 × multiplier, floor_ms, 기존 고정 값)
+      측정값이 min_samples보다 적으면 기존 고정 값을 그대로 사용
+    - 시간 초과로 끝난 대기는 사용한 시간 초과 값으로 기록 (느려진 단계는 다음 시간 초과가 다시 늘어남)
+    - 페이지 이동은 retries회까지 다시 시도하며, 시도마다 시간 초과를 두 배로 늘림 (기존 고정 값까지)
+    - 모든 대기는 게시물의 남은 시간을 넘지 않고, 남은 시간이 없으면 DeadlineExceeded 발생
+    - 게시물 시간 예산은 contextvars로 보관하므로 동시에 실행되는 async 태스크는 각자의 예산을 사용
+    """
+
+    def __init__(self, path=DEFAULT_BUDGET_FILE, window=DEFAULT_WINDOW, min_samples=DEFAULT_MIN_SAMPLES,
+                 multiplier=DEFAULT_MULTIPLIER, floor_ms=DEFAULT_FLOOR_MS, retries=DEFAULT_NAV_RETRIES,
+                 post_deadline=DEFAULT_POST_DEADLINE, clock=time.monotonic):
+        """
+        Args:
+            path: 측정값을 불러오고 저장할 파일 (None이면 저장하지 않음)
+            window: 단계별로 보관하는 최근 측정값 수
+            min_samples: 학습한 시간 초과를 사용하기 위한 최소 측정값 수
+            multiplier: p95에 곱하는 배수
+            floor_ms: 시간 초과 하한 (밀리초)
+            retries: 페이지 이동 실패 시 추가 시도 횟수
+            post_deadline: 게시물 하나에 허용하는 전체 시간 (초, None이면 제한 없음)
+            clock: 단조 시계 함수 (테스트용)
+        """
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.floor_ms = floor_ms
+        self.retries = retries
+        self.post_deadline = post_deadline
+        self.clock = clock
+        self.samples = {}
+        self._deadline = contextvars.ContextVar(f"post_deadline_{id(self)}", default=None)
+        self.stats_counts = {"retries": 0, "timeouts": 0, "deadline_exceeded": 0}
+        if path:
+            self.load()
+
+    @property
+    def deadline(self):
+        """현재 게시물의 마감 시각 (clock 기준, 예산이 없으면 None)"""
+        return self._deadline.get()
+
+    @deadline.setter
+    def deadline(self, value):
+        self._deadline.set(value)
+
+    def load(self):
+        """저장된 단계별 측정값 불러오기 (파일이 없거나 손상되었으면 빈 상태로 시작)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stages = json.load(f).get("stages", {})
+        except (OSError, ValueError, AttributeError):
+            return
+        for stage, values in stages.items():
+            if isinstance(values, list):
+                self.samples[stage] = collections.deque(
+                    (float(value) for value in values if isinstance(value, (int, float))), maxlen=self.window
+                )
+
+    def save(self):
+        """단계별 측정값을 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return None
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            "updated_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "stages": {stage: [round(value, 3) for value in values] for stage, values in self.samples.items()},
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def record(self, stage, seconds):
+        """단계의 지연 시간 측정값 추가 (초)"""
+        if stage not in self.samples:
+            self.samples[stage] = collections.deque(maxlen=self.window)
+        self.samples[stage].append(seconds)
+
+    def percentile(self, stage, q):
+        """
+        단계 측정값의 백분위수 (nearest-rank)
+
+        Returns:
+            float: 백분위수(초) 또는 측정값이 min_samples보다 적으면 None
+        """
+        values = self.samples.get(stage)
+        if not values or len(values) < self.min_samples:
+            return None
+        ordered = sorted(values)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def timeout_ms(self, stage, default_ms):
+        """
+        단계의 시간 초과 (밀리초, 게시물의 남은 시간 이내)
+
+        Args:
+            stage: 단계 이름
+            default_ms: 기존 고정 시간 초과 (상한)
+
+        Raises:
+            DeadlineExceeded: 게시물의 남은 시간이 없을 때
+        """
+        p95 = self.percentile(stage, 95)
+        timeout = default_ms
+        if p95 is not None:
+            timeout = min(default_ms, max(self.floor_ms, p95 * 1000 * self.multiplier))
+        return self._cap_ms(timeout)
+
+    def settle_seconds(self, stage, default_seconds):
+        """
+        페이지 이동 후 안정화 대기 시간 (초)
+
+        직전 대기 단계(페이지 이동/요소 대기)의 p50만큼만 대기하고 기존 고정 값을 넘지 않음 (빨리 열리는 페이지는 짧게 대기)
+        """
+        p50 = self.percentile(stage, 50)
+        seconds = default_seconds
+        if p50 is not None:
+            seconds = min(default_seconds, max(MIN_SETTLE_SECONDS, p50))
+        return self.cap(seconds)
+
+    def start_post(self, deadline=None):
+        """게시물 처리 시작: 전체 시간 예산 설정 (None이면 post_deadline 사용)"""
+        seconds = self.post_deadline if deadline is None else deadline
+        self.deadline = None if seconds is None else self.clock() + seconds
+
+    def end_post(self):
+        """게시물 처리 종료: 전체 시간 예산 해제"""
+        self.deadline = None
+
+    def remaining(self):
+        """게시물의 남은 시간 (초, 예산이 없으면 None)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.clock())
+
+    def expired(self):
+        """게시물의 전체 시간 예산을 모두 사용했는지 여부"""
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def check(self):
+        """남은 시간이 없으면 DeadlineExceeded 발생"""
+        if self.expired():
+            self.stats_counts["deadline_exceeded"] += 1
+            metrics.count("budget_deadline_exceeded")
+            raise DeadlineExceeded(f"post deadline of {self.post_deadline}s exceeded")
+
+    def cap(self, seconds):
+        """대기 시간을 게시물의 남은 시간 이내로 제한 (초)"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def _cap_ms(self, timeout_ms):
+        self.check()
+        return max(1, int(self.cap(timeout_ms / 1000) * 1000))
+
+    def goto(self, page, url, stage, timeout=None, **kwargs):
+        """
+        학습한 시간 초과로 페이지 이동 (실패하면 시간 초과를 늘려 retries회까지 다시 시도)
+
+        Args:
+            page: Playwright 페이지 인스턴스
+            url: 이동할 URL
+            stage: 단계 이름 (측정값 구분)
+            timeout: 기존 고정 시간 초과 (밀리초, None이면 Playwright 기본값)
+            **kwargs: page.goto에 전달할 추가 인자 (wait_until 등)
+
+        Returns:
+            Response: page.goto 반환값
+        """
+        default_ms = PLAYWRIGHT_DEFAULT_TIMEOUT_MS if timeout is None else timeout
+        attempt_ms = self.timeout_ms(stage, default_ms)
+        for attempt in range(self.retries + 1):
+            started = self.clock()
+            try:
+                response = page.goto(url, timeout=attempt_ms, **kwargs)
+                self.record(stage, self.clock() - started)
+                return response
+            except Exception as e:
+                attempt_ms = self._retry_timeout_ms(url, stage, e, attempt, attempt_ms, default_ms)
+                if attempt_ms is None:
+                    raise
+
+    async def goto_async(self, page, url, stage, timeout=None, **kwargs):
+        """goto()의 async_api 버전"""
+        default_ms = PLAYWRIGHT_DEFAULT_TIMEOUT_MS if timeout is None else timeout
+        attempt_ms = self.timeout_ms(stage, default_ms)
+        for attempt in range(self.retries + 1):
+            started = self.clock()
+            try:
+                response = await page.goto(url, timeout=attempt_ms, **kwargs)
+                self.record(stage, self.clock() - started)
+                return response
+            except Exception as e:
+                attempt_ms = self._retry_timeout_ms(url, stage, e, attempt, attempt_ms, default_ms)
+                if attempt_ms is None:
+                    raise
+
+    def _retry_timeout_ms(self, url, stage, error, attempt, attempt_ms, default_ms):
+        """
+        실패한 페이지 이동 시도를 기록하고 다음 시도의 시간 초과를 정하는 함수
+
+        Returns:
+            int: 다음 시도의 시간 초과 (밀리초) 또는 더 시도하지 않으면 None (호출 측에서 예외를 다시 발생)
+        """
+        if _is_timeout(error):
+            # 시간 초과로 끝난 시도는 실제 지연 시간이 최소 attempt_ms라는 뜻이므로 그 값으로 기록
+            self.record(stage, attempt_ms / 1000)
+            self.stats_counts["timeouts"] += 1
+        if attempt >= self.retries or self.expired():
+            return None
+        self.stats_counts["retries"] += 1
+        metrics.count("budget_navigation_retries")
+        print(f"Navigation to {url} failed ({type(error).__name__}); retrying ({attempt + 1}/{self.retries})...")
+        return self._cap_ms(min(default_ms, attempt_ms * 2))
+
+    def wait_for_selector(self, page, selector, stage, timeout, **kwargs):
+        """학습한 시간 초과로 요소 대기 (시간 초과 예외는 호출 측에서 처리)"""
+        timeout_ms = self.timeout_ms(stage, timeout)
+        started = self.clock()
+        try:
+            result = page.wait_for_selector(selector, timeout=timeout_ms, **kwargs)
+        except Exception as e:
+            self._record_wait_failure(stage, e, timeout_ms)
+            raise
+        self.record(stage, self.clock() - started)
+        return result
+
+    async def wait_for_selector_async(self, page, selector, stage, timeout, **kwargs):
+        """wait_for_selector()의 async_api 버전"""
+        timeout_ms = self.timeout_ms(stage, timeout)
+        started = self.clock()
+        try:
+            result = await page.wait_for_selector(selector, timeout=timeout_ms, **kwargs)
+        except Exception as e:
+            self._record_wait_failure(stage, e, timeout_ms)
+            raise
+        self.record(stage, self.clock() - started)
+        return result
+
+    def _record_wait_failure(self, stage, error, timeout_ms):
+        """시간 초과로 끝난 요소 대기를 사용한 시간 초과 값으로 기록"""
+        if _is_timeout(error):
+            self.record(stage, timeout_ms / 1000)
+            self.stats_counts["timeouts"] += 1
+
+    def summary(self):
+        """단계별 측정값 수, p50/p95(초), 현재 시간 초과와 재시도/시간 초과/예산 초과 횟수"""
+        stages = {}
+        for stage, values in sorted(self.samples.items()):
+            p50 = self.percentile(stage, 50)
+            p95 = self.percentile(stage, 95)
+            stages[stage] = {
+                "samples": len(values),
+                "p50": None if p50 is None else round(p50, 3),
+                "p95": None if p95 is None else round(p95, 3),
+            }
+        return {"post_deadline": self.post_deadline, "nav_retries": self.retries, **self.stats_counts, "stages": stages}
+
+
+# 현재 활성화된 예산 관리자 (없으면 기존 고정 시간 초과와 대기를 그대로 사용)
+_budget = None
+
+
+def set_budget(budget):
+    """프로세스 전체에서 사용할 예산 관리자 설정 (None이면 비활성화)"""
+    global _budget
+    _budget = budget
+    return budget
+
+
+def get_budget():
+    """현재 예산 관리자 반환 (비활성화 상태면 None)"""
+    return _budget
+
+
+def goto(page, url, stage, timeout=None, **kwargs):
+    """활성 예산 관리자로 페이지 이동 (비활성화 상태면 기존과 같은 page.goto)"""
+    if _budget is None:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return page.goto(url, **kwargs)
+    with metrics.span("budget.goto", stage=stage):
+        return _budget.goto(page, url, stage, timeout, **kwargs)
+
+
+async def goto_async(page, url, stage, timeout=None, **kwargs):
+    """goto()의 async_api 버전"""
+    if _budget is None:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return await page.goto(url, **kwargs)
+    with metrics.span("budget.goto", stage=stage):
+        return await _budget.goto_async(page, url, stage, timeout, **kwargs)
+
+
+def wait_for_selector(page, selector, stage, timeout, **kwargs):
+    """활성 예산 관리자로 요소 대기 (비활성화 상태면 고정 시간 초과 사용)"""
+    if _budget is None:
+        return page.wait_for_selector(selector, timeout=timeout, **kwargs)
+    return _budget.wait_for_selector(page, selector, stage, timeout, **kwargs)
+
+
+async def wait_for_selector_async(page, selector, stage, timeout, **kwargs):
+    """wait_for_selector()의 async_api 버전"""
+    if _budget is None:
+        return await page.wait_for_selector(selector, timeout=timeout, **kwargs)
+    return await _budget.wait_for_selector_async(page, selector, stage, timeout, **kwargs)
+
+
+def _settle_seconds(stage, seconds):
+    """안정화 대기 시간 (활성화 상태면 직전 대기 단계의 p50, sync/async 공용)"""
+    if _budget is not None:
+        return _budget.settle_seconds(stage, seconds)
+    return seconds
+
+
+def settle(stage, seconds):
+    """페이지 이동 후 안정화 대기 (활성화 상태면 직전 대기 단계의 p50만큼만 대기)"""
+    seconds = _settle_seconds(stage, seconds)
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+async def settle_async(stage, seconds):
+    """settle()의 async_api 버전 (대기 중에는 이벤트 루프가 다른 태스크를 진행)"""
+    seconds = _settle_seconds(stage, seconds)
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+def cap(seconds):
+    """대기 시간을 게시물의 남은 시간 이내로 제한 (비활성화 상태면 그대로)"""
+    if _budget is None:
+        return seconds
+    return _budget.cap(seconds)
+
+
+def expired():
+    """게시물의 전체 시간 예산을 모두 사용했는지 여부 (비활성화 상태면 False)"""
+    return _budget is not None and _budget.expired()
+
+
+def start_post(deadline=None):
+    """활성 예산 관리자의 게시물 시간 예산 시작"""
+    if _budget is not None:
+        _budget.start_post(deadline)
+
+
+def end_post():
+    """활성 예산 관리자의 게시물 시간 예산 해제"""
+    if _budget is not None:
+        _budget.end_post()
+
+
+def summary():
+    """활성 예산 관리자의 요약 (비활성화 상태면 None)"""
+    if _budget is None:
+        return None
+    return _budget.summary()
+
+
+def save(logger=None):
+    """활성 예산 관리자의 측정값 저장 (실패는 수집 결과에 영향을 주지 않음)"""
+    if _budget is None:
+        return None
+    try:
+        path = _budget.save()
+    except OSError as e:
+        if logger is not None:
+            logger.error(f"지연 시간 기록 저장 중 에러 발생: {str(e)}")
+        print(f"Failed to save latency budget: {e}")
+        return None
+    if path and logger is not None:
+        logger.info(f"지연 시간 기록 저장 완료: {path}")
+    return path
\ No newline at end of file
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+import json
+import os
+import re
+import threading
+import time
+
+# 포스트 정보 디스크 캐시 기본 디렉터리
+DEFAULT_CACHE_DIR = ".cache/post_info"
+
+# 필드별 유효 시간 (초, None이면 만료되지 않음)
+# 좋아요/댓글 수는 자주 바뀌고, 작성자/작성일은 사실상 바뀌지 않음
+DEFAULT_FIELD_TTLS = {
+    "post_id": None,
+    "url": None,
+    "username": 7 * 24 * 3600,
+    "post_date": 7 * 24 * 3600,
+    "description": 24 * 3600,
+    "likes": 10 * 60,
+    "comments_count": 10 * 60,
+}
+
+# 자주 바뀌는 필드 (이 필드만 만료되면 나머지는 캐시에서 쓰고 수만 다시 가져옴)
+VOLATILE_FIELDS = ("likes", "comments_count")
+
+
+class PostInfoCache:
+    """
+    게시물 ID를 키로 포스트 정보를 캐시하는 클래스
+
+    메모리 LRU(최근 사용 순)를 앞단에 두고, 디스크(게시물별 JSON 파일)를 영구 저장소로 사용
+    필드마다 저장 시각을 기록해 필드별 TTL로 만료를 판단하므로, 작성자만 필요한 조회는
+    좋아요 수가 만료된 항목으로도 응답할 수 있음
+    여러 스레드(HTTP 모드의 스레드 풀 등)에서 공유 가능
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=256, field_ttls=None, default_ttl=3600):
+        """
+        Args:
+            cache_dir: 디스크 캐시 디렉터리 (None이면 메모리만 사용)
+            max_entries: 메모리에 보관할 최대 게시물 수
+            field_ttls: 필드별 유효 시간 (없으면 DEFAULT_FIELD_TTLS)
+            default_ttl: field_ttls에 없는 필드의 유효 시간 (초)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max(1, max_entries)
+        self.field_ttls = dict(DEFAULT_FIELD_TTLS if field_ttls is None else field_ttls)
+        self.default_ttl = default_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stale": 0, "partial": 0, "stores": 0}
+
+    def _path(self, post_id):
+        safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', post_id)
+        return os.path.join(self.cache_dir, f"{safe_id}.json")
+
+    def _ttl(self, field):
+        return self.field_ttls.get(field, self.default_ttl)
+
+    def _remember(self, post_id, entry):
+        """메모리 LRU에 항목을 넣고 최대 크기를 넘으면 가장 오래 사용하지 않은 항목 제거"""
+        self._memory[post_id] = entry
+        self._memory.move_to_end(post_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, post_id):
+        """메모리, 디스크 순서로 항목 조회 (반환: (항목, 출처))"""
+        entry = self._memory.get(post_id)
+        if entry is not None:
+            self._memory.move_to_end(post_id)
+            return entry, "memory"
+        if self.cache_dir is None:
+            return None, None
+        try:
+            with open(self._path(post_id), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        self._remember(post_id, entry)
+        return entry, "disk"
+
+    def _stale_fields(self, entry, fields, now):
+        """fields 중 캐시에 없거나 유효 시간이 지난 필드 목록"""
+        stale = []
+        for field in fields:
+            stored = entry.get(field)
+            ttl = self._ttl(field)
+            if stored is None or (ttl is not None and now - stored["stored_at"] > ttl):
+                stale.append(field)
+        return stale
+
+    def get(self, post_id, fields=None):
+        """
+        캐시된 포스트 정보를 조회하는 함수
+
+        Args:
+            post_id: 정규화된 게시물 ID
+            fields: 유효해야 하는 필드 목록 (없으면 캐시된 모든 필드)
+
+        Returns:
+            dict: 포스트 정보 사본 또는 없거나 필요한 필드가 만료된 경우 None
+        """
+        if not post_id:
+            return None
+        with self._lock:
+            entry, source = self._load(post_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+            if self._stale_fields(entry, fields or list(entry), time.time()):
+                self.counters["misses"] += 1
+                self.counters["stale"] += 1
+                return None
+
+            self.counters["hits"] += 1
+            self.counters[f"{source}_hits"] += 1
+            return {field: stored["value"] for field, stored in entry.items()}
+
+    def lookup(self, post_id, fields=None):
+        """
+        캐시된 포스트 정보 중 유효한 필드와 만료된 필드를 함께 조회하는 함수
+
+        좋아요/댓글 수만 만료된 항목은 작성자/작성일/설명을 캐시에서 그대로 쓰고
+        만료된 필드만 다시 가져와 put()으로 합칠 수 있음
+
+        Args:
+            post_id: 정규화된 게시물 ID
+            fields: 확인할 필드 목록 (없으면 캐시된 모든 필드)
+
+        Returns:
+            tuple: (유효한 필드만 담은 포스트 정보 또는 항목이 없으면 None, 만료되었거나 없는 필드 목록)
+        """
+        if not post_id:
+            return None, list(fields or [])
+        with self._lock:
+            entry, source = self._load(post_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None, list(fields or [])
+
+            stale = self._stale_fields(entry, fields or list(entry), time.time())
+            if stale:
+                self.counters["partial"] += 1
+            else:
+                self.counters["hits"] += 1
+                self.counters[f"{source}_hits"] += 1
+            fresh = {field: stored["value"] for field, stored in entry.items() if field not in stale}
+            return fresh, stale
+
+    def put(self, post_id, info):
+        """
+        포스트 정보를 메모리와 디스크에 저장하는 함수
+
+        info에 있는 필드만 저장 시각을 갱신하고, 캐시된 나머지 필드는 기존 저장 시각 그대로 유지
+
+        Args:
+            post_id: 정규화된 게시물 ID
+            info: 포스트 정보 딕셔너리 (일부 필드만 있어도 됨)
+        """
+        if not post_id or not info:
+            return
+        now = time.time()
+        with self._lock:
+            existing, _ = self._load(post_id)
+            entry = dict(existing or {})
+            entry.update({field: {"value": value, "stored_at": now} for field, value in info.items()})
+            self._remember(post_id, entry)
+            self.counters["stores"] += 1
+            if self.cache_dir is None:
+                return
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                path = self._path(post_id)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError:
+                # 디스크 저장 실패 시에도 메모리 캐시는 유지
+                pass
+
+    def invalidate(self, post_id):
+        """게시물의 캐시 항목을 메모리와 디스크에서 삭제"""
+        with self._lock:
+            self._memory.pop(post_id, None)
+            if self.cache_dir is not None:
+                try:
+                    os.remove(self._path(post_id))
+                except OSError:
+                    pass
+
+    def stats(self):
+        """조회/저장 카운터와 적중률 (일부 필드만 유효한 조회도 적중이 아닌 조회로 집계)"""
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["partial"]
+        stats = dict(self.counters)
+        stats["memory_entries"] = len(self._memory)
+        stats["hit_rate"] = round(self.counters["hits"] / lookups, 3) if lookups else None
+        return stats
\ No newline at end of file
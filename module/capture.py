@@ -0,0 +1,163 @@
+import datetime
+import json
+import re
+
+# 댓글 데이터가 담겨 오는 XHR/GraphQL 응답 URL 패턴
+COMMENT_RESPONSE_PATTERNS = [
+    r'/api/v1/media/\d+/comments',
+    r'/api/graphql',
+    r'/graphql/query',
+]
+
+def _is_comment_node(node):
+    """응답 JSON의 딕셔너리가 댓글 객체인지 확인하는 함수"""
+    return (
+        isinstance(node, dict)
+        and isinstance(node.get("text"), str)
+        and isinstance(node.get("user"), dict)
+        and ("pk" in node or "id" in node)
+        and "created_at" in node
+    )
+
+def _format_created_at(created_at):
+    """댓글 작성 시각(유닉스 타임스탬프)을 문자열로 변환하는 함수"""
+    try:
+        return datetime.datetime.fromtimestamp(int(created_at)).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return ""
+
+def _created_at_seconds(created_at):
+    """댓글 작성 시각(유닉스 타임스탬프)을 정수로 변환 (DOM의 time[datetime]과 같은 기준, 실패 시 None)"""
+    try:
+        return int(created_at)
+    except (TypeError, ValueError):
+        return None
+
+def parse_comment_payload(payload):
+    """
+    댓글 API/GraphQL 응답 JSON에서 댓글 목록을 추출하는 함수
+
+    REST 응답({"comments": [...]})과 GraphQL 응답({"data": {...: {"edges": [{"node": ...}]}}})을
+    모두 처리하기 위해 JSON 트리를 순회하며 댓글 객체를 찾고, 답글(하위 댓글)은 건너뜀
+
+    Args:
+        payload: 파싱된 응답 JSON
+
+    Returns:
+        list: (comment_pk, 댓글 데이터 딕셔너리) 튜플 리스트
+    """
+    comments = []
+    stack = [payload]
+
+    while stack:
+        node = stack.pop()
+
+        if _is_comment_node(node):
+            pk = str(node.get("pk") or node.get("id"))
+            likes = node.get("comment_like_count", node.get("like_count", 0)) or 0
+            comments.append((pk, {
+                "author": node["user"].get("username") or "작성자 미상",
+                "content": node["text"],
+                "date": _format_created_at(node.get("created_at")),
+                "likes": str(likes),
+                "timestamp": _created_at_seconds(node.get("created_at")),
+            }))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+    return comments
+
+
+class CommentResponseCollector:
+    """
+    page.on("response")로 댓글 응답을 수집하는 클래스
+
+    이벤트 핸들러에서는 응답 객체만 보관하고, 본문 파싱은 drain() 호출 시 수행
+    (동기 API 이벤트 핸들러 안에서 추가 Playwright 호출을 하지 않기 위함)
+    """
+
+    def __init__(self, page, url_patterns=None):
+        """
+        Args:
+            page: Playwright 페이지 인스턴스
+            url_patterns: 댓글 응답으로 간주할 URL 정규식 리스트 (없으면 기본 패턴 사용)
+        """
+        self.page = page
+        self.url_patterns = [re.compile(p) for p in (url_patterns or COMMENT_RESPONSE_PATTERNS)]
+        self.pending_responses = []
+        self.seen_pks = set()
+        self.responses_parsed = 0
+        self.parse_errors = 0
+        self.attached = False
+
+    def _on_response(self, response):
+        """댓글 응답 URL과 일치하는 응답만 보관"""
+        if any(p.search(response.url) for p in self.url_patterns):
+            self.pending_responses.append(response)
+
+    def attach(self):
+        """페이지 응답 이벤트 리스너 등록"""
+        if not self.attached:
+            self.page.on("response", self._on_response)
+            self.attached = True
+        return self
+
+    def detach(self):
+        """페이지 응답 이벤트 리스너 해제"""
+        if self.attached:
+            self.page.remove_listener("response", self._on_response)
+            self.attached = False
+
+    def _collect(self, body):
+        """응답 본문을 파싱해 처음 보는 댓글만 반환"""
+        try:
+            payload = json.loads(body)
+        except (TypeError, ValueError):
+            self.parse_errors += 1
+            return []
+
+        self.responses_parsed += 1
+        new_comments = []
+        for pk, comment in parse_comment_payload(payload):
+            if pk not in self.seen_pks:
+                self.seen_pks.add(pk)
+                new_comments.append((pk, comment))
+        return new_comments
+
+    def drain(self):
+        """
+        보관된 응답을 파싱해 새로 발견한 댓글만 반환하는 함수
+
+        Returns:
+            list: (comment_pk, 댓글 데이터 딕셔너리) 튜플 리스트
+        """
+        responses, self.pending_responses = self.pending_responses, []
+        new_comments = []
+
+        for response in responses:
+            try:
+                body = response.text()
+            except Exception:
+                # 본문을 읽을 수 없는 응답 (리다이렉트 등)
+                self.parse_errors += 1
+                continue
+            new_comments.extend(self._collect(body))
+
+        return new_comments
+
+    async def drain_async(self):
+        """drain()의 async_api 버전 (응답 본문 읽기를 await)"""
+        responses, self.pending_responses = self.pending_responses, []
+        new_comments = []
+
+        for response in responses:
+            try:
+                body = await response.text()
+            except Exception:
+                self.parse_errors += 1
+                continue
+            new_comments.extend(self._collect(body))
+
+        return new_comments
\ No newline at end of file
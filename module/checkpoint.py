@@ -0,0 +1,73 @@
+import datetime
+import json
+import os
+import re
+
+# 게시물별 체크포인트 파일을 저장하는 기본 디렉터리
+DEFAULT_CHECKPOINT_DIR = ".checkpoints"
+
+
+class CommentCheckpoint:
+    """
+    댓글 수집 진행 상황(처리한 댓글 ID, 스크롤 횟수, 수집한 댓글)을 파일로 저장/복원하는 클래스
+
+    임시 파일에 쓴 뒤 os.replace로 교체하므로 저장 도중 종료되어도 이전 체크포인트는 유지됨
+    """
+
+    def __init__(self, path, interval=5):
+        """
+        Args:
+            path: 체크포인트 JSON 파일 경로
+            interval: 몇 번의 스크롤마다 저장할지
+        """
+        self.path = path
+        self.interval = max(1, interval)
+        self.saves = 0
+
+    @classmethod
+    def for_post(cls, post_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR, interval=5):
+        """게시물 ID로 체크포인트 경로를 정해 생성"""
+        safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', post_id or "unknown")
+        return cls(os.path.join(checkpoint_dir, f"{safe_id}.json"), interval)
+
+    def due(self, scroll_count):
+        """이번 스크롤에서 저장할 차례인지 확인"""
+        return scroll_count > 0 and scroll_count % self.interval == 0
+
+    def save(self, state):
+        """
+        체크포인트를 원자적으로 저장하는 함수
+
+        Args:
+            state: 저장할 상태 딕셔너리
+        """
+        state = dict(state)
+        state["updated_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.saves += 1
+
+    def load(self):
+        """
+        저장된 체크포인트를 읽는 함수
+
+        Returns:
+            dict: 체크포인트 상태 또는 없거나 손상된 경우 None
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def delete(self):
+        """수집이 끝나 결과가 저장된 뒤 체크포인트 삭제"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
\ No newline at end of file
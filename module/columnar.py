@@ -0,0 +1,197 @@
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:  # 선택 의존성 (pip install pyarrow)
+    pa = None
+
+from module.normalize import parse_comment_dates, parse_counts, parse_post_date, parse_timestamp
+from module.storage import iter_comments
+
+# 지원하는 출력 형식과 확장자
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# 한 번에 변환해 기록할 최대 댓글 수 (큰 게시물도 메모리를 일정하게 유지)
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+
+def is_available():
+    """pyarrow가 설치되어 있는지 확인하는 함수"""
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar export (pip install pyarrow)")
+
+
+def posts_schema():
+    """posts 테이블 스키마"""
+    _require_pyarrow()
+    return pa.schema([
+        ("post_id", pa.string()),
+        ("username", pa.string()),
+        ("post_date", pa.date32()),
+        ("description", pa.string()),
+        ("url", pa.string()),
+        ("content_type", pa.string()),
+        ("likes", pa.int64()),
+        ("comments_count", pa.int64()),
+        ("views", pa.int64()),
+        ("comments_collected", pa.int64()),
+        ("collected_at", pa.timestamp("s")),
+    ])
+
+
+def comments_schema():
+    """comments 테이블 스키마"""
+    _require_pyarrow()
+    return pa.schema([
+        ("post_id", pa.string()),
+        ("comment_id", pa.string()),
+        ("author", pa.string()),
+        ("content", pa.string()),
+        ("likes", pa.int64()),
+        ("date_text", pa.string()),
+        ("commented_at", pa.timestamp("s")),
+        ("collected_at", pa.timestamp("s")),
+    ])
+
+
+def posts_table(results):
+    """
+    결과 데이터 목록의 post_info를 posts 테이블로 변환하는 함수 (수치는 정수, 날짜는 date/timestamp)
+
+    Args:
+        results: crawler.py 결과 데이터 리스트
+
+    Returns:
+        pyarrow.Table: posts 테이블
+    """
+    _require_pyarrow()
+    infos = [(result["post_info"], result.get("metadata", {})) for result in results if result.get("post_info")]
+    columns = {
+        "post_id": [info.get("post_id") for info, _ in infos],
+        "username": [info.get("username") for info, _ in infos],
+        "post_date": [parse_post_date(info.get("post_date")) for info, _ in infos],
+        "description": [info.get("description") for info, _ in infos],
+        "url": [info.get("url") for info, _ in infos],
+        "content_type": [info.get("content_type") for info, _ in infos],
+        "likes": parse_counts([info.get("likes") for info, _ in infos]),
+        "comments_count": parse_counts([info.get("comments_count") for info, _ in infos]),
+        "views": parse_counts([info.get("views") for info, _ in infos]),
+        "comments_collected": [metadata.get("comments_collected") for _, metadata in infos],
+        "collected_at": [parse_timestamp(info.get("collected_at") or metadata.get("collected_at"))
+                         for info, metadata in infos],
+    }
+    return pa.Table.from_pydict(columns, schema=posts_schema())
+
+
+def _comments_batch(post_id, rows, collected_at):
+    """(comment_id, comment_data) 묶음을 comments RecordBatch로 변환"""
+    return pa.RecordBatch.from_pydict({
+        "post_id": [post_id] * len(rows),
+        "comment_id": [None if comment_id is None else str(comment_id) for comment_id, _ in rows],
+        "author": [data.get("author") for _, data in rows],
+        "content": [data.get("content") for _, data in rows],
+        "likes": parse_counts([data.get("likes") for _, data in rows]),
+        "date_text": [data.get("date") for _, data in rows],
+        "commented_at": parse_comment_dates([data.get("date") for _, data in rows], collected_at),
+        "collected_at": [collected_at] * len(rows),
+    }, schema=comments_schema())
+
+
+def iter_comment_batches(results, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    결과 데이터 목록의 댓글을 batch_size개씩 comments RecordBatch로 변환하는 제너레이터
+
+    스트림 모드 결과는 comments_file(JSONL)을 한 줄씩 읽어 batch_size개 단위로 변환하며,
+    상대 날짜는 게시물의 collected_at 기준으로 변환
+    """
+    _require_pyarrow()
+    for result in results:
+        post_info = result.get("post_info")
+        if not post_info:
+            continue
+        collected_at = parse_timestamp(post_info.get("collected_at") or result.get("metadata", {}).get("collected_at"))
+        rows = []
+        for comment_id, comment_data in iter_comments(result):
+            rows.append((comment_id, comment_data))
+            if len(rows) >= batch_size:
+                yield _comments_batch(post_info["post_id"], rows, collected_at)
+                rows = []
+        if rows:
+            yield _comments_batch(post_info["post_id"], rows, collected_at)
+
+
+def load_results(paths):
+    """게시물별 결과 JSON 파일들을 읽어 결과 데이터를 하나씩 반환하는 제너레이터 (읽을 수 없는 파일은 건너뜀)"""
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Skipping unreadable result file {path}: {e}")
+
+
+def export_columnar(results, output_file, fmt="parquet", logger=None, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    결과 데이터를 posts/comments 컬럼 파일({이름}_posts.parquet, {이름}_comments.parquet 등)로 저장하는 함수
+
+    좋아요/댓글/조회수는 정수("3.8만", "1.2M", "1,234" → 38000, 1200000, 1234),
+    댓글 날짜("3일 전", "5시간")는 수집 시각 기준의 절대 시각으로 변환해 저장하므로 불러올 때 별도 파싱이 필요 없음
+
+    Args:
+        results: 결과 데이터 목록 (게시물 하나면 [result_data], load_results()의 제너레이터도 가능)
+        output_file: 기준 출력 파일 이름 (확장자는 형식에 맞게 바뀜)
+        fmt: 'parquet' 또는 'arrow' (Arrow IPC/Feather v2)
+        logger: 로거 인스턴스
+        batch_size: 댓글을 나눠 기록할 행 수 (parquet row group 크기)
+
+    Returns:
+        dict: {"posts": 경로, "comments": 경로}
+    """
+    _require_pyarrow()
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    base_name, _ = os.path.splitext(output_file)
+    ext = COLUMNAR_FORMATS[fmt]
+    paths = {"posts": f"{base_name}_posts{ext}", "comments": f"{base_name}_comments{ext}"}
+    directory = os.path.dirname(os.path.abspath(output_file))
+    os.makedirs(directory, exist_ok=True)
+
+    # 결과를 한 번만 순회: 댓글은 바로 기록하고 게시물 정보만 모아 두었다가 마지막에 기록
+    post_results = []
+
+    def comment_batches():
+        for result in results:
+            if not result.get("post_info"):
+                continue
+            post_results.append({"post_info": result["post_info"], "metadata": result.get("metadata", {})})
+            yield from iter_comment_batches([result], batch_size)
+
+    comment_count = 0
+    if fmt == "parquet":
+        with pq.ParquetWriter(paths["comments"], comments_schema()) as writer:
+            for batch in comment_batches():
+                writer.write_batch(batch)
+                comment_count += batch.num_rows
+        posts = posts_table(post_results)
+        pq.write_table(posts, paths["posts"])
+    else:
+        with pa.OSFile(paths["comments"], 'wb') as sink:
+            with pa.ipc.new_file(sink, comments_schema()) as writer:
+                for batch in comment_batches():
+                    writer.write_batch(batch)
+                    comment_count += batch.num_rows
+        posts = posts_table(post_results)
+        feather.write_feather(posts, paths["posts"])
+
+    message = f"컬럼 형식({fmt}) 저장 완료: 게시물 {posts.num_rows}개 → {paths['posts']}, 댓글 {comment_count}개 → {paths['comments']}"
+    if logger is not None:
+        logger.info(message)
+    print(message)
+    return paths
\ No newline at end of file
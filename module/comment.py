@@ -3,60 +3,926 @@ import time
 import datetime
 import os
 import json
+import hashlib
 
-def collect_instagram_comments(page, post_url):
+from module.capture import CommentResponseCollector
+from module import budget, metrics
+
+# 댓글 영역 XPath (mount ID 부분만 실행 시 치환)
+COMMENTS_XPATH_TEMPLATE = "//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]"
+
+# 댓글 목록 컨테이너와 각 댓글 요소 기준 상대 XPath
+COMMENT_LIST_SUBPATH = "/div/div[2]"
+COMMENT_FIELD_XPATHS = {
+    "content": "./div[1]/div/div[2]/div[1]/div[1]/div/div[2]/span",
+    "author": "./div[1]/div/div[2]/div[1]/div[1]/div/div[1]/span[1]/span/span/div/a/div/div/span",
+    "date": "./div[1]/div/div[2]/div[1]/div[1]/div/div[1]/span[2]/a/time",
+    "likes": "./div[1]/div/div[2]/div[1]/div[2]/div[1]/span/span",
+}
+
+# XPath로 지정된 요소를 주어진 픽셀만큼 스크롤하고, 스크롤 직전 패널 상태를 반환
+# 반환 형식: [scrollHeight, 댓글 목록 자식 수] 또는 요소가 없으면 null
+SCROLL_BY_JS = """
+    ([xpath, listXpath, pixels]) => {
+        const first = (path) => document.evaluate(
+            path, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const element = first(xpath);
+        if (!element) {
+            return null;
+        }
+        const list = first(listXpath);
+        const state = [element.scrollHeight, list ? list.childElementCount : 0];
+        element.scrollTop += pixels;
+        return state;
+    }
+"""
+
+# 댓글 패널을 한 번에 스크롤하는 거리 (픽셀)
+SCROLL_PIXELS = 1500
+
+# 게시물 페이지의 주요 콘텐츠 (로드 완료 확인용)
+POST_CONTENT_SELECTOR = 'video, img[alt], section div ul, ul._a9ym, div.x5yr21d'
+
+# 첫 번째 mount 요소의 ID (없으면 null)
+MOUNT_ID_JS = """
+    () => {
+        const element = document.querySelector('[id^="mount_"]');
+        return element ? element.id : null;
+    }
+"""
+
+# 스크롤 후 패널이 목록 끝에서 이 시간(ms) 동안 로딩 표시 없이 그대로면 더 불러올 댓글이 없는 것으로 판단
+END_OF_LIST_GRACE_MS = 800
+
+# 댓글 목록의 로딩 표시
+LOADING_INDICATOR_SELECTOR = '[role="progressbar"], svg[aria-label="Loading..."], svg[aria-label="읽어들이는 중..."]'
+
+# 패널의 scrollHeight 또는 댓글 수가 이전 상태와 달라졌는지 확인 (wait_for_function 조건)
+# - "changed": 새 댓글이 로드됨
+# - "end": 패널이 맨 아래에 있고 로딩 표시 없이 graceMs 동안 변화가 없음 (목록 끝, 시간 초과까지 기다리지 않음)
+# token은 대기마다 달라 이전 대기의 유휴 시작 시각을 재사용하지 않도록 함
+PANEL_CHANGED_JS = """
+    ([xpath, listXpath, previous, graceMs, token, loadingSelector]) => {
+        const first = (path) => document.evaluate(
+            path, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const element = first(xpath);
+        if (!element) {
+            return false;
+        }
+        const list = first(listXpath);
+        const count = list ? list.childElementCount : 0;
+        if (element.scrollHeight !== previous[0] || count !== previous[1]) {
+            return "changed";
+        }
+        const atBottom = element.scrollTop + element.clientHeight >= element.scrollHeight - 2;
+        if (!atBottom || element.querySelector(loadingSelector)) {
+            delete element.dataset.idleSince;
+            return false;
+        }
+        const now = Date.now();
+        if (element.dataset.idleToken !== String(token) || !element.dataset.idleSince) {
+            element.dataset.idleToken = String(token);
+            element.dataset.idleSince = String(now);
+        }
+        return now - Number(element.dataset.idleSince) >= graceMs ? "end" : false;
+    }
+"""
+
+# 렌더링된 모든 댓글을 한 번의 호출로 추출
+# 반환 형식: [[index, author, content, date, likes, timestamp], ...] (내용이 있는 댓글만)
+# timestamp는 time 요소의 datetime 속성을 유닉스 시각(초)으로 변환한 값 (없으면 null)
+# 정리(PRUNE_COMMENTS_JS)된 앞부분은 건너뛰므로 추출 시간이 누적 댓글 수와 무관하게 유지됨
+EXTRACT_COMMENTS_JS = """
+    ({listXpath, fields}) => {
+        const first = (xpath, context) => document.evaluate(
+            xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const timestamp = (element) => {
+            const value = element ? Date.parse(element.getAttribute("datetime")) : NaN;
+            return Number.isNaN(value) ? null : Math.floor(value / 1000);
+        };
+        const list = first(listXpath, document);
+        if (!list) {
+            return [];
+        }
+        const rows = [];
+        const children = list.children;
+        for (let i = Number(list.dataset.prunedUpTo || 0); i < children.length; i++) {
+            const item = children[i];
+            const content = first(fields.content, item);
+            if (!content) {
+                continue;
+            }
+            const author = first(fields.author, item);
+            const date = first(fields.date, item);
+            const likes = first(fields.likes, item);
+            rows.push([
+                i + 1,
+                author ? author.innerText : null,
+                content.innerText,
+                date ? date.innerText : "",
+                likes ? likes.innerText : null,
+                timestamp(date)
+            ]);
+        }
+        return rows;
+    }
+"""
+
+
+# 이미 추출/기록한 댓글 요소를 같은 높이의 빈 요소로 바꿔 DOM 크기를 일정하게 유지
+# - 요소 자체는 남겨 두므로 목록의 자식 수, scrollHeight, 스크롤 위치가 그대로라 지연 로딩이 계속 동작하고
+#   React가 참조하는 목록 항목도 사라지지 않음 (내부 노드만 제거)
+# - 마지막 keep개 요소와 upto(추출한 마지막 위치, null이면 전체) 이후 요소는 건드리지 않음
+# - 처리한 위치를 목록의 data-pruned-up-to에 기록해 다음 호출과 추출은 그 이후만 확인
+# 반환 형식: 이번에 비운 댓글 요소 수
+PRUNE_COMMENTS_JS = """
+    ({listXpath, contentXpath, upto, keep}) => {
+        const list = document.evaluate(
+            listXpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (!list) {
+            return 0;
+        }
+        const children = list.children;
+        const start = Number(list.dataset.prunedUpTo || 0);
+        const limit = Math.min(upto === null ? children.length : upto, children.length - keep);
+        // 높이를 먼저 모두 읽은 뒤 한 번에 변경 (읽기/쓰기를 섞으면 요소마다 레이아웃 재계산)
+        const targets = [];
+        for (let i = start; i < limit; i++) {
+            const item = children[i];
+            const content = document.evaluate(
+                contentXpath, item, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+            if (content) {
+                targets.push([item, item.offsetHeight]);
+            }
+        }
+        for (const [item, height] of targets) {
+            item.style.boxSizing = "border-box";
+            item.style.height = height + "px";
+            item.replaceChildren();
+        }
+        if (limit > start) {
+            list.dataset.prunedUpTo = String(limit);
+        }
+        return targets.length;
+    }
+"""
+
+# DOM 정리 시 기본으로 남겨 둘 마지막 댓글 요소 수
+DEFAULT_PRUNE_KEEP = 30
+
+
+def _normalize_likes(likes):
+    """좋아요 텍스트 정규화 ("답글 달기"만 있거나 값이 없으면 "0")"""
+    if not likes or "답글 달기" in likes:
+        return "0"
+    return likes
+
+
+def _extract_comments_bulk(page, comments_xpath):
     """
-    인스타그램 게시물의 댓글을 수집하는 함수
+    렌더링된 모든 댓글의 작성자, 내용, 날짜, 좋아요 수를 한 번의 page.evaluate로 추출하는 함수
     
     Args:
         page: Playwright 페이지 인스턴스
-        post_url: 스크래핑할 인스타그램 게시물의 URL
+        comments_xpath: 댓글 영역 XPath
         
     Returns:
-        dict: 수집된 댓글과 메타데이터를 포함하는 사전
+        list: 댓글 데이터 딕셔너리 리스트 (index는 목록 내 1부터 시작하는 위치)
     """
-    try:
-        # 2단계: 지정된 릴 페이지로 이동
-        print(f"릴 페이지로 이동 중: {post_url}")
-        page.goto(post_url, wait_until="load")
-        print("기본 페이지 로드 완료")
+    with metrics.span("comments.extract"):
+        rows = page.evaluate(EXTRACT_COMMENTS_JS, _extract_comments_args(comments_xpath))
+    return _rows_to_comments(rows)
+
+
+def _extract_comments_args(comments_xpath):
+    """EXTRACT_COMMENTS_JS에 전달할 인자 생성"""
+    return {
+        "listXpath": comments_xpath + COMMENT_LIST_SUBPATH,
+        "fields": COMMENT_FIELD_XPATHS,
+    }
+
+
+def _rows_to_comments(rows):
+    """EXTRACT_COMMENTS_JS가 반환한 배열을 댓글 데이터 딕셔너리 리스트로 변환"""
+    return [
+        {
+            "author": author or "작성자 미상",
+            "content": content,
+            "date": date,
+            "likes": _normalize_likes(likes),
+            "timestamp": timestamp,
+            "index": comment_index
+        }
+        for comment_index, author, content, date, likes, timestamp in rows
+    ]
+
+
+def _extract_comments_by_index(page, comments_xpath, processed_comment_ids):
+    """
+    기존 방식: 댓글 인덱스마다 XPath locator를 호출해 댓글을 추출하는 함수 (최대 499개)
+    
+    Args:
+        page: Playwright 페이지 인스턴스
+        comments_xpath: 댓글 영역 XPath
+        processed_comment_ids: 이미 처리한 댓글 ID (상세 정보 조회를 건너뜀)
         
-        # 페이지 로딩 완료 확인을 위해 특정 요소 대기
+    Returns:
+        list: 새로 발견한 댓글 데이터 딕셔너리 리스트
+    """
+    comments = []
+    
+    # 모든 댓글 컨테이너를 순회 
+    for comment_index in range(1, 500):  # 충분히 큰 범위 설정 
         try:
-            page.wait_for_selector('video, img[alt], section div ul, ul._a9ym, div.x5yr21d', 
-                                state="visible", timeout=15000)
-            print("페이지 주요 콘텐츠 로드됨")
+            item_xpath = f"{comments_xpath}{COMMENT_LIST_SUBPATH}/div[{comment_index}]"
+            
+            # 먼저 특정 댓글이 실제로 존재하는지 확인
+            content_xpath = item_xpath + COMMENT_FIELD_XPATHS["content"][1:]
+            if page.locator(f"xpath={content_xpath}").count() == 0:
+                # 해당 인덱스에 댓글이 없는 경우 다음 인덱스로 이동
+                continue
+            
+            # 댓글이 존재하면 더 상세한 내용 추출 (ID 계산에 필요한 작성자, 작성 시각까지)
+            content = page.locator(f"xpath={content_xpath}").inner_text()
+            try:
+                author = page.locator(f"xpath={item_xpath}{COMMENT_FIELD_XPATHS['author'][1:]}").inner_text()
+            except:
+                author = "작성자 미상"
+            
+            try:
+                date_locator = page.locator(f"xpath={item_xpath}{COMMENT_FIELD_XPATHS['date'][1:]}")
+                date = date_locator.inner_text()
+                timestamp = _parse_datetime_attr(date_locator.get_attribute("datetime"))
+            except:
+                date = ""
+                timestamp = None
+            
+            if make_comment_id(author, content, timestamp) in processed_comment_ids:
+                continue
+            
+            # 나머지 정보 추출
+            
+            try:
+                likes_xpath = f"xpath={item_xpath}{COMMENT_FIELD_XPATHS['likes'][1:]}"
+                if page.locator(likes_xpath).count() > 0:
+                    likes = _normalize_likes(page.locator(likes_xpath).inner_text())
+                else:
+                    likes = "0"
+            except:
+                likes = "0"
+            
+            comments.append({
+                "author": author,
+                "content": content,
+                "date": date,
+                "likes": likes,
+                "timestamp": timestamp,
+                "index": comment_index
+            })
+        except Exception as e:
+            print(f"댓글 #{comment_index} 추출 중 오류: {e}")
+            # 오류가 발생해도 다음 댓글로 계속 진행
+            continue
+    
+    return comments
+
+
+class CommentStore:
+    """
+    수집한 댓글의 중복 제거와 저장을 담당하는 클래스
+    
+    writer(JsonlWriter)가 있으면 새 댓글을 발견 즉시 기록하고, keep_in_memory=False이면
+    댓글 본문은 메모리에 보관하지 않고 ID와 중복 판별용 해시만 유지
+    """
+    
+    def __init__(self, writer=None, keep_in_memory=True, known_ids=None):
+        self.comments = {}
+        # 이미 처리한 댓글의 고유 ID
+        self.processed_ids = set()
+        # 수집 경로(네트워크/DOM) 간 중복 방지를 위한 (작성자, 내용) 해시
+        self.seen_keys = set()
+        self.count = 0
+        self.source_counts = {"dom": 0, "network": 0}
+        self.writer = writer
+        self.keep_in_memory = keep_in_memory
+        # 체크포인트에서 복원한 (작성자, 내용) 해시 - 다시 추출되면 수집 경로와 관계없이 건너뜀
+        self.resumed_keys = set()
+        # 이전 실행에서 이미 저장된 댓글 ID (델타 모드) - 새 댓글로 추가하지 않고 연속으로 만난 수를 셈
+        self.known_ids = set(known_ids or ())
+        self.known_hits = 0
+        self.consecutive_known = 0
+    
+    @staticmethod
+    def _key(comment_data):
+        """(작성자, 내용)의 안정적인 해시 (프로세스가 달라도 같은 값이어야 체크포인트 복원 가능)"""
+        raw = f"{comment_data['author']}\x00{comment_data['content']}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    
+    def to_checkpoint(self):
+        """체크포인트에 저장할 상태 딕셔너리 반환"""
+        return {
+            "processed_ids": sorted(self.processed_ids),
+            "seen_keys": sorted(self.seen_keys),
+            "count": self.count,
+            "source_counts": dict(self.source_counts),
+            "comments": self.comments if self.keep_in_memory else {},
+        }
+    
+    def restore(self, state):
+        """
+        체크포인트 상태로 수집 결과를 복원하는 함수 (복원된 댓글은 writer로 다시 기록하지 않음)
+        
+        Args:
+            state: to_checkpoint()로 저장했던 상태
+        """
+        self.processed_ids.update(state.get("processed_ids", []))
+        self.seen_keys.update(state.get("seen_keys", []))
+        self.resumed_keys.update(state.get("seen_keys", []))
+        self.count = state.get("count", len(self.processed_ids))
+        for source, count in state.get("source_counts", {}).items():
+            self.source_counts[source] = count
+        if self.keep_in_memory:
+            self.comments.update(state.get("comments", {}))
+    
+    def __contains__(self, comment_id):
+        return comment_id in self.processed_ids
+    
+    def add(self, comment_id, comment_data, source="dom"):
+        """
+        새 댓글이면 저장하고 True, 이미 처리한 댓글이면 False 반환
+        
+        Args:
+            comment_id: 댓글 고유 ID
+            comment_data: 댓글 데이터 딕셔너리
+            source: 수집 경로 ('dom' 또는 'network')
+        """
+        key = self._key(comment_data)
+        if comment_id in self.processed_ids:
+            return False
+        if comment_id in self.known_ids:
+            self.processed_ids.add(comment_id)
+            self.known_hits += 1
+            self.consecutive_known += 1
+            return False
+        # 이전 실행에서 이미 수집한 댓글 (같은 댓글이 두 번 나올 수 있으므로 한 번만 소모)
+        if key in self.resumed_keys:
+            self.resumed_keys.discard(key)
+            self.processed_ids.add(comment_id)
+            return False
+        # DOM에서 이미 수집한 댓글이 응답으로 다시 들어온 경우 건너뜀
+        if source == "network" and key in self.seen_keys:
+            return False
+        if source == "network":
+            comment_data["index"] = self.count + 1
+        
+        self.processed_ids.add(comment_id)
+        self.seen_keys.add(key)
+        self.consecutive_known = 0
+        self.count += 1
+        self.source_counts[source] += 1
+        
+        if self.keep_in_memory:
+            self.comments[comment_id] = comment_data
+        if self.writer is not None:
+            self.writer.write_comment(comment_id, comment_data)
+        return True
+
+
+def _add_network_comments(network_comments, store):
+    """
+    응답 수집기에서 꺼낸 새 댓글을 수집 결과에 추가하는 함수
+    
+    Returns:
+        int: 새로 추가된 댓글 수
+    """
+    added = 0
+    for pk, comment_data in network_comments:
+        comment_data["pk"] = pk
+        comment_id = make_comment_id(comment_data["author"], comment_data["content"], comment_data.get("timestamp"))
+        if store.add(comment_id, comment_data, source="network"):
+            added += 1
+    return added
+
+
+def _add_dom_comments(extracted_comments, store):
+    """
+    DOM에서 추출한 댓글 중 새 댓글을 수집 결과에 추가하는 함수
+    
+    Returns:
+        int: 새로 추가된 댓글 수
+    """
+    added = 0
+    for comment_data in extracted_comments:
+        comment_id = make_comment_id(comment_data["author"], comment_data["content"], comment_data.get("timestamp"))
+        if store.add(comment_id, comment_data, source="dom"):
+            added += 1
+    return added
+
+
+def _prune_args(comments_xpath, upto, keep):
+    """PRUNE_COMMENTS_JS에 전달할 인자 생성"""
+    return {
+        "listXpath": comments_xpath + COMMENT_LIST_SUBPATH,
+        "contentXpath": COMMENT_FIELD_XPATHS["content"],
+        "upto": upto,
+        "keep": keep,
+    }
+
+
+def _prune_comments(page, comments_xpath, upto, keep):
+    """
+    이미 기록한 댓글 요소를 같은 높이의 빈 요소로 바꾸는 함수 (PRUNE_COMMENTS_JS 참고)
+
+    Args:
+        page: Playwright 페이지 인스턴스
+        comments_xpath: 댓글 영역 XPath
+        upto: 이 위치(1부터 시작)까지의 요소만 정리 (None이면 렌더링된 전체)
+        keep: 정리하지 않고 남겨 둘 마지막 요소 수
+
+    Returns:
+        int: 이번에 비운 댓글 요소 수
+    """
+    with metrics.span("comments.prune"):
+        return page.evaluate(PRUNE_COMMENTS_JS, _prune_args(comments_xpath, upto, keep))
+
+
+def _scroll_args(comments_xpath, pixels=SCROLL_PIXELS):
+    """SCROLL_BY_JS에 전달할 인자 생성"""
+    return [comments_xpath, comments_xpath + COMMENT_LIST_SUBPATH, pixels]
+
+
+def _scroll_comments(page, comments_xpath, pixels=SCROLL_PIXELS):
+    """댓글 영역을 스크롤하고 스크롤 직전 패널 상태 [scrollHeight, 댓글 수]를 반환"""
+    with metrics.span("comments.scroll"):
+        return page.evaluate(SCROLL_BY_JS, _scroll_args(comments_xpath, pixels))
+
+
+def _panel_changed_args(comments_xpath, panel_state):
+    """PANEL_CHANGED_JS에 전달할 인자 생성 (대기마다 새 token 사용)"""
+    return [comments_xpath, comments_xpath + COMMENT_LIST_SUBPATH, panel_state or [-1, -1],
+            END_OF_LIST_GRACE_MS, time.monotonic_ns(), LOADING_INDICATOR_SELECTOR]
+
+
+def _panel_wait_timeout_ms(timeout):
+    """패널 변화 대기의 시간 초과 (밀리초, 게시물의 남은 시간 이내)"""
+    return max(1, budget.cap(timeout) * 1000)
+
+
+def _panel_wait_outcome(outcome):
+    """
+    패널 변화 대기 결과를 (변화 감지 여부, 시간 초과 여부)로 변환하고 지표에 기록
+
+    Args:
+        outcome: PANEL_CHANGED_JS의 반환값 ("changed" 또는 "end"), 시간 초과면 None
+    """
+    if outcome is None:
+        metrics.count("comments_wait_timeouts")
+        return False, True
+    if outcome != "changed":
+        metrics.count("comments_wait_end_of_list")
+    return outcome == "changed", False
+
+
+def _wait_for_panel_change(page, comments_xpath, panel_state, timeout):
+    """
+    스크롤 후 댓글 패널의 scrollHeight 또는 댓글 수가 바뀔 때까지 대기하는 함수
+    
+    패널이 맨 아래에 있고 로딩 표시 없이 END_OF_LIST_GRACE_MS 동안 그대로면 목록 끝으로 보고
+    timeout까지 기다리지 않고 반환
+    
+    Args:
+        page: Playwright 페이지 인스턴스
+        comments_xpath: 댓글 영역 XPath
+        panel_state: 스크롤 직전 패널 상태 [scrollHeight, 댓글 수] (없으면 None)
+        timeout: 최대 대기 시간 (초)
+        
+    Returns:
+        tuple: (변화 감지 여부, 실제 대기 시간(초), 시간 초과 여부)
+    """
+    started = time.time()
+    with metrics.span("comments.wait"):
+        try:
+            handle = page.wait_for_function(
+                PANEL_CHANGED_JS,
+                arg=_panel_changed_args(comments_xpath, panel_state),
+                timeout=_panel_wait_timeout_ms(timeout),
+                polling=100
+            )
+            outcome = handle.json_value()
         except TimeoutError:
-            print("페이지 주요 콘텐츠를 찾을 수 없습니다. 계속 진행합니다...")
+            outcome = None
+        changed, timed_out = _panel_wait_outcome(outcome)
+    return changed, time.time() - started, timed_out
+
+
+def _save_checkpoint(checkpoint, store, post_url, scroll_count, completed=False, comments_files=None):
+    """현재 수집 상태를 체크포인트로 저장 (저장 실패는 수집을 중단시키지 않음)"""
+    state = {
+        "url": post_url,
+        "scroll_count": scroll_count,
+        "completed": completed,
+        "comments_files": comments_files or [],
+    }
+    state.update(store.to_checkpoint())
+    try:
+        checkpoint.save(state)
+    except OSError as e:
+        print(f"체크포인트 저장 실패: {e}")
+
+
+def _fast_forward_scrolls(page, comments_xpath, scrolls, wait_timeout, max_idle_waits):
+    """
+    체크포인트의 스크롤 위치까지 댓글 추출 없이 스크롤만 반복하는 함수
+    
+    Returns:
+        int: 실제로 수행한 스크롤 횟수
+    """
+    idle_waits = 0
+    performed = 0
+    for _ in range(scrolls):
+        panel_state = _scroll_comments(page, comments_xpath)
+        performed += 1
+        changed, _, _ = _wait_for_panel_change(page, comments_xpath, panel_state, wait_timeout)
+        if changed:
+            idle_waits = 0
+        else:
+            idle_waits += 1
+            if idle_waits >= max_idle_waits:
+                break
+    return performed
+
+
+def _comments_xpath(mount_id):
+    """MOUNT_ID_JS로 찾은 mount ID로 댓글 영역 XPath 생성 (찾지 못했으면 기본값 사용)"""
+    if mount_id:
+        print(f"mount ID 발견: {mount_id}")
+    else:
+        print("mount 요소를 찾을 수 없습니다.")
+        mount_id = "mount_0_0"  # 기본값
+    
+    # 제공된 XPath에서 mount ID 부분만 바꾸기
+    comments_xpath = COMMENTS_XPATH_TEMPLATE.format(mount_id=mount_id)
+    print(f"사용할 XPath: {comments_xpath}")
+    return comments_xpath
+
+
+class _CommentCrawl:
+    """
+    댓글 수집 한 번의 진행 상태와 판단을 담는 클래스 (sync/async 수집 공용)
+    
+    체크포인트 복원/저장, 스크롤마다의 새 댓글 반영과 중단 판단, 결과 딕셔너리 생성을 맡고
+    페이지 조작(Playwright 호출)은 collect_instagram_comments와 async_api에서 수행
+    """
+    
+    def __init__(self, post_url, extraction_mode="bulk", capture_mode="dom", max_scrolls=50, wait_timeout=5.0,
+                 max_idle_waits=2, writer=None, keep_in_memory=True, checkpoint=None, resume=False,
+                 known_ids=None, delta_threshold=10, prune_keep=None):
+        self.post_url = post_url
+        self.extraction_mode = extraction_mode
+        self.capture_mode = capture_mode
+        self.max_scrolls = max_scrolls
+        self.wait_timeout = wait_timeout
+        self.max_idle_waits = max_idle_waits
+        self.writer = writer
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.known_ids = known_ids
+        self.delta_threshold = delta_threshold
+        self.prune_keep = prune_keep
+        self.store = CommentStore(writer, keep_in_memory, known_ids)  # 새로운 댓글 데이터 저장 구조
+        self.collector = None
+        self.resumed_scrolls = 0
+        self.resumed_comments = 0
+        self.comments_files = []
+        # 스크롤별 대기 시간 (초) 및 시간 초과 횟수
+        self.scroll_wait_seconds = []
+        self.wait_timeouts = 0
+        self.scroll_count = 0
+        self.scroll_error = None
+        self.delta_reached = False
+        self.deadline_reached = False
+        # 목록 끝(새 콘텐츠 없음) 또는 델타 모드의 기존 구간에 도달해 스스로 멈췄는지 여부
+        self.end_reached = False
+        self.max_scrolls_reached = False
+        self.pruned_nodes = 0
+        self.consecutive_idle_waits = 0
+    
+    def restore(self):
+        """
+        체크포인트에서 이전 수집 상태를 복원하는 함수
         
-        # 추가 안전 대기 시간
-        time.sleep(5)
+        Returns:
+            dict: 이미 끝난 수집이면 페이지를 다시 열지 않고 사용할 저장된 결과, 아니면 None
+        """
+        if self.checkpoint is not None and self.resume:
+            state = self.checkpoint.load()
+            if state and state.get("url") == self.post_url:
+                self.store.restore(state)
+                self.resumed_scrolls = state.get("scroll_count", 0)
+                self.resumed_comments = self.store.count
+                self.comments_files = state.get("comments_files", [])
+                print(f"체크포인트에서 복원: 댓글 {self.resumed_comments}개, 스크롤 {self.resumed_scrolls}회")
+                
+                if state.get("completed"):
+                    print("체크포인트의 수집이 이미 완료되어 저장된 결과를 사용합니다.")
+                    return {
+                        "metadata": {
+                            "url": self.post_url,
+                            "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            "total_comments": self.store.count,
+                            "total_scrolls": self.resumed_scrolls,
+                            "extraction_mode": self.extraction_mode,
+                            "capture_mode": self.capture_mode,
+                            "resumed_from_checkpoint": True,
+                            "resumed_comments": self.resumed_comments,
+                            "checkpoint_file": self.checkpoint.path,
+                            "comments_files": self.comments_files,
+                            "completed": True
+                        },
+                        "comments": self.store.comments
+                    }
+        if self.writer is not None:
+            self.comments_files = self.comments_files + [self.writer.path]
+        return None
+    
+    @property
+    def fast_forward_scrolls(self):
+        """체크포인트의 스크롤 위치까지 이동할 스크롤 횟수"""
+        return min(self.resumed_scrolls, self.max_scrolls)
+    
+    def should_scroll(self):
+        """
+        다음 스크롤을 진행할지 확인하는 함수
         
-        # 3단계: 동적 mount ID 찾기와 XPath 생성
-        print("mount ID 찾는 중...")
+        최대 스크롤 횟수에 도달했거나 게시물별 전체 시간 예산을 다 쓰면 False
+        (둘 다 남은 댓글이 있을 수 있으므로 미완료로 기록)
+        """
+        if self.scroll_count >= self.max_scrolls:
+            self.max_scrolls_reached = True
+            print(f"최대 스크롤 횟수({self.max_scrolls})에 도달. 수집이 끝나지 않은 상태로 중단.")
+            return False
+        if budget.expired():
+            self.deadline_reached = True
+            print("게시물 시간 예산 초과. 지금까지 수집한 댓글로 스크롤 중단.")
+            return False
+        print(f"스크롤 {self.scroll_count+1}/{self.max_scrolls} 후 댓글 수집 중...")
+        return True
+    
+    def needs_dom(self):
+        """이번 스크롤에서 DOM 추출이 필요한지 (응답에서 댓글을 얻지 못한 경우에만, dom 모드는 항상)"""
+        return self.collector is None or self.store.source_counts["network"] == 0
+    
+    def add_comments(self, network_comments=(), extracted_comments=None):
+        """
+        이번 스크롤에서 얻은 댓글을 반영하는 함수
+        
+        Args:
+            network_comments: 응답 수집기에서 꺼낸 (pk, 댓글 데이터) 목록
+            extracted_comments: DOM에서 추출한 댓글 목록 (추출하지 않았으면 None)
+            
+        Returns:
+            tuple: (새로 추가된 댓글 수, DOM 정리 범위 - 네트워크 응답으로만 기록했으면 None(렌더링된 전체))
+        """
+        # 네트워크 응답으로 수신된 댓글 우선 반영
+        added = _add_network_comments(network_comments, self.store)
+        prune_upto = None
+        if extracted_comments is not None:
+            # 이미 처리되지 않은 댓글만 추가
+            added += _add_dom_comments(extracted_comments, self.store)
+            prune_upto = max((comment["index"] for comment in extracted_comments), default=0)
+        
+        # 새로 추가된 댓글 수 및 총 댓글 수 출력
+        print(f"새로 추가된 댓글 수: {added}, 총 댓글 수: {self.store.count}")
+        return added, prune_upto
+    
+    def delta_done(self):
+        """델타 모드: 이전에 저장한 댓글이 연속으로 나오면 이후는 이미 수집한 구간이므로 True"""
+        if self.store.known_ids and self.store.consecutive_known >= self.delta_threshold:
+            self.delta_reached = True
+            self.end_reached = True
+            print(f"이전에 수집한 댓글 {self.store.consecutive_known}개를 연속으로 만남. 스크롤 중단.")
+            return True
+        return False
+    
+    def record_scroll(self, panel_state):
+        """스크롤 횟수 증가와 진행 상황 출력"""
+        self.scroll_count += 1
+        current_scroll_height = panel_state[0] if panel_state else 0
+        print(f"댓글 영역 스크롤 {self.scroll_count}/{self.max_scrolls}: 현재 scrollHeight={current_scroll_height}")
+    
+    def record_wait(self, new_comments, changed, waited, timed_out):
+        """
+        스크롤 후 패널 대기 결과를 기록하고 목록 끝에 도달했는지 판단하는 함수
         
-        # 모든 mount 요소 찾기
-        mount_elements = page.query_selector_all('[id^="mount_"]')
-        mount_id = None
+        Returns:
+            bool: 새 댓글이 발견되지 않고 대기 시간 안에 패널도 변하지 않은 상태가 max_idle_waits번 이어지면 True
+        """
+        self.scroll_wait_seconds.append(round(waited, 3))
+        if timed_out:
+            self.wait_timeouts += 1
         
-        if mount_elements:
-            # 첫 번째 mount 요소의 ID 가져오기
-            mount_id = mount_elements[0].get_attribute("id")
-            print(f"mount ID 발견: {mount_id}")
+        # 새 댓글이 없는 대기 중에도 flush_interval이 지난 레코드는 디스크로 flush
+        if self.writer is not None:
+            self.writer.flush_if_due()
+        
+        # 주기적으로 진행 상황 저장
+        if self.checkpoint is not None and self.checkpoint.due(self.scroll_count):
+            _save_checkpoint(self.checkpoint, self.store, self.post_url, self.scroll_count,
+                             comments_files=self.comments_files)
+        
+        if new_comments == 0 and not changed:
+            self.consecutive_idle_waits += 1
+            if self.consecutive_idle_waits >= self.max_idle_waits:
+                print(f"더 이상 새 콘텐츠가 로드되지 않음. 스크롤 중단.")
+                self.end_reached = True
+                return True
         else:
-            print("mount 요소를 찾을 수 없습니다.")
-            mount_id = "mount_0_0"  # 기본값
+            self.consecutive_idle_waits = 0
+        return False
+    
+    def finish(self):
+        """
+        체크포인트를 저장하고 결과 딕셔너리를 만드는 함수 (마지막 응답 반영은 호출 측에서 먼저 수행)
+        
+        Returns:
+            dict: 수집된 댓글과 메타데이터를 포함하는 사전
+        """
+        store = self.store
+        # 오류 없이 목록 끝까지 수집했을 때만 완료 상태로 저장 (결과 파일 저장 후 호출 측에서 삭제)
+        # 댓글 영역을 찾지 못했거나 시간 예산/최대 스크롤 횟수에서 멈춘 경우는 --resume으로 이어서 수집
+        completed = self.scroll_error is None and self.end_reached
+        if self.checkpoint is not None:
+            _save_checkpoint(self.checkpoint, store, self.post_url, self.scroll_count,
+                             completed=completed, comments_files=self.comments_files)
+        
+        metadata = {
+            "url": self.post_url,
+            "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_comments": store.count,
+            "total_scrolls": self.scroll_count,
+            "extraction_mode": self.extraction_mode,
+            "capture_mode": self.capture_mode,
+            "wait_timeout": self.wait_timeout,
+            "scroll_wait_seconds": self.scroll_wait_seconds,
+            "scroll_wait_total": round(sum(self.scroll_wait_seconds), 3),
+            "wait_timeouts": self.wait_timeouts,
+            "completed": completed
+        }
+        
+        if self.writer is not None:
+            metadata["comments_file"] = self.writer.path
+        if self.checkpoint is not None:
+            metadata["checkpoint_file"] = self.checkpoint.path
+            metadata["resumed_from_checkpoint"] = self.resumed_comments > 0 or self.resumed_scrolls > 0
+            metadata["resumed_comments"] = self.resumed_comments
+            if len(self.comments_files) > 1:
+                metadata["comments_files"] = self.comments_files
+        if self.prune_keep is not None:
+            metadata["pruned_nodes"] = self.pruned_nodes
+        if self.deadline_reached:
+            metadata["deadline_reached"] = True
+        if self.max_scrolls_reached:
+            metadata["max_scrolls_reached"] = True
+        if self.known_ids is not None:
+            metadata["delta"] = {
+                "known_ids": len(store.known_ids),
+                "known_seen": store.known_hits,
+                "stopped_at_known": self.delta_reached,
+            }
+        if self.collector is not None:
+            metadata["network_comments"] = store.source_counts["network"]
+            metadata["dom_comments"] = store.source_counts["dom"]
+            metadata["responses_parsed"] = self.collector.responses_parsed
+        
+        return {"metadata": metadata, "comments": store.comments}
+    
+    def error_result(self, error):
+        """페이지 이동 등 수집 전체가 실패했을 때의 결과 딕셔너리"""
+        print(f"댓글 수집 중 오류 발생: {error}")
+        return {
+            "metadata": {
+                "url": self.post_url,
+                "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "error": str(error),
+                "total_comments": 0,
+                "total_scrolls": 0
+            },
+            "comments": {}
+        }
+
+
+def make_comment_id(author, content, timestamp=None):
+    """
+    실행이 달라도 같은 댓글이면 같은 값이 되는 댓글 ID 생성 (작성자 + 내용 + 작성 시각 digest)
+
+    작성 시각은 DOM의 time[datetime] 또는 API 응답의 created_at(유닉스 시각, 초)만 사용
+    ("3일" 같은 표시 문자열은 수집 시점마다 바뀌므로 제외하고, 작성 시각을 모르면 작성자 + 내용만 사용)
+
+    Args:
+        author: 작성자
+        content: 댓글 내용
+        timestamp: 작성 시각 (유닉스 시각, 초) 또는 None
+
+    Returns:
+        str: "c_" + 16자리 16진수 digest
+    """
+    raw = f"{author}\x00{content}\x00{'' if timestamp is None else int(timestamp)}"
+    return "c_" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_datetime_attr(value):
+    """time 요소의 datetime 속성(ISO 8601)을 유닉스 시각(초)으로 변환 (실패 시 None)"""
+    if not value:
+        return None
+    try:
+        return int(datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def collect_instagram_comments(page, post_url, extraction_mode="bulk", capture_mode="dom", max_scrolls=50,
+                               wait_timeout=5.0, max_idle_waits=2, resource_policy=None,
+                               writer=None, keep_in_memory=True, checkpoint=None, resume=False,
+                               known_ids=None, delta_threshold=10, prune_keep=None):
+    """
+    인스타그램 게시물의 댓글을 수집하는 함수
+    
+    Args:
+        page: Playwright 페이지 인스턴스
+        post_url: 스크래핑할 인스타그램 게시물의 URL
+        extraction_mode: 댓글 추출 방식
+            - "bulk": 스크롤마다 한 번의 page.evaluate로 렌더링된 모든 댓글 추출 (기본값)
+            - "xpath": 댓글 인덱스별 locator 호출 (기존 방식, 최대 499개)
+        capture_mode: 댓글 수집 경로
+            - "dom": 렌더링된 DOM에서 추출 (기본값)
+            - "network": 스크롤 중 수신되는 댓글 XHR/GraphQL 응답을 직접 파싱하고,
+              응답에서 댓글을 얻지 못한 동안에만 DOM 추출을 사용
+        max_scrolls: 최대 스크롤 횟수 (도달하면 남은 댓글이 있을 수 있으므로 미완료로 기록)
+        wait_timeout: 스크롤 후 댓글 패널 변화를 기다리는 최대 시간 (초)
+        max_idle_waits: 새 댓글 없이 대기 시간이 초과된 횟수가 연속으로 이 값에 도달하면 스크롤 중단
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy, 'comment' 단계 적용)
+        writer: 새 댓글을 발견 즉시 기록할 JsonlWriter (module.stream)
+        keep_in_memory: False이면 댓글 본문을 결과 딕셔너리에 보관하지 않음 (writer와 함께 사용)
+        checkpoint: 진행 상황을 주기적으로 저장할 CommentCheckpoint (module.checkpoint)
+        resume: True이면 checkpoint에 저장된 댓글/스크롤 위치부터 이어서 수집
+        known_ids: 이전 실행에서 저장된 댓글 ID (델타 모드, make_comment_id 형식)
+            - 이 댓글들은 결과에 다시 넣지 않고, delta_threshold개를 연속으로 만나면 이미 수집한 구간에
+              도달한 것으로 보고 스크롤 중단 (새 댓글만큼만 스크롤)
+        delta_threshold: 델타 모드에서 스크롤을 멈추는 연속된 기존 댓글 수
+        prune_keep: 지정하면 기록을 마친 댓글 요소를 스크롤마다 빈 요소로 바꾸고 마지막 prune_keep개만 남김
+            - 댓글이 수만 개인 게시물에서도 브라우저 메모리와 스크롤당 추출 시간이 일정하게 유지됨
+            - 스크롤 위치와 목록 구조는 유지되므로 지연 로딩은 그대로 동작
+        
+    Returns:
+        dict: 수집된 댓글과 메타데이터를 포함하는 사전
+    """
+    crawl = _CommentCrawl(post_url, extraction_mode, capture_mode, max_scrolls, wait_timeout, max_idle_waits,
+                          writer, keep_in_memory, checkpoint, resume, known_ids, delta_threshold, prune_keep)
+    
+    # 체크포인트에서 이전 수집 상태 복원 (이미 끝난 수집이면 저장된 결과 반환)
+    restored = crawl.restore()
+    if restored is not None:
+        return restored
+    store = crawl.store
+    
+    # 리소스 차단 정책 적용 (페이지 이동 전)
+    if resource_policy is not None:
+        resource_policy.apply(page, "comment")
+    
+    # 네트워크 캡처 모드인 경우 페이지 이동 전에 응답 리스너 등록
+    if capture_mode == "network":
+        crawl.collector = CommentResponseCollector(page).attach()
+    collector = crawl.collector
+    
+    try:
+        # 2단계: 지정된 릴 페이지로 이동
+        print(f"릴 페이지로 이동 중: {post_url}")
+        with metrics.span("comments.navigation"):
+            budget.goto(page, post_url, "comments.navigation", wait_until="load")
+            print("기본 페이지 로드 완료")
+            
+            # 페이지 로딩 완료 확인을 위해 특정 요소 대기
+            try:
+                budget.wait_for_selector(page, POST_CONTENT_SELECTOR, "comments.content",
+                                         timeout=15000, state="visible")
+                print("페이지 주요 콘텐츠 로드됨")
+            except TimeoutError:
+                print("페이지 주요 콘텐츠를 찾을 수 없습니다. 계속 진행합니다...")
+            
+            # 추가 안전 대기 시간
+            budget.settle("comments.content", 5)
         
-        # 제공된 XPath에서 mount ID 부분만 바꾸기
-        comments_xpath = f"//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]"
-        print(f"사용할 XPath: {comments_xpath}")
+        # 3단계: 동적 mount ID 찾기와 XPath 생성
+        print("mount ID 찾는 중...")
+        comments_xpath = _comments_xpath(page.evaluate(MOUNT_ID_JS))
         
         # 새로운 댓글 수집 방법 구현
         print("댓글 수집 시작...")
-        all_collected_comments = {}  # 새로운 댓글 데이터 저장 구조
-        # 이미 처리한 댓글의 고유 ID를 저장하는 세트
-        processed_comment_ids = set()
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # 4단계: 댓글 영역 찾고 스크롤 다운
         try:
@@ -74,171 +940,58 @@ def collect_instagram_comments(page, post_url):
                 comment_area.hover()
                 time.sleep(1)
                 
-                # 댓글 영역 내에서 스크롤 수행
-                scroll_count = 0
-                max_scrolls = 50  # 최대 스크롤 횟수
-                previous_scroll_height = 0
-                consecutive_same_height = 0
-                total_new_comments = 0
+                # 체크포인트의 스크롤 위치까지 이동 (이전에 수집한 댓글은 다시 추출해도 건너뜀)
+                if crawl.resumed_scrolls > 0:
+                    print(f"체크포인트 위치까지 스크롤 중... ({crawl.resumed_scrolls}회)")
+                    crawl.scroll_count = _fast_forward_scrolls(page, comments_xpath, crawl.fast_forward_scrolls,
+                                                               wait_timeout, max_idle_waits)
                 
-                while scroll_count < max_scrolls:
-                    # 현재 스크롤 높이 확인
-                    current_scroll_height = page.evaluate(f"""
-                        () => {{
-                            const element = document.evaluate(
-                                "{comments_xpath.replace('"', '\\"')}", 
-                                document, 
-                                null, 
-                                XPathResult.FIRST_ORDERED_NODE_TYPE, 
-                                null
-                            ).singleNodeValue;
-                            
-                            if (element) {{
-                                return element.scrollHeight;
-                            }}
-                            return 0;
-                        }}
-                    """)
-                    
-                    # 모든 댓글 컨테이너를 순회하여 데이터 수집
-                    print(f"스크롤 {scroll_count+1}/{max_scrolls} 후 댓글 수집 중...")
-                    
-                    # 새로 로드된 댓글 수집
-                    comments_count_before = len(all_collected_comments)
-                    new_comments_this_scroll = 0
-                    
-                    # 모든 댓글 컨테이너를 순회 
-                    for comment_index in range(1, 500):  # 충분히 큰 범위 설정 
-                        try:
-                            # 먼저 특정 댓글이 실제로 존재하는지 확인
-                            content_xpath = f"//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]/div/div[2]/div[{comment_index}]/div[1]/div/div[2]/div[1]/div[1]/div/div[2]/span"
-                            
-                            # 요소가 존재하는지 확인
-                            if page.locator(f"xpath={content_xpath}").count() > 0:
-                                # 댓글이 존재하면 더 상세한 내용 추출
-                                content = page.locator(f"xpath={content_xpath}").inner_text()
-                                
-                                # 고유 식별자로 사용할 내용 해시 생성 (댓글 내용과 인덱스 조합)
-                                comment_id = f"{comment_index}_{hash(content)}"
-                                
-                                # 이미 처리되지 않은 댓글만 추가
-                                if comment_id not in processed_comment_ids:
-                                    # 나머지 정보 추출
-                                    try:
-                                        author_xpath = f"//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]/div/div[2]/div[{comment_index}]/div[1]/div/div[2]/div[1]/div[1]/div/div[1]/span[1]/span/span/div/a/div/div/span"
-                                        author = page.locator(f"xpath={author_xpath}").inner_text()
-                                    except:
-                                        author = "작성자 미상"
-                                    
-                                    try:
-                                        date_xpath = f"//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]/div/div[2]/div[{comment_index}]/div[1]/div/div[2]/div[1]/div[1]/div/div[1]/span[2]/a/time"
-                                        date = page.locator(f"xpath={date_xpath}").inner_text()
-                                    except:
-                                        date = ""
-                                    
-                                    try:
-                                        likes_xpath = f"//*[@id='{mount_id}']/div/div/div[2]/div/div/div[1]/div[1]/div[1]/section/main/div/div[1]/div/div[2]/div/div[2]/div/div[2]/div[{comment_index}]/div[1]/div/div[2]/div[1]/div[2]/div[1]/span/span"
-                                        if page.locator(f"xpath={likes_xpath}").count() > 0:
-                                            likes = page.locator(f"xpath={likes_xpath}").inner_text()
-                                            # "답글 달기"가 텍스트에 포함되어 있으면 좋아요 수를 0으로 설정
-                                            if "답글 달기" in likes:
-                                                likes = "0"
-                                        else:
-                                            likes = "0"
-                                    except:
-                                        likes = "0"
-                                    
-                                    # 댓글 정보 저장
-                                    comment_data = {
-                                        "author": author,
-                                        "content": content,
-                                        "date": date,
-                                        "likes": likes,
-                                        "index": comment_index
-                                    }
-                                    
-                                    all_collected_comments[comment_id] = comment_data
-                                    processed_comment_ids.add(comment_id)
-                                    new_comments_this_scroll += 1
-                            else:
-                                # 해당 인덱스에 댓글이 없는 경우 다음 인덱스로 이동
-                                continue
-                        except Exception as e:
-                            print(f"댓글 #{comment_index} 추출 중 오류: {e}")
-                            # 오류가 발생해도 다음 댓글로 계속 진행
-                            continue
-                    
-                    # 새로 추가된 댓글 수 및 총 댓글 수 출력
-                    total_new_comments += new_comments_this_scroll
-                    print(f"새로 추가된 댓글 수: {new_comments_this_scroll}, 총 댓글 수: {len(all_collected_comments)}")
+                while crawl.should_scroll():
+                    # 새로 로드된 댓글 수집 (네트워크 응답 우선, 필요할 때만 DOM 추출)
+                    network_comments = collector.drain() if collector is not None else ()
+                    extracted_comments = None
+                    if crawl.needs_dom():
+                        if extraction_mode == "xpath":
+                            extracted_comments = _extract_comments_by_index(page, comments_xpath, store.processed_ids)
+                        else:
+                            extracted_comments = _extract_comments_bulk(page, comments_xpath)
+                    new_comments_this_scroll, prune_upto = crawl.add_comments(network_comments, extracted_comments)
                     
-                    # 스크롤 수행 - 1500px로 스크롤
-                    page.evaluate(f"""
-                        () => {{
-                            const element = document.evaluate(
-                                "{comments_xpath.replace('"', '\\"')}", 
-                                document, 
-                                null, 
-                                XPathResult.FIRST_ORDERED_NODE_TYPE, 
-                                null
-                            ).singleNodeValue;
-                            
-                            if (element) {{
-                                element.scrollTop += 1500;
-                                return true;
-                            }}
-                            return false;
-                        }}
-                    """)
+                    if crawl.delta_done():
+                        break
                     
-                    scroll_count += 1
-                    print(f"댓글 영역 스크롤 {scroll_count}/{max_scrolls}: 현재 scrollHeight={current_scroll_height}")
+                    # 기록을 마친 댓글 요소를 비워 DOM이 스크롤마다 커지지 않도록 함
+                    if prune_keep is not None:
+                        crawl.pruned_nodes += _prune_comments(page, comments_xpath, prune_upto, prune_keep)
                     
-                    # 스크롤 후 로딩 대기 - 더 긴 대기 시간
-                    time.sleep(3)
+                    # 스크롤 수행 - 1500px로 스크롤 (스크롤 직전 패널 상태 기록)
+                    panel_state = _scroll_comments(page, comments_xpath)
+                    crawl.record_scroll(panel_state)
                     
-                    # 새 댓글이 발견되지 않고, 스크롤 높이도 변하지 않으면 중단
-                    if new_comments_this_scroll == 0 and current_scroll_height == previous_scroll_height:
-                        consecutive_same_height += 1
-                        if consecutive_same_height >= 3:  # 3번 연속으로 새 댓글이 없고 높이가 변하지 않으면 중단
-                            print(f"더 이상 새 콘텐츠가 로드되지 않음. 스크롤 중단.")
-                            break
-                    else:
-                        consecutive_same_height = 0
-                    
-                    previous_scroll_height = current_scroll_height
+                    # 스크롤 후 로딩 대기 - 패널 높이나 댓글 수가 바뀌는 즉시 다음 단계로 진행
+                    changed, waited, timed_out = _wait_for_panel_change(page, comments_xpath, panel_state, wait_timeout)
+                    if crawl.record_wait(new_comments_this_scroll, changed, waited, timed_out):
+                        break
                 
             else:
                 print("XPath로 댓글 영역을 찾을 수 없습니다.")
         
         except Exception as e:
             print(f"댓글 수집 중 오류 발생: {e}")
+            crawl.scroll_error = e
         
-        # 결과 데이터 준비
-        result = {
-            "metadata": {
-                "url": post_url,
-                "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_comments": len(all_collected_comments),
-                "total_scrolls": scroll_count
-            },
-            "comments": all_collected_comments
-        }
+        # 마지막 스크롤 이후 도착한 응답까지 반영
+        if collector is not None:
+            _add_network_comments(collector.drain(), store)
         
-        return result
+        return crawl.finish()
         
     except Exception as e:
-        print(f"댓글 수집 중 오류 발생: {e}")
-        return {
-            "metadata": {
-                "url": post_url,
-                "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "error": str(e),
-                "total_comments": 0,
-                "total_scrolls": 0
-            },
-            "comments": {}
-        }
+        return crawl.error_result(e)
+    
+    finally:
+        if collector is not None:
+            collector.detach()
 
 
 def save_comments_to_file(comments_data):
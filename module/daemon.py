@@ -0,0 +1,310 @@
+import collections
+import datetime
+import itertools
+import json
+import queue
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 데몬 HTTP API 기본 주소
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 완료된 작업 결과를 보관하는 최대 개수 (오래된 것부터 삭제)
+DEFAULT_MAX_FINISHED = 1000
+
+# wait 요청의 최대 대기 시간 (초)
+MAX_WAIT_SECONDS = 3600
+
+# 작업 스레드 종료 신호
+STOP = None
+
+
+class CrawlDaemon:
+    """
+    로그인된 브라우저를 계속 유지하면서 로컬 HTTP JSON API로 수집 작업을 받는 데몬
+
+    Playwright sync API 객체는 만든 스레드에서만 사용할 수 있으므로 setup과 모든 crawl은
+    하나의 작업 스레드에서 순서대로 실행되고, HTTP 요청 스레드는 작업 등록과 조회만 함
+
+    API:
+    - POST /jobs {"url", "type", "with_comments", "wait"}: 작업 등록 (wait가 true면 완료까지 기다려 결과 반환)
+    - GET /jobs/<id>[?wait=초]: 작업 상태와 결과 (result_data는 crawler.py 결과 구조와 동일)
+    - GET /jobs: 작업 목록 (결과 제외)
+    - GET /status: 대기 중/처리 중 작업 수, 누적 처리 수, 로그인 여부
+
+    setup과 crawl은 ShardedCrawl과 같은 형식 (setup(options) -> state, crawl(state, job, options) -> result_data)
+    """
+
+    def __init__(self, setup, crawl, options=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 max_finished=DEFAULT_MAX_FINISHED):
+        """
+        Args:
+            setup: options -> state 딕셔너리 (browser, page, close 등)를 만드는 함수
+            crawl: (state, job, options) -> result_data를 반환하는 함수 (job은 url, type, with_comments 포함)
+            options: setup/crawl에 전달할 옵션
+            host: 바인딩할 주소 (기본값: 127.0.0.1, 로컬에서만 접근)
+            port: 바인딩할 포트
+            max_finished: 보관할 완료 작업 수
+        """
+        self.setup = setup
+        self.crawl = crawl
+        self.options = options or {}
+        self.host = host
+        self.port = port
+        self.max_finished = max_finished
+
+        self.jobs = collections.OrderedDict()
+        self.job_queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.ids = itertools.count(1)
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0}
+        self.in_flight = 0
+        self.job_started = {}
+        self.ready = threading.Event()
+        self.login = None
+        self.setup_error = None
+        self.started = time.time()
+        self.server = None
+        self.worker = None
+
+    def submit(self, url, content_type="reels", with_comments=True):
+        """작업을 큐에 추가하고 작업 정보를 반환"""
+        with self.lock:
+            job_id = str(next(self.ids))
+            job = {
+                "job_id": job_id,
+                "url": url,
+                "type": content_type,
+                "with_comments": with_comments,
+                "status": "queued",
+                "submitted_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self.jobs[job_id] = job
+            self.stats["submitted"] += 1
+            self._evict_finished()
+        self.job_queue.put(job_id)
+        return self.get(job_id, include_result=False)
+
+    def get(self, job_id, include_result=True):
+        """작업 정보 사본 (없으면 None)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if include_result:
+                return dict(job)
+            return {key: value for key, value in job.items() if key != "result_data"}
+
+    def wait(self, job_id, timeout):
+        """작업이 끝나거나 timeout초가 지날 때까지 기다린 뒤 작업 정보를 반환"""
+        deadline = time.time() + min(timeout, MAX_WAIT_SECONDS)
+        with self.changed:
+            while True:
+                job = self.jobs.get(job_id)
+                if job is None or job["status"] in ("done", "failed"):
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.changed.wait(remaining)
+        return self.get(job_id)
+
+    def list_jobs(self):
+        """작업 목록 (결과 제외, 등록 순서)"""
+        with self.lock:
+            return [{key: value for key, value in job.items() if key != "result_data"} for job in self.jobs.values()]
+
+    def status(self):
+        """대기열 길이, 처리 중 작업 수, 누적 처리 수"""
+        with self.lock:
+            return {
+                "queue_depth": self.job_queue.qsize(),
+                "in_flight": self.in_flight,
+                "submitted": self.stats["submitted"],
+                "completed": self.stats["completed"],
+                "failed": self.stats["failed"],
+                "ready": self.ready.is_set() and self.setup_error is None,
+                "login": self.login,
+                "setup_error": self.setup_error,
+                "uptime_seconds": round(time.time() - self.started, 1),
+            }
+
+    def _evict_finished(self):
+        # 보관 한도를 넘으면 오래된 완료 작업부터 삭제 (대기/처리 중인 작업은 유지)
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def _finish(self, job_id, result_data, error):
+        with self.changed:
+            self.in_flight -= 1
+            job = self.jobs[job_id]
+            failed = error is not None or not (result_data and result_data.get("post_info"))
+            job["status"] = "failed" if failed else "done"
+            job["finished_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            job["elapsed_seconds"] = round(time.time() - self.job_started.pop(job_id), 2)
+            job["result_data"] = result_data
+            if failed:
+                job["error"] = error or (result_data or {}).get("metadata", {}).get("error", "post info not available")
+                self.stats["failed"] += 1
+            else:
+                self.stats["completed"] += 1
+            self.changed.notify_all()
+
+    def _run_worker(self):
+        """작업 스레드: 브라우저/로그인 준비 후 큐의 작업을 하나씩 처리"""
+        state = None
+        try:
+            state = self.setup(self.options)
+            self.login = state.get("page") is not None
+        except Exception:
+            self.setup_error = traceback.format_exc(limit=3)
+            print(f"Daemon setup failed:\n{self.setup_error}")
+        finally:
+            self.ready.set()
+
+        try:
+            while True:
+                job_id = self.job_queue.get()
+                if job_id is STOP:
+                    break
+                with self.lock:
+                    job = self.jobs.get(job_id)
+                    if job is None:
+                        continue
+                    job["status"] = "running"
+                    job["started_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    self.job_started[job_id] = time.time()
+                    self.in_flight += 1
+                    request = {"url": job["url"], "type": job["type"], "with_comments": job["with_comments"]}
+
+                if state is None:
+                    self._finish(job_id, None, "daemon setup failed")
+                    continue
+                print(f"\n=== Job {job_id}: {request['url']} ===")
+                result_data = None
+                error = None
+                try:
+                    result_data = self.crawl(state, request, self.options)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    print(f"Job {job_id} failed: {error}")
+                self._finish(job_id, result_data, error)
+        finally:
+            if state is not None and state.get("close"):
+                try:
+                    state["close"]()
+                except Exception:
+                    pass
+
+    def start(self):
+        """작업 스레드를 시작하고 HTTP 서버 포트를 연결 (port=0이면 할당된 포트로 self.port 갱신)"""
+        self.worker = threading.Thread(target=self._run_worker, name="crawl-daemon-worker", daemon=True)
+        self.worker.start()
+        self.server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def shutdown(self):
+        """다른 스레드에서 실행 중인 serve_forever를 중단"""
+        if self.server is not None:
+            self.server.shutdown()
+
+    def serve_forever(self, poll_interval=0.5):
+        """
+        작업 스레드와 HTTP 서버를 실행하고 Ctrl+C(또는 shutdown())로 중단될 때까지 요청을 처리
+
+        Args:
+            poll_interval: shutdown 요청을 확인하는 간격 (초)
+        """
+        if self.server is None:
+            self.start()
+        print(f"Crawl daemon listening on http://{self.host}:{self.port} (POST /jobs, GET /jobs/<id>, GET /status)")
+        try:
+            self.server.serve_forever(poll_interval)
+        except KeyboardInterrupt:
+            print("\nStopping crawl daemon...")
+        finally:
+            self.server.server_close()
+            self.job_queue.put(STOP)
+            self.worker.join(timeout=60)
+
+
+def _make_handler(daemon):
+    """CrawlDaemon에 연결된 요청 처리 클래스 생성"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            parts = [part for part in parsed.path.split("/") if part]
+            if parts == ["status"]:
+                self._send(200, daemon.status())
+            elif parts == ["jobs"]:
+                self._send(200, {"jobs": daemon.list_jobs(), **daemon.status()})
+            elif len(parts) == 2 and parts[0] == "jobs":
+                query = parse_qs(parsed.query)
+                try:
+                    wait = float(query.get("wait", ["0"])[0])
+                except ValueError:
+                    self._send(400, {"error": "wait must be a number of seconds"})
+                    return
+                job = daemon.wait(parts[1], wait) if wait > 0 else daemon.get(parts[1])
+                if job is None:
+                    self._send(404, {"error": f"unknown job {parts[1]}"})
+                else:
+                    self._send(200, job)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if urlparse(self.path).path.rstrip("/") != "/jobs":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+            except ValueError:
+                self._send(400, {"error": "request body must be JSON"})
+                return
+            if not isinstance(body, dict):
+                self._send(400, {"error": "request body must be a JSON object"})
+                return
+
+            url = body.get("url")
+            content_type = body.get("type", "reels")
+            if not isinstance(url, str) or "instagram.com" not in url:
+                self._send(400, {"error": "a valid Instagram url is required"})
+                return
+            if content_type not in ("post", "reels"):
+                self._send(400, {"error": "type must be 'post' or 'reels'"})
+                return
+
+            wait = body.get("wait")
+            if wait is not None and not isinstance(wait, (bool, int, float)):
+                self._send(400, {"error": "wait must be true or a number of seconds"})
+                return
+
+            job = daemon.submit(url, content_type, bool(body.get("with_comments", True)))
+            if wait:
+                timeout = MAX_WAIT_SECONDS if wait is True else float(wait)
+                self._send(200, daemon.wait(job["job_id"], timeout))
+            else:
+                self._send(202, job)
+
+    return Handler
\ No newline at end of file
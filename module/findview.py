@@ -3,6 +3,144 @@ import time
 import logging
 import re
 
+from module import budget, metrics
+
+# 그리드에 MutationObserver를 설치해 새로 추가된 링크만 대기열(window.__igPendingAnchors)에 모음
+# 이미 렌더링된 링크는 설치 시점에 대기열에 넣고, 링크 안에 자식이 추가되면(조회수 지연 렌더링) 다시 넣음
+WATCH_ANCHORS_JS = r"""
+    () => {
+        if (window.__igAnchorObserver) return false;
+        const pending = new Set(document.querySelectorAll('a[href]'));
+        window.__igPendingAnchors = pending;
+        const root = document.querySelector('main') || document.body;
+        window.__igAnchorObserver = new MutationObserver(mutations => {
+            for (const mutation of mutations) {
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType !== 1) continue;
+                    const owner = node.closest('a[href]');
+                    if (owner) pending.add(owner);
+                    node.querySelectorAll('a[href]').forEach(a => pending.add(a));
+                }
+            }
+        });
+        window.__igAnchorObserver.observe(root, {childList: true, subtree: true});
+        return true;
+    }
+"""
+
+# 대기열의 링크만 한 번의 evaluate로 검사하고 대기열을 비움
+# 인자: 찾을 post_id (null이면 모든 포스트/릴스 링크)
+# 반환: [검사한 링크 수, [[post_id, 조회수 텍스트, href], ...]]
+# 조회수 경로: a > div[2]/div[2]/div/div/div/span/span
+SCAN_NEW_ANCHORS_JS = r"""
+    (target) => {
+        const viewText = (link) => {
+            if (link.children.length < 2) return null;
+            const div2 = link.children[1];
+            if (div2.children.length < 2) return null;
+            const viewSpan = ['div', 'div', 'div', 'span', 'span'].reduce(
+                (el, tag) => el && el.querySelector(tag), div2.children[1]);
+            return viewSpan ? viewSpan.innerText : null;
+        };
+        const pending = window.__igPendingAnchors || new Set(document.querySelectorAll('a[href]'));
+        const anchors = Array.from(pending);
+        pending.clear();
+        const rows = [];
+        for (const link of anchors) {
+            const href = link.getAttribute('href') || '';
+            if (target && !href.includes(target)) continue;
+            const match = href.match(/\/(?:p|reel|reels)\/([A-Za-z0-9_-]+)/);
+            if (match) rows.push([match[1], viewText(link), href]);
+        }
+        return [anchors.length, rows];
+    }
+"""
+
+# 그리드 방문 전에 들르는 홈페이지 (세션 쿠키 유지)
+HOME_URL = "https://www.instagram.com/"
+
+# 프로필 페이지 이동 시간 초과 (밀리초)
+PROFILE_TIMEOUT_MS = 60000
+
+# 그리드 스크롤 한 번의 이동 거리와 이후 로딩 대기 시간 (초), 기본 최대 스크롤 횟수
+GRID_SCROLL_JS = "window.scrollBy(0, 1500)"
+GRID_SCROLL_WAIT_SECONDS = 2
+DEFAULT_GRID_SCROLLS = 5
+
+def reels_grid_url(username):
+    """사용자의 reels 그리드 페이지 URL"""
+    return f"https://www.instagram.com/{username}/reels/"
+
+
+class ViewCountCache:
+    """
+    사용자별 릴스 그리드 수집 결과(post_id → 조회수)를 보관하는 캐시
+
+    한 번의 프로필 방문으로 얻은 모든 타일의 조회수를 ttl(초) 동안 재사용하고,
+    그리드에서 찾지 못한 post_id도 기록해 같은 ttl 동안 다시 방문하지 않음
+    """
+
+    def __init__(self, ttl=600):
+        """
+        Args:
+            ttl: 사용자별 수집 결과 유효 시간 (초)
+        """
+        self.ttl = ttl
+        self._entries = {}
+        self.counters = {"hits": 0, "misses": 0, "harvests": 0}
+
+    def _entry(self, username):
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        if time.time() - entry["harvested_at"] > self.ttl:
+            del self._entries[username]
+            return None
+        return entry
+
+    def lookup(self, username, post_id):
+        """
+        캐시된 조회수를 찾는 함수
+
+        Returns:
+            tuple: (캐시 적중 여부, 조회수 또는 None)
+        """
+        entry = self._entry(username)
+        if entry is not None:
+            if post_id in entry["views"]:
+                self.counters["hits"] += 1
+                return True, entry["views"][post_id]
+            if post_id in entry["missing"]:
+                self.counters["hits"] += 1
+                return True, None
+        self.counters["misses"] += 1
+        return False, None
+
+    def store(self, username, views):
+        """사용자의 그리드 수집 결과를 저장 (이전 결과는 대체)"""
+        self._entries[username] = {"harvested_at": time.time(), "views": dict(views), "missing": set()}
+        self.counters["harvests"] += 1
+
+    def mark_missing(self, username, post_id):
+        """그리드 수집에서 찾지 못한 post_id 기록"""
+        entry = self._entry(username)
+        if entry is not None:
+            entry["missing"].add(post_id)
+
+    def stats(self):
+        return dict(self.counters, users=len(self._entries))
+
+
+# 수집 모드에서 view_cache를 지정하지 않았을 때 사용하는 프로세스 공용 캐시
+_default_view_cache = None
+
+def get_view_cache():
+    """프로세스 공용 ViewCountCache 반환 (첫 사용 시 생성)"""
+    global _default_view_cache
+    if _default_view_cache is None:
+        _default_view_cache = ViewCountCache()
+    return _default_view_cache
+
 def setup_logging(log_file=None, logger=None):
     """로깅 설정 초기화 함수"""
     if logger is None:
@@ -22,7 +160,8 @@ def setup_logging(log_file=None, logger=None):
         logger = logging.getLogger(__name__)
     return logger
 
-def find_post_views(username, post_id, logger=None, content_type='reels', page=None):
+def find_post_views(username, post_id, logger=None, content_type='reels', page=None, resource_policy=None,
+                    view_cache=None):
     """
     인스타그램 사용자의 프로필에서 특정 post_id의 조회수를 찾는 함수
     
@@ -32,6 +171,9 @@ def find_post_views(username, post_id, logger=None, content_type='reels', page=N
         logger: 로거 인스턴스 (없으면 새로 생성)
         content_type: 컨텐츠 타입 ('post' 또는 'reels', 기본값: 'reels')
         page: 기존 Playwright 페이지 객체 (없으면 새로 생성)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy, 'findview' 단계 적용)
+        view_cache: 지정하면 수집 모드로 동작 - 프로필 그리드의 모든 타일 조회수를 한 번에 수집해
+                    ViewCountCache에 보관하고, 같은 사용자의 다른 post_id는 캐시에서 응답
         
     Returns:
         str: 포스트 조회수 (원본 문자열 그대로, 예: "3.8만") 또는 찾지 못한 경우 None
@@ -45,6 +187,10 @@ def find_post_views(username, post_id, logger=None, content_type='reels', page=N
         print("Content type is 'post', skipping view count extraction")
         return None
     
+    # 수집 모드: 사용자별 캐시를 먼저 확인하고 없을 때만 프로필을 방문
+    if view_cache is not None:
+        return find_posts_views(username, [post_id], logger, page, resource_policy, view_cache)[post_id]
+    
     # 페이지 객체가 제공되지 않은 경우 새로 생성 (독립 실행용)
     should_close_browser = False
     if page is None:
@@ -56,172 +202,252 @@ def find_post_views(username, post_id, logger=None, content_type='reels', page=N
             
             try:
                 # 로직 실행 후 결과 반환
-                return _find_views_logic(page, username, post_id, logger)
+                return _find_views_logic(page, username, post_id, logger, resource_policy)
             finally:
                 browser.close()
     else:
         # 기존 페이지 객체 사용
-        return _find_views_logic(page, username, post_id, logger)
+        return _find_views_logic(page, username, post_id, logger, resource_policy)
 
-def _find_views_logic(page, username, post_id, logger):
-    """조회수 추출 로직을 분리한 내부 함수"""
-    try:
+def find_posts_views(username, post_ids, logger=None, page=None, resource_policy=None, view_cache=None,
+                     max_scrolls=DEFAULT_GRID_SCROLLS):
+    """
+    한 사용자의 여러 post_id 조회수를 한 번의 프로필 방문으로 찾는 함수
+    
+    Args:
+        username: 인스타그램 사용자 이름
+        post_ids: 찾고자 하는 릴스 ID 목록
+        logger: 로거 인스턴스 (없으면 새로 생성)
+        page: 기존 Playwright 페이지 객체 (없으면 새로 생성)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy, 'findview' 단계 적용)
+        view_cache: 사용자별 조회수 캐시 (없으면 모듈 기본 캐시 사용)
+        max_scrolls: 그리드 수집 시 최대 스크롤 횟수
+        
+    Returns:
+        dict: post_id → 조회수 문자열 (찾지 못한 경우 None)
+    """
+    if logger is None:
+        logger = setup_logging()
+    if view_cache is None:
+        view_cache = get_view_cache()
+    
+    results, pending = _lookup_cached_views(view_cache, username, post_ids)
+    if not pending:
+        return results
+    
+    # 캐시에 없는 post_id가 있으면 그리드를 한 번 수집
+    if page is None:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=False)
+            context = browser.new_context(viewport={"width": 1280, "height": 800})
+            try:
+                harvested = _harvest_views_logic(context.new_page(), username, logger, resource_policy, max_scrolls)
+            finally:
+                browser.close()
+    else:
+        harvested = _harvest_views_logic(page, username, logger, resource_policy, max_scrolls)
+    
+    return _store_harvest(view_cache, username, harvested, pending, results, logger)
+
+def _lookup_cached_views(view_cache, username, post_ids):
+    """
+    캐시에서 조회수를 찾는 함수 (sync/async 수집 공용)
+    
+    Returns:
+        tuple: (캐시에서 찾은 post_id → 조회수, 그리드를 수집해야 하는 post_id 목록)
+    """
+    results = {}
+    pending = []
+    for post_id in post_ids:
+        hit, views = view_cache.lookup(username, post_id)
+        if hit:
+            results[post_id] = views
+        else:
+            pending.append(post_id)
+    
+    if not pending:
+        print(f"Served {len(post_ids)} view count(s) for {username} from cache")
+    return results, pending
+
+def _store_harvest(view_cache, username, harvested, pending, results, logger):
+    """
+    그리드 수집 결과를 캐시에 저장하고 pending의 조회수를 results에 채우는 함수 (sync/async 수집 공용)
+    
+    Args:
+        harvested: 그리드 수집 결과 (실패 시 None, 이 경우 캐시를 갱신하지 않음)
+        
+    Returns:
+        dict: post_id → 조회수 문자열 (찾지 못한 경우 None)
+    """
+    if harvested is not None:
+        view_cache.store(username, harvested)
+    for post_id in pending:
+        results[post_id] = (harvested or {}).get(post_id)
+        if harvested is not None and post_id not in harvested:
+            view_cache.mark_missing(username, post_id)
+            logger.warning(f"Post with ID {post_id} not found in the reels grid of {username}")
+    return results
+
+def _open_reels_grid(page, username, logger, resource_policy=None):
+    """홈페이지를 거쳐 사용자의 reels 그리드 페이지로 이동하는 함수"""
+    with metrics.span("findview.navigation"):
+        # 리소스 차단 정책 적용 (썸네일/영상 불필요)
+        if resource_policy is not None:
+            resource_policy.apply(page, "findview")
+    
         # 사용자의 reels 페이지로 이동
-        profile_url = f"https://www.instagram.com/{username}/reels/"
+        profile_url = reels_grid_url(username)
         logger.info(f"Navigating to: {profile_url}")
         print(f"Navigating to: {profile_url}")
-        
+    
         # 먼저 쿠키가 제대로 설정되도록 인스타그램 홈페이지 방문
-        page.goto("https://www.instagram.com/")
+        budget.goto(page, HOME_URL, "home")
         print("Visited homepage to maintain session")
-        time.sleep(2)
-        
+        budget.settle("home", 2)
+    
         # 이제 프로필 페이지로 이동 (타임아웃 늘리고 대기 조건 변경)
         try:
             print(f"Navigating to profile page with increased timeout...")
-            page.goto(profile_url, wait_until="load", timeout=60000)  # 60초 타임아웃, load 이벤트만 기다림
+            budget.goto(page, profile_url, "findview.profile", timeout=PROFILE_TIMEOUT_MS, wait_until="load")  # load 이벤트만 기다림
             print("Profile page loaded, waiting for content to stabilize...")
-            time.sleep(5)  # 페이지 안정화를 위해 더 오래 대기
+            budget.settle("findview.profile", 5)  # 페이지 안정화를 위해 더 오래 대기
+        except budget.DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"Navigation timeout, but continuing anyway: {e}")
             # 타임아웃이 발생해도 계속 진행
+
+def merge_grid_rows(harvested, rows):
+    """
+    그리드에서 추출한 [post_id, 조회수] 행을 수집 결과에 합치는 함수 (조회수 텍스트가 없던 항목만 갱신)
+    
+    Returns:
+        int: 새로 발견한 post_id 수
+    """
+    new_tiles = 0
+    for post_id, views in rows:
+        if post_id not in harvested:
+            new_tiles += 1
+            harvested[post_id] = views
+        elif harvested[post_id] is None and views:
+            harvested[post_id] = views
+    return new_tiles
+
+def _grid_scroll_done(scroll_count, max_scrolls, activity):
+    """그리드를 더 스크롤하지 않아야 하는지 확인 (최대 스크롤 횟수 또는 게시물 시간 예산 초과)"""
+    if scroll_count >= max_scrolls:
+        return True
+    if budget.expired():
+        print(f"Post deadline reached; stopping reels grid {activity}.")
+        return True
+    return False
+
+def _harvest_scan(harvested, scan, username, scroll_count, max_scrolls):
+    """
+    그리드 스캔 결과를 수집 결과에 합치는 함수 (sync/async 수집 공용)
+    
+    Args:
+        harvested: post_id → 조회수 수집 결과 (갱신됨)
+        scan: SCAN_NEW_ANCHORS_JS 반환값 [검사한 링크 수, 행 목록]
+        
+    Returns:
+        bool: 수집을 마쳐야 하면 True (새 타일이 없으면 그리드 끝에 도달한 것으로 판단)
+    """
+    scanned, rows = scan
+    metrics.count("findview_anchors_scanned", scanned)
+    new_tiles = merge_grid_rows(harvested, [row[:2] for row in rows])
+    print(f"Harvested {len(harvested)} tiles (+{new_tiles}) from {username}'s reels grid")
+    if scroll_count > 0 and new_tiles == 0:
+        return True
+    return _grid_scroll_done(scroll_count, max_scrolls, "harvest")
+
+def _view_count_from_match(match, post_id, max_scrolls, logger):
+    """그리드 탐색에서 찾은 링크 행에서 조회수를 꺼내는 함수 (sync/async 탐색 공용)"""
+    if match is None:
+        logger.warning(f"Post with ID {post_id} not found after {max_scrolls} scrolls")
+        print(f"Post with ID {post_id} not found after {max_scrolls} scrolls")
+        return None
+    
+    _, view_count, href = match
+    logger.info(f"Found post link: {href}")
+    print(f"Found post link: {href}")
+    
+    if view_count:
+        print(f"Extracted view count: {view_count}")
+        return view_count
+    logger.warning("View count element not found")
+    print("View count element not found")
+    return None
+
+def _harvest_views_logic(page, username, logger, resource_policy=None, max_scrolls=DEFAULT_GRID_SCROLLS):
+    """
+    reels 그리드를 한 번 스크롤하며 보이는 모든 타일의 조회수를 수집하는 내부 함수
+    
+    Returns:
+        dict: post_id → 조회수 문자열 또는 실패 시 None
+    """
+    try:
+        _open_reels_grid(page, username, logger, resource_policy)
         
-        # mount ID 찾기
-        mount_elements = page.query_selector_all('[id^="mount_"]')
-        mount_id = None
+        page.evaluate(WATCH_ANCHORS_JS)
+        harvested = {}
+        scroll_count = 0
+        while True:
+            # 지난 스크롤 이후 추가된 링크만 검사
+            with metrics.span("findview.scan"):
+                scan = page.evaluate(SCAN_NEW_ANCHORS_JS, None)
+            if _harvest_scan(harvested, scan, username, scroll_count, max_scrolls):
+                break
+            
+            scroll_count += 1
+            logger.info(f"Scrolling down ({scroll_count}/{max_scrolls})")
+            with metrics.span("findview.scroll"):
+                page.evaluate(GRID_SCROLL_JS)
+                time.sleep(GRID_SCROLL_WAIT_SECONDS)  # 스크롤 후 로딩 대기
         
-        if mount_elements:
-            mount_id = mount_elements[0].get_attribute("id")
-            logger.info(f"Mount ID found: {mount_id}")
-        else:
-            mount_id = "mount_0_0"  # 기본값
-            logger.warning("Mount element not found, using default mount_0_0")
+        logger.info(f"Harvested view counts for {len(harvested)} reels of {username} in {scroll_count} scrolls")
+        return harvested
+    
+    except Exception as e:
+        logger.error(f"Error during reels grid harvest: {e}")
+        print(f"Error during reels grid harvest: {e}")
+        return None
+
+def _find_views_logic(page, username, post_id, logger, resource_policy=None, max_scrolls=DEFAULT_GRID_SCROLLS):
+    """조회수 추출 로직을 분리한 내부 함수"""
+    try:
+        _open_reels_grid(page, username, logger, resource_policy)
         
-        print(f"Using mount ID: {mount_id}")
+        # 새로 추가되는 링크만 검사하도록 그리드 감시 시작
+        page.evaluate(WATCH_ANCHORS_JS)
         
-        # 찾고자 하는 post_id가 포함된 링크 검색
-        found_post = False
-        max_scrolls = 5
+        # 찾고자 하는 post_id가 포함된 링크 검색 (링크 검사와 조회수 추출을 한 번의 evaluate로 처리)
         scroll_count = 0
-        post_link_element = None
+        anchors_scanned = 0
+        match = None
         
-        while not found_post and scroll_count < max_scrolls:
-            # 현재 페이지에서 모든 링크 요소 검색
-            all_links = page.query_selector_all("a")
+        while True:
+            with metrics.span("findview.scan"):
+                scanned, rows = page.evaluate(SCAN_NEW_ANCHORS_JS, post_id)
+            anchors_scanned += scanned
+            metrics.count("findview_anchors_scanned", scanned)
+            if rows:
+                match = rows[0]
+                break
+            if _grid_scroll_done(scroll_count, max_scrolls, "search"):
+                break
             
-            for link in all_links:
-                href = link.get_attribute("href")
-                if href and post_id in href:
-                    logger.info(f"Found post link: {href}")
-                    print(f"Found post link: {href}")
-                    post_link_element = link
-                    found_post = True
-                    break
+            # 스크롤 다운
+            scroll_count += 1
+            logger.info(f"Scrolling down ({scroll_count}/{max_scrolls})")
+            print(f"Scrolling down ({scroll_count}/{max_scrolls})")
             
-            if not found_post:
-                # 스크롤 다운
-                scroll_count += 1
-                logger.info(f"Scrolling down ({scroll_count}/{max_scrolls})")
-                print(f"Scrolling down ({scroll_count}/{max_scrolls})")
-                
-                page.evaluate("window.scrollBy(0, 1500)")
-                time.sleep(2)  # 스크롤 후 로딩 대기
+            with metrics.span("findview.scroll"):
+                page.evaluate(GRID_SCROLL_JS)
+                time.sleep(GRID_SCROLL_WAIT_SECONDS)  # 스크롤 후 로딩 대기
         
-        if not found_post:
-            logger.warning(f"Post with ID {post_id} not found after {max_scrolls} scrolls")
-            print(f"Post with ID {post_id} not found after {max_scrolls} scrolls")
-            return None
-        
-        # 조회수 추출 시도 - crawler.py와 동일한 방법 사용
-        try:
-            print("Found post link, attempting to extract view count...")
-            
-            # 방법 1: 선택자 문제를 피하기 위해 JavaScript로 직접 자식 요소 탐색
-            # 업데이트된 경로: div[2]/div[2]/div/div/div/span/span
-            print("Using JavaScript DOM navigation approach with updated path...")
-            logger.info("Using JavaScript DOM navigation approach with updated path...")
-            
-            view_count = post_link_element.evaluate("""
-                link => {
-                    console.log("Link children:", link.children.length);
-                    
-                    // Log HTML structure for debugging
-                    console.log("Link HTML structure:", link.outerHTML.substring(0, 500) + "...");
-                    
-                    // Get second div child (div[2])
-                    if (link.children.length < 2) {
-                        console.log("Link has fewer than 2 children");
-                        return null;
-                    }
-                    
-                    // Navigate to div:nth-child(2)
-                    const div2 = link.children[1];
-                    console.log("Found div:nth-child(2), children:", div2.children.length);
-                    
-                    // Get second div in div2 (div[2]/div[2])
-                    if (div2.children.length < 2) {
-                        console.log("Div2 has fewer than 2 children");
-                        return null;
-                    }
-                    const innerDiv = div2.children[1]; // Get second div
-                    console.log("Found inner div (second child)");
-                    
-                    // Find div in innerDiv (div[2]/div[2]/div)
-                    const divLevel3 = innerDiv.querySelector('div');
-                    if (!divLevel3) {
-                        console.log("No div level 3 found");
-                        return null;
-                    }
-                    console.log("Found div level 3");
-                    
-                    // Find div in divLevel3 (div[2]/div[2]/div/div)
-                    const divLevel4 = divLevel3.querySelector('div');
-                    if (!divLevel4) {
-                        console.log("No div level 4 found");
-                        return null;
-                    }
-                    console.log("Found div level 4");
-                    
-                    // Find div in divLevel4 (div[2]/div[2]/div/div/div)
-                    const divLevel5 = divLevel4.querySelector('div');
-                    if (!divLevel5) {
-                        console.log("No div level 5 found");
-                        return null;
-                    }
-                    console.log("Found div level 5");
-                    
-                    // Find span in divLevel5 (div[2]/div[2]/div/div/div/span)
-                    const spanContainer = divLevel5.querySelector('span');
-                    if (!spanContainer) {
-                        console.log("No span container found");
-                        return null;
-                    }
-                    console.log("Found span container");
-                    
-                    // Find span in spanContainer (div[2]/div[2]/div/div/div/span/span)
-                    const viewSpan = spanContainer.querySelector('span');
-                    if (!viewSpan) {
-                        console.log("No view span found");
-                        return null;
-                    }
-                    console.log("Found view span with text:", viewSpan.innerText);
-                    
-                    return viewSpan.innerText;
-                }
-            """)
-            
-            if view_count:
-                print(f"Extracted view count: {view_count}")
-                return view_count
-            else:
-                logger.warning("View count element not found")
-                print("View count element not found")
-                return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting view count: {e}")
-            print(f"Error extracting view count: {e}")
-            return None
+        logger.info(f"Scanned {anchors_scanned} links in {scroll_count} scrolls")
+        return _view_count_from_match(match, post_id, max_scrolls, logger)
             
     except Exception as e:
         logger.error(f"Error during post view search: {e}")
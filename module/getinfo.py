@@ -5,6 +5,20 @@ import json
 import os
 from datetime import datetime
 
+from module.cache import VOLATILE_FIELDS
+from module.http_client import KeepAliveClient, extract_meta_tags
+from module.normalize import parse_count
+from module import budget, metrics
+
+# og:description 메타 태그 내용 추출
+OG_DESCRIPTION_JS = '''() => {
+    const meta_tag = document.querySelector('meta[property="og:description"]');
+    return meta_tag ? meta_tag.getAttribute('content') : null;
+}'''
+
+# HTTP 모드에서 호출 간에 공유하는 keep-alive 클라이언트 (첫 사용 시 생성)
+_shared_http_client = None
+
 # 로깅 설정
 def setup_logging(log_file=None):
     """로깅 설정을 초기화하는 함수"""
@@ -70,13 +84,102 @@ def extract_date(description):
         return match.group(1)
     return None
 
-def get_post_info(url, logger=None):
+def parse_og_description(og_description, url):
+    """
+    OG description 문자열에서 포스트 정보를 파싱하는 함수
+    
+    Args:
+        og_description: og:description 메타 태그 내용
+        url: 정규화된 Instagram 포스트 URL
+        
+    Returns:
+        dict: 포스트 정보를 담은 딕셔너리
+    """
+    # 좋아요 수 및 댓글 수 추출 (OG description에서 파싱, "1,234 likes"나 "1.2K likes" 형식 포함)
+    likes_match = re.search(r'(\d[\d,.]*\s*[KkMm]?) likes', og_description)
+    comments_match = re.search(r'(\d[\d,.]*\s*[KkMm]?) comments', og_description)
+    
+    likes = parse_count(likes_match.group(1)) if likes_match else None
+    comments = parse_count(comments_match.group(1)) if comments_match else None
+    
+    # 사용자 이름 및 작성일 추출
+    username = extract_username(og_description)
+    post_date = extract_date(og_description)
+    
+    # 실제 description 내용 추출 (콜론 이후의 텍스트)
+    description_content = og_description.split(':', 1)[1].strip() if ':' in og_description else ""
+    
+    # 결과 생성
+    post_id = extract_reel_id(url)
+    return {
+        "post_id": post_id,
+        "username": username,
+        "post_date": post_date,
+        "likes": likes,
+        "comments_count": comments,
+        "description": description_content,
+        "url": url,
+        "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def get_shared_http_client():
+    """HTTP 모드 기본 클라이언트를 반환하는 함수 (프로세스 내에서 연결 풀 공유)"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = KeepAliveClient()
+    return _shared_http_client
+
+def fetch_post_info_http(url, logger=None, client=None):
+    """
+    브라우저 없이 HTTP 요청만으로 포스트 정보를 가져오는 함수
+    
+    Args:
+        url: Instagram 포스트의 URL
+        logger: 로거 인스턴스 (없으면 새로 생성)
+        client: KeepAliveClient 인스턴스 (없으면 공유 클라이언트 사용)
+        
+    Returns:
+        dict: 포스트 정보를 담은 딕셔너리 또는 og:description이 없거나 실패 시 None
+    """
+    if logger is None:
+        logger = setup_logging()
+    if client is None:
+        client = get_shared_http_client()
+    
+    url = normalize_instagram_url(url)
+    
+    try:
+        with metrics.span("getinfo.http"):
+            status, final_url, html = client.get(url)
+        metrics.count("bytes_received_http", len(html.encode("utf-8")))
+    except Exception as e:
+        logger.warning(f"URL: {url}, HTTP 요청 실패: {str(e)}")
+        return None
+    
+    og_description = extract_meta_tags(html).get("og:description")
+    if status != 200 or not og_description:
+        logger.info(f"URL: {url}, HTTP 응답에서 OG Description을 찾을 수 없습니다 (status={status}, url={final_url})")
+        return None
+    
+    logger.info(f"URL: {url}, HTTP 모드 데이터 추출 성공")
+    return parse_og_description(og_description, url)
+
+def get_post_info(url, logger=None, browser=None, resource_policy=None, fetch_mode="browser", http_client=None,
+                  cache=None, bypass_cache=False):
     """
     Instagram 포스트 정보를 스크랩하는 함수
     
     Args:
         url: Instagram 포스트의 URL
         logger: 로거 인스턴스 (없으면 새로 생성)
+        browser: 재사용할 Playwright 브라우저 (없으면 새로 실행 후 종료)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy, 'getinfo' 단계 적용)
+        fetch_mode: 'browser' (Playwright로 페이지 로드) 또는
+                    'http' (HTTP 요청으로 메타 태그를 읽고, 태그가 없을 때만 Playwright로 재시도)
+        http_client: HTTP 모드에서 사용할 KeepAliveClient (없으면 공유 클라이언트)
+        cache: 게시물 ID 기준 포스트 정보 캐시 (module.cache.PostInfoCache)
+            - 좋아요/댓글 수만 만료되었으면 나머지 필드는 캐시에서 쓰고, 수는 브라우저 없이 HTTP 요청으로 갱신
+        bypass_cache: True이면 캐시를 조회하지 않고 새로 수집한 결과로 캐시 갱신
         
     Returns:
         dict: 포스트 정보를 담은 딕셔너리 또는 실패 시 None
@@ -87,62 +190,111 @@ def get_post_info(url, logger=None):
     # URL 정규화
     url = normalize_instagram_url(url)
     logger.info(f"정규화된 URL: {url}")
+    
+    if cache is None:
+        return _fetch_post_info(url, logger, browser, resource_policy, fetch_mode, http_client)
+    
+    # 캐시에 유효한 정보가 있으면 브라우저 없이 반환
+    post_id = extract_reel_id(url)
+    if not bypass_cache:
+        cached = _cached_post_info(cache, post_id, url, logger, http_client)
+        if cached is not None:
+            return cached
+    
+    result = _fetch_post_info(url, logger, browser, resource_policy, fetch_mode, http_client)
+    if result:
+        cache.put(post_id, result)
+    return result
+
+def _cached_post_info(cache, post_id, url, logger, http_client=None):
+    """
+    캐시에서 포스트 정보를 찾는 내부 함수 (sync/async 경로 공용)
+    
+    작성자/작성일/설명은 유효하고 좋아요/댓글 수만 만료된 경우 HTTP 요청으로 수만 갱신해 합침
+    
+    Returns:
+        dict: 캐시된(또는 수만 갱신한) 포스트 정보, 새로 수집해야 하면 None
+    """
+    cached, stale = cache.lookup(post_id)
+    if cached is not None and not stale:
+        metrics.count("post_info_cache_hits")
+        logger.info(f"URL: {url}, 캐시된 포스트 정보 사용")
+        return cached
+    
+    if cached and all(field in VOLATILE_FIELDS for field in stale):
+        refreshed = fetch_post_info_http(url, logger, http_client)
+        if refreshed:
+            updates = {field: refreshed.get(field) for field in stale}
+            cache.put(post_id, updates)
+            metrics.count("post_info_cache_partial_hits")
+            logger.info(f"URL: {url}, 캐시된 포스트 정보에 {', '.join(stale)} 갱신")
+            return {**cached, **updates}
+    return None
+
+def _fetch_post_info(url, logger, browser=None, resource_policy=None, fetch_mode="browser", http_client=None):
+    """정규화된 URL의 포스트 정보를 HTTP 또는 브라우저로 새로 수집하는 내부 함수"""
+    # HTTP 모드: 브라우저 없이 메타 태그만 읽기
+    if fetch_mode == "http":
+        result = fetch_post_info_http(url, logger, http_client)
+        if result:
+            return result
+        logger.info(f"URL: {url}, Playwright 모드로 재시도")
+    
+    # 브라우저가 전달된 경우 새 페이지(독립 컨텍스트)만 열고 브라우저는 유지
+    if browser is not None:
+        page = browser.new_page()
+        try:
+            return _get_post_info_logic(page, url, logger, resource_policy)
+        finally:
+            page.close()
         
     with sync_playwright() as p:
         browser = p.chromium.launch()
         page = browser.new_page()
         
         try:
-            # 페이지 로드
-            page.goto(url, wait_until="networkidle")
-            
-            # OG 설명 추출
-            og_description = page.evaluate('''() => {
-                const meta_tag = document.querySelector('meta[property="og:description"]');
-                return meta_tag ? meta_tag.getAttribute('content') : null;
-            }''')
-            
-            if not og_description:
-                logger.warning(f"URL: {url}, OG Description 태그를 찾을 수 없습니다.")
-                return None
-            
-            # 좋아요 수 및 댓글 수 추출 (OG description에서 파싱)
-            likes_match = re.search(r'(\d+) likes', og_description)
-            comments_match = re.search(r'(\d+) comments', og_description)
-            
-            likes = int(likes_match.group(1)) if likes_match else None
-            comments = int(comments_match.group(1)) if comments_match else None
-            
-            # 사용자 이름 및 작성일 추출
-            username = extract_username(og_description)
-            post_date = extract_date(og_description)
-            
-            # 실제 description 내용 추출 (콜론 이후의 텍스트)
-            description_content = og_description.split(':', 1)[1].strip() if ':' in og_description else ""
-            
-            # 결과 생성
-            post_id = extract_reel_id(url)
-            result = {
-                "post_id": post_id,
-                "username": username,
-                "post_date": post_date,
-                "likes": likes,
-                "comments_count": comments,
-                "description": description_content,
-                "url": url,
-                "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            logger.info(f"URL: {url}, 데이터 추출 성공")
-            return result
-                
-        except Exception as e:
-            logger.error(f"URL: {url}, 에러 발생: {str(e)}")
-            print(f"에러 발생: {str(e)}")
-            return None
+            return _get_post_info_logic(page, url, logger, resource_policy)
         finally:
             browser.close()
 
+def _post_info_wait_until(resource_policy):
+    """기본 정보 페이지 이동의 대기 조건 (메타 태그만 필요하므로 차단 정책 프리셋을 따름)"""
+    if resource_policy is None:
+        return "networkidle"
+    return resource_policy.wait_until("getinfo", "networkidle")
+
+def _post_info_from_og(og_description, url, logger):
+    """페이지에서 읽은 OG 설명으로 포스트 정보를 만드는 내부 함수 (sync/async 공용, 태그가 없으면 None)"""
+    if not og_description:
+        logger.warning(f"URL: {url}, OG Description 태그를 찾을 수 없습니다.")
+        return None
+    
+    result = parse_og_description(og_description, url)
+    logger.info(f"URL: {url}, 데이터 추출 성공")
+    return result
+
+def _get_post_info_logic(page, url, logger, resource_policy=None):
+    """포스트 정보 추출 로직을 분리한 내부 함수"""
+    try:
+        # 리소스 차단 정책 적용
+        if resource_policy is not None:
+            resource_policy.apply(page, "getinfo")
+        
+        # 페이지 로드
+        with metrics.span("getinfo.navigation"):
+            budget.goto(page, url, "getinfo.navigation", wait_until=_post_info_wait_until(resource_policy))
+        
+        # OG 설명 추출
+        with metrics.span("getinfo.extract"):
+            og_description = page.evaluate(OG_DESCRIPTION_JS)
+        
+        return _post_info_from_og(og_description, url, logger)
+            
+    except Exception as e:
+        logger.error(f"URL: {url}, 에러 발생: {str(e)}")
+        print(f"에러 발생: {str(e)}")
+        return None
+
 def save_to_json(data, filename="instagram_data.json", logger=None):
     """
     데이터를 JSON 파일로 저장하는 함수
@@ -0,0 +1,171 @@
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import gzip
+import http.client
+import threading
+import zlib
+
+# 브라우저 없이 포스트 HTML을 요청할 때 사용할 기본 헤더
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class _MetaTagParser(HTMLParser):
+    """<meta property="..." content="..."> 태그만 수집하는 파서 (</head>에서 중단)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "meta" or self.done:
+            return
+        attrs = dict(attrs)
+        key = attrs.get("property") or attrs.get("name")
+        if key and "content" in attrs and key not in self.meta:
+            self.meta[key] = attrs["content"]
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+
+def extract_meta_tags(html):
+    """
+    HTML 문자열에서 meta 태그의 property/name → content 딕셔너리를 추출하는 함수
+
+    Args:
+        html: 페이지 HTML
+
+    Returns:
+        dict: 메타 태그 딕셔너리 (예: {"og:description": "..."})
+    """
+    parser = _MetaTagParser()
+    try:
+        parser.feed(html)
+    except Exception:
+        # 잘린 HTML 등 파싱 오류가 나도 그때까지 수집한 태그는 사용
+        pass
+    return parser.meta
+
+
+class KeepAliveClient:
+    """
+    호스트별 keep-alive 연결을 재사용하는 간단한 HTTP 클라이언트 (표준 라이브러리 http.client 기반)
+
+    유휴 연결을 호스트별 풀에 보관하고, 요청마다 하나를 꺼내 쓰고 돌려놓으므로 여러 스레드에서 공유 가능
+    base_url을 지정하면 모든 요청의 scheme/host를 해당 주소로 바꿔 보냄 (로컬 테스트 서버용)
+    """
+
+    def __init__(self, base_url=None, headers=None, timeout=10, max_redirects=5, max_idle_per_host=4):
+        """
+        Args:
+            base_url: 요청을 보낼 대체 주소 (예: "http://127.0.0.1:8000")
+            headers: 기본 헤더 (없으면 DEFAULT_HEADERS)
+            timeout: 연결/응답 타임아웃 (초)
+            max_redirects: 따라갈 최대 리다이렉트 수
+            max_idle_per_host: 호스트별로 보관할 최대 유휴 연결 수
+        """
+        self.base_url = base_url
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def _target(self, url):
+        """요청 URL을 (scheme, host, path) 로 분해 (base_url이 있으면 호스트 교체)"""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        if self.base_url:
+            base = urlsplit(self.base_url)
+            return base.scheme, base.netloc, path
+        return parts.scheme, parts.netloc, path
+
+    def _acquire(self, scheme, host):
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                return idle.pop()
+            self.connections_opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout)
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def _release(self, scheme, host, conn):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _request_once(self, scheme, host, path):
+        """연결 하나로 GET 요청을 보내고 (status, headers, body) 반환 (재사용 연결이 끊겼으면 1회 재시도)"""
+        for attempt in range(2):
+            conn = self._acquire(scheme, host)
+            try:
+                conn.request("GET", path, headers=self.headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+
+            with self._lock:
+                self.requests_sent += 1
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(scheme, host, conn)
+            return response.status, response.getheaders(), body
+
+    def get(self, url):
+        """
+        URL을 GET으로 요청하고 리다이렉트를 따라가는 함수
+
+        Returns:
+            tuple: (최종 상태 코드, 최종 URL, 디코딩된 본문 문자열)
+        """
+        for _ in range(self.max_redirects + 1):
+            scheme, host, path = self._target(url)
+            status, headers, body = self._request_once(scheme, host, path)
+            headers = {k.lower(): v for k, v in headers}
+
+            if status in (301, 302, 303, 307, 308) and "location" in headers:
+                url = urljoin(url, headers["location"])
+                continue
+
+            encoding = headers.get("content-encoding", "")
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "deflate":
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    # zlib 헤더 없이 raw deflate로 보내는 서버
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+            return status, url, body.decode("utf-8", errors="replace")
+
+        raise http.client.HTTPException(f"Too many redirects: {url}")
+
+    def close(self):
+        """보관 중인 유휴 연결을 모두 닫음"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
\ No newline at end of file
@@ -0,0 +1,375 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+import threading
+import time
+
+from module.getinfo import extract_reel_id, normalize_instagram_url
+
+# 기본 작업 큐 데이터베이스 파일
+DEFAULT_QUEUE_PATH = "crawl_queue.db"
+
+# 작업을 가져간 워커가 응답 없이 이 시간(초)이 지나면 다른 워커가 다시 가져갈 수 있음
+DEFAULT_LEASE_TIMEOUT = 300
+
+# 작업 하나를 시도하는 최대 횟수
+DEFAULT_MAX_ATTEMPTS = 3
+
+# 재시도 대기 시간: BACKOFF_BASE * 2^(시도 횟수 - 1)초, 최대 BACKOFF_MAX초
+BACKOFF_BASE = 60
+BACKOFF_MAX = 3600
+
+# 우선순위를 지정하지 않은 작업의 콘텐츠 유형별 기본 우선순위 (클수록 먼저, 새로 올라온 릴스를 먼저 수집)
+DEFAULT_PRIORITIES = {"reels": 10, "post": 0}
+
+SCHEMA = """
+-- 게시물 ID별 수집 작업 (같은 게시물은 하나의 작업만 존재)
+CREATE TABLE IF NOT EXISTS jobs (
+    post_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    result_file TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority DESC, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires_at);
+"""
+
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def backoff_delay(attempts, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """attempts번 실패한 작업을 다시 시도하기 전 대기 시간 (초, 지수 증가)"""
+    return min(maximum, base * (2 ** max(0, attempts - 1)))
+
+
+class JobQueue:
+    """
+    게시물 ID를 키로 하는 SQLite 기반 영속 수집 작업 큐
+
+    작업 상태: queued(대기) → leased(처리 중) → done(완료) / failed(최대 시도 횟수 초과)
+    - enqueue: 같은 게시물의 작업이 이미 있으면 추가하지 않음 (대기 중이면 더 높은 우선순위만 반영)
+    - lease: 처리 가능한 작업 중 우선순위가 가장 높은 것을 lease_timeout 동안 독점 (BEGIN IMMEDIATE로 원자적 처리)
+      만료된 lease는 다른 워커가 다시 가져갈 수 있으므로 프로세스가 죽어도 작업이 사라지지 않음
+    - fail: 시도 횟수가 남아 있으면 지수 백오프 후 다시 대기, 아니면 failed
+
+    여러 프로세스(및 여러 --workers)가 같은 파일을 공유해도 같은 게시물을 동시에 처리하지 않음
+    """
+
+    def __init__(self, db_path=DEFAULT_QUEUE_PATH, lease_timeout=DEFAULT_LEASE_TIMEOUT,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 clock=time.time):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            lease_timeout: 작업 독점 시간 (초, hold()를 사용하면 처리 중에 자동 연장)
+            max_attempts: 새로 추가하는 작업의 최대 시도 횟수
+            backoff_base: 첫 실패 후 재시도 대기 시간 (초)
+            backoff_max: 재시도 대기 시간 상한 (초)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = self._connect()
+        self.conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # 트랜잭션은 직접 관리 (isolation_level=None), 다른 프로세스가 쓰는 중이면 최대 30초 대기
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self, conn=None):
+        conn = conn or self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, url, content_type="reels", priority=None, recrawl=False):
+        """
+        게시물 작업을 없을 때만 추가하는 함수
+
+        Args:
+            url: 게시물 URL (reel/reels URL은 /p/ 형식으로 정규화)
+            content_type: 'post' 또는 'reels'
+            priority: 우선순위 (클수록 먼저, 없으면 DEFAULT_PRIORITIES)
+            recrawl: True이면 완료/실패한 작업도 다시 대기 상태로 되돌림 (처리 중인 작업은 그대로)
+
+        Returns:
+            bool: 새로 추가(또는 다시 대기)되었으면 True, 이미 있으면 False
+        """
+        url = normalize_instagram_url(url)
+        post_id = extract_reel_id(url)
+        if not post_id:
+            raise ValueError(f"Not an Instagram post URL: {url}")
+        if priority is None:
+            priority = DEFAULT_PRIORITIES.get(content_type, 0)
+        now = self.clock()
+
+        with self._transaction():
+            cursor = self.conn.execute(
+                """
+                INSERT INTO jobs (post_id, url, content_type, priority, max_attempts, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(post_id) DO NOTHING
+                """,
+                (post_id, url, content_type, priority, self.max_attempts, now, _now(), _now()),
+            )
+            if cursor.rowcount:
+                return True
+            if recrawl:
+                cursor = self.conn.execute(
+                    """
+                    UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, priority = ?,
+                        content_type = ?, max_attempts = ?, last_error = NULL, finished_at = NULL, updated_at = ?
+                    WHERE post_id = ? AND status IN ('done', 'failed')
+                    """,
+                    (now, priority, content_type, self.max_attempts, _now(), post_id),
+                )
+                if cursor.rowcount:
+                    return True
+            # 대기 중인 작업에는 더 높은 우선순위만 반영
+            self.conn.execute(
+                "UPDATE jobs SET priority = ?, updated_at = ? WHERE post_id = ? AND status = 'queued' AND priority < ?",
+                (priority, _now(), post_id, priority),
+            )
+        return False
+
+    def enqueue_many(self, urls, content_type="reels", priority=None, recrawl=False):
+        """URL 목록을 enqueue하고 새로 추가된 작업 수를 반환 (게시물 URL이 아니면 건너뜀)"""
+        added = 0
+        for url in urls:
+            try:
+                added += self.enqueue(url, content_type, priority, recrawl)
+            except ValueError as e:
+                print(f"Skipping {url}: {e}")
+        return added
+
+    def _reclaim_expired(self, now):
+        # lease가 만료된 작업(워커 종료 등)은 시도 횟수가 남아 있으면 다시 대기, 아니면 실패 처리
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                available_at = ?, lease_owner = NULL, lease_expires_at = NULL,
+                last_error = COALESCE(last_error, 'lease expired'), updated_at = ?,
+                finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END
+            WHERE status = 'leased' AND lease_expires_at < ?
+            """,
+            (now, _now(), _now(), now),
+        )
+
+    def lease(self, owner):
+        """
+        처리 가능한 작업 중 우선순위가 가장 높은 작업을 가져오는 함수 (시도 횟수 1 증가)
+
+        Args:
+            owner: 작업을 가져가는 워커 이름 (호스트:PID 등)
+
+        Returns:
+            dict: 작업 정보 (post_id, url, content_type, priority, attempts 등) 또는 처리할 작업이 없으면 None
+        """
+        now = self.clock()
+        with self._transaction():
+            self._reclaim_expired(now)
+            row = self.conn.execute(
+                """
+                SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ?
+                ORDER BY priority DESC, available_at, created_at LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                    lease_expires_at = ?, updated_at = ?
+                WHERE post_id = ?
+                """,
+                (owner, now + self.lease_timeout, _now(), row["post_id"]),
+            )
+        job = dict(row)
+        job["attempts"] += 1
+        job["status"] = "leased"
+        job["lease_owner"] = owner
+        return job
+
+    def extend(self, post_id, owner, conn=None):
+        """
+        처리 중인 작업의 lease를 연장하는 함수
+
+        Returns:
+            bool: 연장되었으면 True, lease를 이미 잃었으면 False
+        """
+        conn = conn or self.conn
+        with self._transaction(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE post_id = ? AND status = 'leased' AND lease_owner = ?",
+                (self.clock() + self.lease_timeout, _now(), post_id, owner),
+            )
+        return cursor.rowcount > 0
+
+    @contextlib.contextmanager
+    def hold(self, job):
+        """
+        작업을 처리하는 동안 별도 스레드에서 lease_timeout/3 간격으로 lease를 연장하는 컨텍스트 매니저
+
+        수집이 lease_timeout보다 오래 걸려도 다른 워커가 같은 게시물을 가져가지 않고,
+        프로세스가 죽으면 연장이 멈춰 lease_timeout 후 다시 대기 상태가 됨
+        """
+        stop = threading.Event()
+
+        def renew():
+            conn = self._connect()
+            try:
+                while not stop.wait(max(1.0, self.lease_timeout / 3)):
+                    if not self.extend(job["post_id"], job["lease_owner"], conn):
+                        print(f"Lost the lease on {job['post_id']}; another worker may pick it up.")
+                        break
+            except sqlite3.Error as e:
+                print(f"Could not extend the lease on {job['post_id']}: {e}")
+            finally:
+                conn.close()
+
+        thread = threading.Thread(target=renew, name=f"lease-{job['post_id']}", daemon=True)
+        thread.start()
+        try:
+            yield job
+        finally:
+            stop.set()
+            thread.join(timeout=5)
+
+    def complete(self, post_id, owner, result_file=None):
+        """작업을 완료 처리 (lease를 잃었어도 결과가 저장되었으므로 완료로 기록)"""
+        with self._transaction():
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires_at = NULL, last_error = NULL,
+                    result_file = ?, finished_at = ?, updated_at = ?
+                WHERE post_id = ?
+                """,
+                (result_file, _now(), _now(), post_id),
+            )
+
+    def fail(self, post_id, owner, error):
+        """
+        작업 실패를 기록하는 함수 (시도 횟수가 남아 있으면 지수 백오프 후 다시 대기)
+
+        Returns:
+            float: 재시도까지 대기 시간 (초) 또는 더 이상 시도하지 않으면 None
+        """
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE post_id = ? AND status = 'leased' AND lease_owner = ?",
+                (post_id, owner),
+            ).fetchone()
+            if row is None:
+                # lease가 만료되어 이미 다른 워커가 가져간 작업
+                return None
+            if row["attempts"] >= row["max_attempts"]:
+                self.conn.execute(
+                    """
+                    UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL, last_error = ?,
+                        finished_at = ?, updated_at = ?
+                    WHERE post_id = ?
+                    """,
+                    (error, _now(), _now(), post_id),
+                )
+                return None
+            delay = backoff_delay(row["attempts"], self.backoff_base, self.backoff_max)
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL, last_error = ?,
+                    available_at = ?, updated_at = ?
+                WHERE post_id = ?
+                """,
+                (error, self.clock() + delay, _now(), post_id),
+            )
+        return delay
+
+    def release(self, post_id, owner):
+        """처리하지 않은 작업을 시도 횟수를 되돌려 바로 다시 대기 상태로 반환 (종료 시 등)"""
+        with self._transaction():
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), lease_owner = NULL,
+                    lease_expires_at = NULL, available_at = ?, updated_at = ?
+                WHERE post_id = ? AND status = 'leased' AND lease_owner = ?
+                """,
+                (self.clock(), _now(), post_id, owner),
+            )
+
+    def counts(self):
+        """상태별 작업 수와 지금 처리 가능한(ready)/백오프 중인(delayed) 대기 작업 수"""
+        rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {"queued": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update({row["status"]: row["n"] for row in rows})
+        ready = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND available_at <= ?", (self.clock(),)
+        ).fetchone()[0]
+        counts["ready"] = ready
+        counts["delayed"] = counts["queued"] - ready
+        return counts
+
+    def next_available_in(self):
+        """
+        다음 작업을 가져올 수 있을 때까지 남은 시간 (초)
+
+        Returns:
+            float: 대기 작업의 가장 빠른 재시도 시각 또는 처리 중 작업의 lease 만료 시각까지 남은 시간,
+                   대기/처리 중인 작업이 없으면 None
+        """
+        row = self.conn.execute(
+            """
+            SELECT MIN(CASE WHEN status = 'queued' THEN available_at ELSE lease_expires_at END)
+            FROM jobs WHERE status IN ('queued', 'leased')
+            """
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - self.clock())
+
+    def jobs(self, status=None, limit=100):
+        """작업 목록 (우선순위 순)"""
+        if status is None:
+            rows = self.conn.execute("SELECT * FROM jobs ORDER BY priority DESC, created_at LIMIT ?", (limit,))
+        else:
+            rows = self.conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT ?",
+                                     (status, limit))
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
\ No newline at end of file
@@ -1,6 +1,48 @@
 from playwright.sync_api import sync_playwright, TimeoutError
 import time
 
+from module import budget
+
+# 로그인 세션용 브라우저 컨텍스트 옵션 - Asia/Seoul 시간대 사용
+LOGIN_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 800},
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "locale": "ko-KR",
+    "timezone_id": "Asia/Seoul",
+    "accept_downloads": True,
+}
+
+# 세션 안정성 향상을 위한 쿠키 설정 (모든 쿠키 허용)
+SESSION_COOKIES = [{
+    "name": "ig_cb",
+    "value": "1",
+    "domain": ".instagram.com",
+    "path": "/",
+}]
+
+# 로그인 페이지와 폼 요소 (sync/async 로그인 공용)
+LOGIN_URL = 'https://www.instagram.com/accounts/login/'
+COOKIE_ACCEPT_SELECTOR = 'button[tabindex="0"]'
+USERNAME_INPUT_SELECTOR = 'input[name="username"]'
+PASSWORD_INPUT_SELECTOR = 'input[name="password"]'
+SUBMIT_BUTTON_SELECTOR = 'button[type="submit"]'
+
+# 로그인 상태에서만 보이는 홈 아이콘
+HOME_ICON_SELECTOR = 'svg[aria-label="홈"], svg[aria-label="Home"]'
+
+# 로그인 후 뜨는 팝업의 "나중에 하기" 버튼 (영문/한글)
+NOT_NOW_SELECTORS = ['button:has-text("Not Now")', 'button:has-text("나중에 하기")']
+
+def _dismiss_not_now(page):
+    """로그인 후 팝업의 "나중에 하기" 버튼 처리 (없으면 무시)"""
+    try:
+        for selector in NOT_NOW_SELECTORS:
+            if page.is_visible(selector):
+                page.click(selector)
+                break
+    except:
+        pass
+
 def instagram_login(page, username, password):
     """
     인스타그램에 제공된 자격 증명으로 로그인하는 함수
@@ -16,59 +58,45 @@ def instagram_login(page, username, password):
     try:
         # 1단계: 인스타그램 로그인
         print("인스타그램 로그인 페이지로 이동 중...")
-        page.goto('https://www.instagram.com/accounts/login/', wait_until="load")
+        budget.goto(page, LOGIN_URL, "login.navigation", wait_until="load")
         
         # 쿠키 수락 처리
         try:
-            if page.is_visible('button[tabindex="0"]'):
-                page.click('button[tabindex="0"]')
+            if page.is_visible(COOKIE_ACCEPT_SELECTOR):
+                page.click(COOKIE_ACCEPT_SELECTOR)
         except:
             pass
             
         # 로그인 페이지 로딩 대기
         try:
-            page.wait_for_selector('input[name="username"]', state="visible", timeout=10000)
+            budget.wait_for_selector(page, USERNAME_INPUT_SELECTOR, "login.form", timeout=10000, state="visible")
             print("로그인 페이지 로드됨")
         except TimeoutError:
             print("로그인 폼을 찾을 수 없습니다. 계속 진행합니다...")
         
-        time.sleep(3)
+        budget.settle("login.form", 3)
         
         # 사용자 이름 및 비밀번호 입력
         print(f"{username}으로 로그인 중...")
-        page.fill('input[name="username"]', username)
-        page.fill('input[name="password"]', password)
+        page.fill(USERNAME_INPUT_SELECTOR, username)
+        page.fill(PASSWORD_INPUT_SELECTOR, password)
         
         # 로그인 버튼 클릭
-        page.click('button[type="submit"]')
+        page.click(SUBMIT_BUTTON_SELECTOR)
         
         # 로그인 완료 대기
         try:
-            page.wait_for_selector('svg[aria-label="홈"], svg[aria-label="Home"]', state="visible", timeout=15000)
+            budget.wait_for_selector(page, HOME_ICON_SELECTOR, "login.home", timeout=15000, state="visible")
             print("로그인 성공 - 홈 아이콘 확인됨")
             login_success = True
         except TimeoutError:
             print("홈 아이콘을 찾을 수 없습니다. 로그인은 되었을 수 있으니 계속 진행합니다...")
             login_success = True  # Assuming login succeeded even without visible indicator
         
-        # 로그인 후 팝업 처리
-        try:
-            if page.is_visible('button:has-text("Not Now")'):
-                page.click('button:has-text("Not Now")')
-            elif page.is_visible('button:has-text("나중에 하기")'):
-                page.click('button:has-text("나중에 하기")')
-        except:
-            pass
-            
+        # 로그인 후 팝업 처리 (두 번째 팝업이 뒤이어 뜨는 경우가 있어 한 번 더 확인)
+        _dismiss_not_now(page)
         time.sleep(2)
-            
-        try:
-            if page.is_visible('button:has-text("Not Now")'):
-                page.click('button:has-text("Not Now")')
-            elif page.is_visible('button:has-text("나중에 하기")'):
-                page.click('button:has-text("나중에 하기")')
-        except:
-            pass
+        _dismiss_not_now(page)
         
         print("로그인 처리 완료!")
         time.sleep(3)
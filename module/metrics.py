@@ -0,0 +1,291 @@
+from collections import Counter
+from contextlib import contextmanager
+import contextvars
+import json
+import os
+import threading
+import time
+import weakref
+
+# 브라우저와 통신하지 않는(로컬에서 처리되는) Playwright 메서드 - 왕복 횟수에서 제외
+LOCAL_METHODS = {
+    "on", "once", "remove_listener", "locator", "is_closed",
+    "set_default_timeout", "set_default_navigation_timeout",
+}
+
+# Prometheus 지표 이름 접두사
+METRIC_PREFIX = "instagram_crawler"
+
+
+class CountingProxy:
+    """
+    Playwright 객체(Browser, Page, Locator, ElementHandle 등)를 감싸 메서드 호출 수를 세는 프록시
+
+    반환값이 Playwright 객체이면 같은 카운터를 공유하는 프록시로 다시 감싸므로,
+    page.locator(...).hover() 같은 연쇄 호출도 왕복 1회로 집계됨
+    Page가 프록시를 지나갈 때마다(new_page, locator.page, context.pages 등) on_page(실제 페이지)를 호출
+    (같은 페이지가 여러 번 전달될 수 있으므로 중복 처리는 on_page에서 담당)
+    """
+
+    def __init__(self, target, counter, on_page=None):
+        self._target = target
+        self._counter = counter
+        self._on_page = on_page
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if type(value).__module__.startswith("playwright."):
+            if type(value).__name__ == "Page" and self._on_page is not None:
+                self._on_page(value)
+            return CountingProxy(value, self._counter, self._on_page)
+        return value
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return self._wrap(attr)
+
+        def call(*args, **kwargs):
+            if name not in LOCAL_METHODS:
+                self._counter[f"{type(self._target).__name__}.{name}"] += 1
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+
+class MetricsRecorder:
+    """
+    단계별 구간(span)과 카운터를 기록하는 클래스
+
+    span은 중첩 가능하며(부모 span 이름을 함께 기록), contextvars로 부모를 추적하므로
+    스레드와 asyncio 태스크에서도 섞이지 않음
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.counters = Counter()
+        self.playwright_calls = Counter()
+        self._lock = threading.Lock()
+        self._current = contextvars.ContextVar("metrics_span", default=None)
+        # 응답 리스너를 이미 등록한 페이지 (닫힌 페이지는 자동으로 빠짐)
+        self._watched_pages = weakref.WeakSet()
+        self.started_at = time.time()
+
+    @contextmanager
+    def span(self, name, **labels):
+        """이름이 name인 구간의 소요 시간을 기록하는 컨텍스트 매니저"""
+        parent = self._current.get()
+        token = self._current.set(name)
+        started = time.time()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._current.reset(token)
+            record = {
+                "name": name,
+                "parent": parent,
+                "start": round(started, 6),
+                "duration": round(time.time() - started, 6),
+            }
+            if labels:
+                record["labels"] = labels
+            if error:
+                record["error"] = error
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name, value=1):
+        """카운터 증가"""
+        with self._lock:
+            self.counters[name] += value
+
+    def instrument(self, target):
+        """
+        Playwright 브라우저/페이지를 호출 수 집계 프록시로 감싸는 함수
+
+        새로 열리는 페이지마다 응답 수와 전송 바이트(content-length 기준)를 집계
+        """
+        return CountingProxy(target, self.playwright_calls, on_page=self._watch_page)
+
+    def _watch_page(self, page):
+        """페이지에 응답 집계 리스너를 한 번만 등록 (이미 등록한 페이지면 무시)"""
+        # API 래퍼 객체는 조회할 때마다 새로 만들어질 수 있으므로 내부 구현 객체 기준으로 확인
+        key = getattr(page, "_impl_obj", page)
+        with self._lock:
+            if key in self._watched_pages:
+                return
+            self._watched_pages.add(key)
+
+        def on_response(response):
+            self.count("responses")
+            length = response.headers.get("content-length")
+            if length and length.isdigit():
+                self.count("bytes_received", int(length))
+            else:
+                self.count("responses_without_length")
+        page.on("response", on_response)
+
+    def mark(self):
+        """이후 summary(since=...)로 구간별 집계를 내기 위한 현재 위치"""
+        with self._lock:
+            return len(self.spans), Counter(self.counters), Counter(self.playwright_calls)
+
+    def summary(self, since=None):
+        """
+        span 이름별 횟수/합계/최대 시간과 카운터를 집계하는 함수
+
+        Args:
+            since: mark()가 반환한 위치 (없으면 처음부터)
+
+        Returns:
+            dict: {"spans": {...}, "counters": {...}, "playwright_calls": {...}}
+        """
+        start, counters_before, calls_before = since or (0, Counter(), Counter())
+        with self._lock:
+            spans = self.spans[start:]
+            counters = self.counters - counters_before
+            calls = self.playwright_calls - calls_before
+
+        stats = {}
+        for record in spans:
+            entry = stats.setdefault(record["name"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += record["duration"]
+            entry["max_seconds"] = max(entry["max_seconds"], record["duration"])
+        for entry in stats.values():
+            entry["total_seconds"] = round(entry["total_seconds"], 3)
+            entry["max_seconds"] = round(entry["max_seconds"], 3)
+
+        return {
+            "spans": stats,
+            "counters": dict(counters),
+            "playwright_calls": dict(calls.most_common()),
+            "playwright_round_trips": sum(calls.values()),
+        }
+
+    def write_jsonl(self, path):
+        """span과 카운터를 JSON Lines로 저장 (span 한 줄씩, 마지막에 카운터)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+            calls = dict(self.playwright_calls)
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in spans:
+                f.write(json.dumps({"type": "span", **record}, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"type": "counters", "counters": counters, "playwright_calls": calls},
+                               ensure_ascii=False) + "\n")
+        return path
+
+    def write_prometheus(self, path):
+        """Prometheus 텍스트 형식으로 집계 결과 저장 (node_exporter textfile collector 등에서 수집)"""
+        summary = self.summary()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_span_seconds Time spent in each crawler stage",
+            f"# TYPE {METRIC_PREFIX}_span_seconds summary",
+        ]
+        for name, entry in sorted(summary["spans"].items()):
+            lines.append(f'{METRIC_PREFIX}_span_seconds_sum{{stage="{name}"}} {entry["total_seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_span_seconds_count{{stage="{name}"}} {entry["count"]}')
+        lines.append(f"# HELP {METRIC_PREFIX}_span_max_seconds Longest single span per stage")
+        lines.append(f"# TYPE {METRIC_PREFIX}_span_max_seconds gauge")
+        for name, entry in sorted(summary["spans"].items()):
+            lines.append(f'{METRIC_PREFIX}_span_max_seconds{{stage="{name}"}} {entry["max_seconds"]}')
+        lines.append(f"# HELP {METRIC_PREFIX}_playwright_calls_total Playwright calls that round-trip to the browser")
+        lines.append(f"# TYPE {METRIC_PREFIX}_playwright_calls_total counter")
+        for method, value in sorted(summary["playwright_calls"].items()):
+            lines.append(f'{METRIC_PREFIX}_playwright_calls_total{{method="{method}"}} {value}')
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{name}_total {value}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+
+# 현재 활성화된 기록기 (없으면 계측 함수는 아무 것도 하지 않음)
+_recorder = None
+
+
+def set_recorder(recorder):
+    """프로세스 전체에서 사용할 기록기 설정 (None이면 계측 비활성화)"""
+    global _recorder
+    _recorder = recorder
+    return recorder
+
+
+def get_recorder():
+    """현재 기록기 반환 (비활성화 상태면 None)"""
+    return _recorder
+
+
+@contextmanager
+def span(name, **labels):
+    """활성 기록기에 구간 기록 (비활성화 상태면 시간 측정 없이 통과)"""
+    if _recorder is None:
+        yield
+        return
+    with _recorder.span(name, **labels):
+        yield
+
+
+def count(name, value=1):
+    """활성 기록기의 카운터 증가"""
+    if _recorder is not None:
+        _recorder.count(name, value)
+
+
+def instrument(target):
+    """활성 기록기가 있으면 Playwright 객체를 호출 수 집계 프록시로 감쌈"""
+    if _recorder is None:
+        return target
+    return _recorder.instrument(target)
+
+def mark():
+    """활성 기록기의 현재 위치 (비활성화 상태면 None)"""
+    if _recorder is None:
+        return None
+    return _recorder.mark()
+
+
+def summary(since=None):
+    """활성 기록기의 집계 결과 (비활성화 상태면 None)"""
+    if _recorder is None:
+        return None
+    return _recorder.summary(since)
+
+
+def write_reports(output_file, logger=None):
+    """
+    결과 파일 이름을 기준으로 {이름}_metrics.jsonl과 {이름}_metrics.prom을 저장하는 함수
+
+    Returns:
+        list: 저장한 파일 경로 (비활성화 상태거나 실패하면 빈 리스트)
+    """
+    if _recorder is None:
+        return []
+    base_name, _ = os.path.splitext(output_file)
+    try:
+        paths = [
+            _recorder.write_jsonl(f"{base_name}_metrics.jsonl"),
+            _recorder.write_prometheus(f"{base_name}_metrics.prom"),
+        ]
+    except OSError as e:
+        if logger is not None:
+            logger.error(f"지표 파일 저장 중 에러 발생: {str(e)}")
+        print(f"Failed to write metrics files: {e}")
+        return []
+    if logger is not None:
+        logger.info(f"지표 파일 저장 완료: {', '.join(paths)}")
+    print(f"Metrics files: {', '.join(paths)}")
+    return paths
\ No newline at end of file
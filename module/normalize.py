@@ -0,0 +1,198 @@
+import datetime
+import re
+
+# 수집 시각 문자열 형식 (collected_at 등)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 수 단위 (한국어 단위와 K/M/B 접미사)
+COUNT_UNITS = {
+    "천": 1_000,
+    "만": 10_000,
+    "억": 100_000_000,
+    "k": 1_000,
+    "m": 1_000_000,
+    "b": 1_000_000_000,
+}
+
+# "좋아요 1,234개", "3.8만", "1.2M views", "조회수 12,345회" 등에서 숫자와 단위만 추출
+COUNT_PATTERN = re.compile(r'(\d+(?:[.,]\d+)*)\s*(천|만|억|[kKmMbB](?![a-zA-Z]))?')
+
+# 상대 시간 단위 (초 단위 길이)
+RELATIVE_UNITS = {
+    "초": 1, "s": 1, "sec": 1, "second": 1, "seconds": 1,
+    "분": 60, "m": 60, "min": 60, "minute": 60, "minutes": 60,
+    "시간": 3600, "h": 3600, "hour": 3600, "hours": 3600,
+    "일": 86400, "d": 86400, "day": 86400, "days": 86400,
+    "주": 604800, "w": 604800, "week": 604800, "weeks": 604800,
+}
+
+RELATIVE_DATE_PATTERN = re.compile(
+    r'^(\d+)\s*(초|분|시간|일|주|seconds?|sec|minutes?|min|hours?|days?|weeks?|[smhdw])(?:\s*(?:전|ago))?$'
+)
+KOREAN_DATE_PATTERN = re.compile(r'^(?:(\d{4})년\s*)?(\d{1,2})월\s*(\d{1,2})일$')
+ENGLISH_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%B %d", "%b %d")
+
+
+def _parse_number(number):
+    """
+    쉼표/점이 섞인 숫자 문자열을 float로 변환하는 함수
+
+    구분자 뒤가 모두 세 자리면 자릿수 구분("1,234", "1.234.567", "1,234만"),
+    그렇지 않으면 마지막 구분자를 소수점으로 봄("1.5", "3.8만", "1,2만", "1,234.5")
+    """
+    groups = re.split(r'[.,]', number)
+    if len(groups) == 1:
+        return float(number)
+    if all(len(group) == 3 for group in groups[1:]):
+        return float("".join(groups))
+    return float(f"{''.join(groups[:-1])}.{groups[-1]}")
+
+
+def parse_count(text):
+    """
+    화면에 표시된 수 문자열을 정수로 변환하는 함수
+
+    "1,234", "3.8만", "1.2M", "12K", "좋아요 5개", "답글 달기"(0) 등을 처리
+    구분자 뒤가 세 자리면 자릿수 구분, 아니면 소수점으로 처리하고 반올림 ("1.5" → 2, "1,2만" → 12000)
+
+    Args:
+        text: 수 문자열 (정수나 None도 허용)
+
+    Returns:
+        int: 변환된 수 또는 숫자를 찾을 수 없으면 None
+    """
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+    text = str(text).strip()
+    if not text:
+        return None
+    if "답글 달기" in text or text.lower() == "reply":
+        return 0
+
+    match = COUNT_PATTERN.search(text)
+    if not match:
+        return None
+    number, unit = match.groups()
+    value = _parse_number(number)
+    if unit:
+        value *= COUNT_UNITS[unit.lower()]
+    return int(round(value))
+
+
+def parse_counts(values):
+    """
+    수 문자열 목록을 한 번에 정수로 변환하는 함수 (같은 문자열은 한 번만 파싱)
+
+    Returns:
+        list: 정수 또는 None 리스트
+    """
+    parsed = {}
+    result = []
+    for value in values:
+        if isinstance(value, str):
+            if value not in parsed:
+                parsed[value] = parse_count(value)
+            result.append(parsed[value])
+        else:
+            result.append(parse_count(value))
+    return result
+
+
+def parse_timestamp(text):
+    """수집 시각 문자열(YYYY-MM-DD HH:MM:SS)을 datetime으로 변환 (실패 시 None)"""
+    if not text:
+        return None
+    try:
+        return datetime.datetime.strptime(text, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def parse_comment_date(text, collected_at):
+    """
+    댓글 날짜 문자열을 수집 시각 기준의 절대 시각으로 변환하는 함수
+
+    "3일 전", "5시간", "1주", "2h", "3 days ago" 같은 상대 시간과 "3월 5일", "2023년 3월 5일",
+    "March 5, 2023", 네트워크 캡처의 "YYYY-MM-DD HH:MM:SS" 형식을 처리
+
+    Args:
+        text: 댓글 날짜 문자열
+        collected_at: 수집 시각 (datetime 또는 YYYY-MM-DD HH:MM:SS 문자열)
+
+    Returns:
+        datetime: 절대 시각 또는 변환할 수 없으면 None
+    """
+    if not text:
+        return None
+    if isinstance(collected_at, str):
+        collected_at = parse_timestamp(collected_at)
+    text = text.strip()
+
+    absolute = parse_timestamp(text)
+    if absolute is not None:
+        return absolute
+    if collected_at is None:
+        return None
+
+    match = RELATIVE_DATE_PATTERN.match(text.lower())
+    if match:
+        amount, unit = match.groups()
+        return collected_at - datetime.timedelta(seconds=int(amount) * RELATIVE_UNITS[unit])
+
+    # 연도가 없는 날짜는 수집 시각 이전의 가장 가까운 날짜로 간주
+    match = KOREAN_DATE_PATTERN.match(text)
+    if match:
+        year, month, day = match.groups()
+        return _closest_past_date(int(year) if year else None, int(month), int(day), collected_at)
+    for date_format in ENGLISH_DATE_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+        year = parsed.year if "%Y" in date_format else None
+        return _closest_past_date(year, parsed.month, parsed.day, collected_at)
+    return None
+
+
+def parse_comment_dates(values, collected_at):
+    """
+    댓글 날짜 문자열 목록을 같은 수집 시각 기준으로 한 번에 변환하는 함수
+
+    Returns:
+        list: datetime 또는 None 리스트
+    """
+    if isinstance(collected_at, str):
+        collected_at = parse_timestamp(collected_at)
+    parsed = {}
+    result = []
+    for value in values:
+        if value not in parsed:
+            parsed[value] = parse_comment_date(value, collected_at)
+        result.append(parsed[value])
+    return result
+
+
+def parse_post_date(text):
+    """og:description의 작성일("January 1, 2025")을 date로 변환 (실패 시 None)"""
+    if not text:
+        return None
+    for date_format in ("%B %d, %Y", "%b %d, %Y"):
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _closest_past_date(year, month, day, collected_at):
+    try:
+        if year is not None:
+            return datetime.datetime(year, month, day)
+        candidate = datetime.datetime(collected_at.year, month, day)
+        if candidate > collected_at:
+            candidate = candidate.replace(year=collected_at.year - 1)
+        return candidate
+    except ValueError:
+        return None
\ No newline at end of file
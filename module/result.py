@@ -0,0 +1,77 @@
+import datetime
+
+from module.checkpoint import CommentCheckpoint
+
+# 댓글 수집 결과의 metadata 중 게시물 결과 metadata에 그대로 옮기는 키
+COMMENT_METADATA_KEYS = (
+    "scroll_wait_seconds", "scroll_wait_total", "wait_timeouts", "comments_file",
+    "resumed_from_checkpoint", "resumed_comments", "comments_files", "delta", "pruned_nodes",
+    "deadline_reached", "max_scrolls_reached",
+)
+
+
+def create_result_data(need_login, content_type):
+    """결과 데이터 구조를 초기화하는 함수"""
+    return {
+        "post_info": None,
+        "comments": None,
+        "metadata": {
+            "collected_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "with_login": need_login,
+            "content_type": content_type
+        }
+    }
+
+
+def prepare_comment_options(post_id, checkpoint_options=None, delta_options=None):
+    """
+    게시물별 체크포인트와 델타 수집 옵션을 준비하는 함수 (sync/async 수집 공용)
+
+    Args:
+        post_id: 게시물 ID
+        checkpoint_options: 댓글 수집 체크포인트 옵션 (checkpoint_dir, interval, resume)
+        delta_options: 델타 수집 옵션 (store: 이미 저장된 댓글 ID를 읽을 SqliteStore, threshold: 스크롤을 멈추는 연속 기존 댓글 수)
+
+    Returns:
+        tuple: (CommentCheckpoint 또는 None, 댓글 수집 함수에 전달할 추가 인자)
+    """
+    checkpoint = None
+    kwargs = {}
+
+    # 게시물별 체크포인트 (--resume이면 이전 실행의 진행 상황부터 이어서 수집)
+    if checkpoint_options is not None:
+        checkpoint = CommentCheckpoint.for_post(
+            post_id, checkpoint_options["checkpoint_dir"], checkpoint_options["interval"]
+        )
+        kwargs["checkpoint"] = checkpoint
+        kwargs["resume"] = checkpoint_options["resume"]
+
+    # 델타 수집: 이전 실행에서 저장된 댓글 ID를 불러와 새 댓글만 수집
+    if delta_options is not None:
+        known_ids = delta_options["store"].known_comment_ids(post_id)
+        print(f"Delta mode: {len(known_ids)} comments already stored for this post")
+        kwargs["known_ids"] = known_ids
+        kwargs["delta_threshold"] = delta_options["threshold"]
+
+    return checkpoint, kwargs
+
+
+def apply_comments_result(result_data, comments_data, streamed=False):
+    """
+    댓글 수집 결과를 게시물 결과 데이터에 반영하는 함수 (sync/async 수집 공용)
+
+    Args:
+        result_data: post_info가 채워진 결과 데이터
+        comments_data: collect_instagram_comments 또는 async_collect_instagram_comments의 반환값
+        streamed: True이면 댓글이 JSONL 파일에만 기록되므로 결과 데이터에 넣지 않음
+    """
+    metadata = comments_data["metadata"]
+    result_data["comments"] = None if streamed else comments_data["comments"]
+    result_data["metadata"]["comments_collected"] = metadata["total_comments"]
+    result_data["metadata"]["total_scrolls"] = metadata["total_scrolls"]
+    for key in COMMENT_METADATA_KEYS:
+        if key in metadata:
+            result_data["metadata"][key] = metadata[key]
+
+    # 오류 없이 끝까지 수집한 경우에만 결과 저장 후 체크포인트를 삭제 (중단된 수집은 --resume으로 이어서 수집)
+    result_data["metadata"]["comments_completed"] = bool(metadata.get("completed") and "error" not in metadata)
\ No newline at end of file
@@ -0,0 +1,128 @@
+from urllib.parse import urlparse
+import weakref
+
+# 인스타그램 페이지 로딩에 필요한 1st-party 도메인 (그 외는 서드파티로 간주)
+FIRST_PARTY_DOMAINS = ("instagram.com", "cdninstagram.com", "fbcdn.net")
+
+# 단계별 차단 프리셋
+# - block_types: 차단할 Playwright resource_type
+# - block_third_party: 1st-party 도메인 외 요청(트래커 등) 차단 여부
+# - wait_until: 해당 단계의 페이지 이동 대기 조건 (None이면 각 모듈 기본값 사용)
+RESOURCE_PRESETS = {
+    # og:description 메타 태그만 필요하므로 초기 HTML 외에는 모두 불필요
+    "getinfo": {
+        "block_types": {"image", "media", "font", "stylesheet"},
+        "block_third_party": True,
+        "wait_until": "domcontentloaded",
+    },
+    # 로그인 폼/홈 아이콘 확인에는 레이아웃(CSS)과 스크립트만 필요
+    "login": {
+        "block_types": {"image", "media", "font"},
+        "block_third_party": True,
+        "wait_until": None,
+    },
+    # 릴스 그리드: 링크와 조회수 텍스트만 필요 (썸네일/영상 불필요)
+    "findview": {
+        "block_types": {"image", "media", "font"},
+        "block_third_party": True,
+        "wait_until": None,
+    },
+    # 댓글 패널: 스크롤 레이아웃 유지를 위해 CSS는 허용
+    "comment": {
+        "block_types": {"image", "media", "font"},
+        "block_third_party": True,
+        "wait_until": None,
+    },
+}
+
+def is_third_party(url):
+    """요청 URL이 1st-party 도메인이 아닌지 확인하는 함수"""
+    host = urlparse(url).hostname or ""
+    return not any(host == domain or host.endswith("." + domain) for domain in FIRST_PARTY_DOMAINS)
+
+
+class ResourcePolicy:
+    """
+    page.route로 단계별 리소스 차단 정책을 적용하는 클래스
+
+    페이지마다 라우트 핸들러를 한 번만 등록하고, apply() 호출로 현재 단계(프리셋)를 전환
+    단계별 차단/허용 요청 수를 기록
+    """
+
+    def __init__(self, presets=None, stages=None):
+        """
+        Args:
+            presets: 단계별 프리셋 딕셔너리 (없으면 RESOURCE_PRESETS 사용)
+            stages: 차단을 적용할 단계 목록 (없으면 모든 단계, 목록에 없는 단계는 모두 허용)
+        """
+        self.presets = presets or RESOURCE_PRESETS
+        self.stages = set(stages) if stages is not None else set(self.presets)
+        self.stats = {}
+        # 페이지별 현재 단계 (닫힌 페이지는 자동으로 제거)
+        self._page_stages = weakref.WeakKeyDictionary()
+
+    def _stage_stats(self, stage):
+        if stage not in self.stats:
+            self.stats[stage] = {"blocked": 0, "allowed": 0, "blocked_by_type": {}}
+        return self.stats[stage]
+
+    def should_block(self, stage, resource_type, url):
+        """단계 프리셋에 따라 요청을 차단할지 결정하는 함수"""
+        if stage not in self.stages or stage not in self.presets:
+            return False
+        preset = self.presets[stage]
+        if resource_type in preset.get("block_types", ()):
+            return True
+        return bool(preset.get("block_third_party")) and is_third_party(url)
+
+    def _handle(self, page, route):
+        """라우트 핸들러 (sync/async 공용: async API에서는 반환된 코루틴을 Playwright가 await)"""
+        request = route.request
+        stage = self._page_stages.get(page)
+        stats = self._stage_stats(stage or "default")
+
+        if self.should_block(stage, request.resource_type, request.url):
+            stats["blocked"] += 1
+            by_type = stats["blocked_by_type"]
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            return route.abort()
+
+        stats["allowed"] += 1
+        return route.continue_()
+
+    def apply(self, page, stage):
+        """
+        페이지에 정책을 적용하고 현재 단계를 전환하는 함수 (sync API)
+
+        Args:
+            page: Playwright 페이지 인스턴스
+            stage: 단계 이름 ('getinfo', 'login', 'findview', 'comment')
+        """
+        installed = page in self._page_stages
+        self._page_stages[page] = stage
+        if not installed:
+            page.route("**/*", lambda route: self._handle(page, route))
+
+    async def apply_async(self, page, stage):
+        """apply()의 async_api 버전"""
+        installed = page in self._page_stages
+        self._page_stages[page] = stage
+        if not installed:
+            await page.route("**/*", lambda route: self._handle(page, route))
+
+    def wait_until(self, stage, default):
+        """단계 프리셋의 페이지 이동 대기 조건 (지정되지 않았으면 default)"""
+        if stage not in self.stages:
+            return default
+        return self.presets.get(stage, {}).get("wait_until") or default
+
+    def summary(self):
+        """단계별 차단/허용 요청 수 요약"""
+        return {
+            stage: {
+                "blocked": stats["blocked"],
+                "allowed": stats["allowed"],
+                "blocked_by_type": dict(stats["blocked_by_type"]),
+            }
+            for stage, stats in self.stats.items()
+        }
\ No newline at end of file
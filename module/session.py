@@ -0,0 +1,142 @@
+from playwright.sync_api import TimeoutError
+import json
+import os
+import re
+
+from module.login import instagram_login, HOME_ICON_SELECTOR, LOGIN_CONTEXT_OPTIONS, SESSION_COOKIES
+from module import budget, metrics
+
+# 계정별 storage_state 파일을 저장하는 기본 디렉터리
+DEFAULT_SESSION_DIR = ".sessions"
+
+# 세션 확인 시 방문하는 페이지와, 세션이 만료되었을 때 이동되는 로그인 경로
+SESSION_CHECK_URL = "https://www.instagram.com/"
+LOGIN_PATH_MARKER = "/accounts/login"
+
+def get_session_file(username, session_dir=DEFAULT_SESSION_DIR):
+    """계정의 storage_state 파일 경로를 반환하는 함수"""
+    safe_name = re.sub(r'[^A-Za-z0-9._-]', '_', username)
+    return os.path.join(session_dir, f"{safe_name}.json")
+
+def load_session_state(username, session_dir=DEFAULT_SESSION_DIR):
+    """
+    저장된 세션 파일 경로를 반환하는 함수
+
+    파일이 없거나 sessionid 쿠키가 없으면 브라우저를 띄우기 전에 바로 None 반환
+
+    Args:
+        username: 인스타그램 사용자 이름
+        session_dir: 세션 파일 디렉터리
+
+    Returns:
+        str: storage_state 파일 경로 또는 사용할 수 없으면 None
+    """
+    state_file = get_session_file(username, session_dir)
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    has_session_cookie = any(
+        cookie.get("name") == "sessionid" and cookie.get("value")
+        for cookie in state.get("cookies", [])
+    )
+    return state_file if has_session_cookie else None
+
+def save_session(context, username, session_dir=DEFAULT_SESSION_DIR):
+    """
+    로그인된 컨텍스트의 storage_state를 계정별 파일로 저장하는 함수
+
+    세션 쿠키가 포함되므로 디렉터리와 파일은 소유자만 접근 가능하도록 생성
+
+    Returns:
+        str: 저장된 파일 경로 또는 실패 시 None
+    """
+    try:
+        state_file = prepare_session_file(username, session_dir)
+        context.storage_state(path=state_file)
+        os.chmod(state_file, 0o600)
+        print(f"세션 저장 완료: {state_file}")
+        return state_file
+    except Exception as e:
+        print(f"세션 저장 중 오류 발생: {e}")
+        return None
+
+def prepare_session_file(username, session_dir=DEFAULT_SESSION_DIR):
+    """세션 파일을 저장할 디렉터리를 소유자 전용으로 만들고 파일 경로를 반환하는 함수 (sync/async 공용)"""
+    os.makedirs(session_dir, mode=0o700, exist_ok=True)
+    return get_session_file(username, session_dir)
+
+def is_session_valid(page, timeout=5000):
+    """
+    현재 컨텍스트의 세션이 유효한지 홈페이지 한 번 방문으로 확인하는 함수
+
+    Args:
+        page: Playwright 페이지 인스턴스
+        timeout: 홈 아이콘 대기 시간 (밀리초)
+
+    Returns:
+        bool: 로그인 상태이면 True
+    """
+    try:
+        budget.goto(page, SESSION_CHECK_URL, "session.navigation", wait_until="domcontentloaded")
+        if LOGIN_PATH_MARKER in page.url:
+            return False
+        budget.wait_for_selector(page, HOME_ICON_SELECTOR, "session.check", timeout=timeout, state="visible")
+        return True
+    except TimeoutError:
+        return False
+    except Exception as e:
+        print(f"세션 확인 중 오류 발생: {e}")
+        return False
+
+def create_login_context(browser, storage_state=None):
+    """로그인 세션용 브라우저 컨텍스트를 생성하는 함수 (저장된 세션이 있으면 불러옴)"""
+    context = browser.new_context(storage_state=storage_state, **LOGIN_CONTEXT_OPTIONS)
+    context.add_cookies(SESSION_COOKIES)
+    return context
+
+def open_logged_in_page(browser, username, password, session_dir=DEFAULT_SESSION_DIR, resource_policy=None):
+    """
+    로그인된 페이지를 반환하는 함수
+
+    저장된 세션이 유효하면 폼 로그인을 건너뛰고, 만료된 경우에만 instagram_login을 수행한 뒤 세션을 갱신
+
+    Args:
+        browser: Playwright 브라우저 인스턴스
+        username: 인스타그램 사용자 이름
+        password: 인스타그램 비밀번호
+        session_dir: 세션 파일 디렉터리 (None이면 저장된 세션 없이 항상 폼 로그인)
+        resource_policy: 리소스 차단 정책 (module.routing.ResourcePolicy, 'login' 단계 적용)
+
+    Returns:
+        tuple: (페이지, 로그인 성공 여부)
+    """
+    if session_dir is not None:
+        state_file = load_session_state(username, session_dir)
+        if state_file:
+            context = create_login_context(browser, state_file)
+            page = context.new_page()
+            if resource_policy is not None:
+                resource_policy.apply(page, "login")
+            with metrics.span("login.session_check"):
+                session_ok = is_session_valid(page)
+            if session_ok:
+                metrics.count("session_reused")
+                print(f"저장된 세션으로 로그인 상태 확인됨: {username}")
+                return page, True
+            print("저장된 세션이 만료되었습니다. 다시 로그인합니다...")
+            context.close()
+
+    context = create_login_context(browser)
+    page = context.new_page()
+    if resource_policy is not None:
+        resource_policy.apply(page, "login")
+    with metrics.span("login.form"):
+        login_success = instagram_login(page, username, password)
+
+    if login_success and session_dir is not None:
+        save_session(context, username, session_dir)
+
+    return page, login_success
\ No newline at end of file
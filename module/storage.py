@@ -0,0 +1,370 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+
+from module.stream import read_jsonl
+
+# 기본 SQLite 데이터베이스 파일
+DEFAULT_DB_PATH = "instagram_data.db"
+
+# 한 번의 executemany로 기록할 최대 댓글 수
+DEFAULT_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    content_type TEXT,
+    with_login INTEGER,
+    options TEXT
+);
+
+-- 게시물별 최신 상태 (수집할 때마다 갱신)
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    username TEXT,
+    post_date TEXT,
+    description TEXT,
+    url TEXT,
+    content_type TEXT,
+    likes INTEGER,
+    comments_count INTEGER,
+    views TEXT,
+    collected_at TEXT,
+    last_run_id INTEGER REFERENCES runs(run_id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_username ON posts(username);
+CREATE INDEX IF NOT EXISTS idx_posts_collected_at ON posts(collected_at);
+
+-- 실행별 게시물 수치 이력
+CREATE TABLE IF NOT EXISTS post_snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    post_id TEXT NOT NULL,
+    collected_at TEXT NOT NULL,
+    likes INTEGER,
+    comments_count INTEGER,
+    views TEXT,
+    comments_collected INTEGER,
+    PRIMARY KEY (run_id, post_id)
+);
+CREATE INDEX IF NOT EXISTS idx_post_snapshots_post ON post_snapshots(post_id, collected_at);
+
+-- 게시물별 댓글 (작성자 + 내용 + 작성 시각 digest인 comment_id로 실행 간 같은 댓글을 식별)
+CREATE TABLE IF NOT EXISTS comments (
+    post_id TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    author TEXT,
+    content TEXT,
+    date TEXT,
+    likes TEXT,
+    first_seen_at TEXT,
+    last_seen_at TEXT,
+    first_run_id INTEGER,
+    last_run_id INTEGER,
+    PRIMARY KEY (post_id, comment_id)
+);
+CREATE INDEX IF NOT EXISTS idx_comments_author ON comments(author);
+CREATE INDEX IF NOT EXISTS idx_comments_last_seen ON comments(last_seen_at);
+
+-- 실행별 댓글 좋아요 수 이력
+CREATE TABLE IF NOT EXISTS comment_snapshots (
+    run_id INTEGER NOT NULL,
+    post_id TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    likes TEXT,
+    PRIMARY KEY (run_id, post_id, comment_id)
+);
+"""
+
+# comment_key(작성자 + 내용 해시)를 키로 쓰던 이전 스키마를 comment_id 키로 옮기는 마이그레이션
+# 같은 comment_id로 합쳐지는 행은 가장 최근에 본 행을 유지
+MIGRATE_COMMENT_KEY = """
+BEGIN;
+DROP INDEX IF EXISTS idx_comments_author;
+DROP INDEX IF EXISTS idx_comments_last_seen;
+ALTER TABLE comments RENAME TO comments_legacy;
+ALTER TABLE comment_snapshots RENAME TO comment_snapshots_legacy;
+""" + SCHEMA + """
+INSERT OR IGNORE INTO comments (post_id, comment_id, author, content, date, likes,
+                                first_seen_at, last_seen_at, first_run_id, last_run_id)
+    SELECT post_id, COALESCE(comment_id, comment_key), author, content, date, likes,
+           first_seen_at, last_seen_at, first_run_id, last_run_id
+    FROM comments_legacy ORDER BY last_seen_at DESC;
+INSERT OR IGNORE INTO comment_snapshots (run_id, post_id, comment_id, likes)
+    SELECT s.run_id, s.post_id, COALESCE(c.comment_id, s.comment_key), s.likes
+    FROM comment_snapshots_legacy s
+    LEFT JOIN comments_legacy c ON c.post_id = s.post_id AND c.comment_key = s.comment_key;
+DROP TABLE comment_snapshots_legacy;
+DROP TABLE comments_legacy;
+COMMIT;
+"""
+
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def comment_key(author, content):
+    """
+    실행이 달라도 같은 댓글이면 같은 값이 되는 (작성자, 내용) 해시
+
+    comment_id가 없는 결과(이전 형식)의 댓글과 이전 스키마에서 옮긴 행의 키로 사용
+    """
+    raw = f"{author}\x00{content}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_comments(result_data):
+    """
+    결과 데이터의 댓글을 (comment_id, comment_data)로 순회 (스트림 모드면 JSONL 파일에서 읽음)
+
+    체크포인트에서 이어서 수집한 결과는 댓글이 여러 JSONL 파일(metadata의 comments_files)에 나뉘어 있으므로
+    모든 파일을 순서대로 읽고, 여러 파일에 기록된 같은 댓글은 comment_id 기준으로 한 번만 반환
+    """
+    comments = result_data.get("comments")
+    if comments:
+        yield from comments.items()
+        return
+
+    metadata = result_data.get("metadata", {})
+    paths = list(metadata.get("comments_files") or [])
+    if metadata.get("comments_file") and metadata["comments_file"] not in paths:
+        paths.append(metadata["comments_file"])
+
+    seen_ids = set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for record in read_jsonl(path):
+            if record.get("type") != "comment":
+                continue
+            comment_id = record.get("comment_id")
+            if comment_id is not None:
+                if comment_id in seen_ids:
+                    continue
+                seen_ids.add(comment_id)
+            yield comment_id, record
+
+
+class SqliteStore:
+    """
+    수집 결과를 SQLite 테이블(posts, post_snapshots, comments, comment_snapshots)에 upsert하는 클래스
+
+    실행(run)마다 runs 테이블에 행을 만들고, 게시물 수치와 댓글 좋아요 수는 실행별 이력으로 남김
+    게시물 하나의 기록은 하나의 트랜잭션으로 처리하고 댓글은 batch_size 단위로 executemany 사용
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            batch_size: 한 번에 기록할 최대 댓글 수
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """이전 스키마(comments가 comment_key 키)의 데이터베이스를 comment_id 키로 변환"""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(comments)")}
+        if "comment_key" in columns:
+            self.conn.executescript(MIGRATE_COMMENT_KEY)
+
+    def start_run(self, content_type=None, with_login=None, options=None):
+        """
+        새 실행을 기록하는 함수
+
+        Returns:
+            int: 실행 ID
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, content_type, with_login, options) VALUES (?, ?, ?, ?)",
+                (_now(), content_type, None if with_login is None else int(with_login),
+                 json.dumps(options, ensure_ascii=False) if options else None)
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id):
+        """실행 종료 시각 기록"""
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (_now(), run_id))
+
+    def save_result(self, result_data, run_id):
+        """
+        게시물 하나의 수집 결과(post_info, 조회수, 댓글)를 저장하는 함수
+
+        Args:
+            result_data: crawler.py 결과 데이터 (post_info, comments, metadata)
+            run_id: start_run()으로 만든 실행 ID
+
+        Returns:
+            int: 기록한 댓글 수
+        """
+        post_info = result_data.get("post_info")
+        if not post_info or not post_info.get("post_id"):
+            return 0
+        post_id = post_info["post_id"]
+        metadata = result_data.get("metadata", {})
+        collected_at = post_info.get("collected_at") or _now()
+        seen_at = _now()
+        views = post_info.get("views")
+        views = None if views is None else str(views)
+
+        written = 0
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO posts (post_id, username, post_date, description, url, content_type,
+                                   likes, comments_count, views, collected_at, last_run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(post_id) DO UPDATE SET
+                    username = COALESCE(excluded.username, posts.username),
+                    post_date = COALESCE(excluded.post_date, posts.post_date),
+                    description = excluded.description,
+                    url = excluded.url,
+                    content_type = excluded.content_type,
+                    likes = excluded.likes,
+                    comments_count = excluded.comments_count,
+                    views = COALESCE(excluded.views, posts.views),
+                    collected_at = excluded.collected_at,
+                    last_run_id = excluded.last_run_id
+                """,
+                (post_id, post_info.get("username"), post_info.get("post_date"), post_info.get("description"),
+                 post_info.get("url"), post_info.get("content_type"), post_info.get("likes"),
+                 post_info.get("comments_count"), views, collected_at, run_id)
+            )
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO post_snapshots
+                    (run_id, post_id, collected_at, likes, comments_count, views, comments_collected)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (run_id, post_id, collected_at, post_info.get("likes"), post_info.get("comments_count"),
+                 views, metadata.get("comments_collected"))
+            )
+
+            batch = []
+            for comment_id, comment_data in iter_comments(result_data):
+                author = comment_data.get("author")
+                content = comment_data.get("content")
+                likes = comment_data.get("likes")
+                if comment_id is None:
+                    comment_id = comment_key(author, content)
+                batch.append((post_id, str(comment_id), author, content,
+                              comment_data.get("date"), None if likes is None else str(likes),
+                              seen_at, seen_at, run_id, run_id))
+                if len(batch) >= self.batch_size:
+                    written += self._write_comments(batch)
+                    batch = []
+            if batch:
+                written += self._write_comments(batch)
+        return written
+
+    def _write_comments(self, rows):
+        """댓글 행 묶음을 upsert하고 실행별 좋아요 이력을 추가"""
+        self.conn.executemany(
+            """
+            INSERT INTO comments (post_id, comment_id, author, content, date, likes,
+                                  first_seen_at, last_seen_at, first_run_id, last_run_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(post_id, comment_id) DO UPDATE SET
+                date = COALESCE(excluded.date, comments.date),
+                likes = excluded.likes,
+                last_seen_at = excluded.last_seen_at,
+                last_run_id = excluded.last_run_id
+            """,
+            rows
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO comment_snapshots (run_id, post_id, comment_id, likes) VALUES (?, ?, ?, ?)",
+            [(row[8], row[0], row[1], row[5]) for row in rows]
+        )
+        return len(rows)
+
+    def known_comment_ids(self, post_id):
+        """게시물에 대해 이미 저장된 댓글 ID (델타 수집에서 기존 댓글 판별용)"""
+        rows = self.conn.execute(
+            "SELECT comment_id FROM comments WHERE post_id = ?", (post_id,)
+        ).fetchall()
+        return {row["comment_id"] for row in rows}
+
+    def comments_by_author(self, author):
+        """작성자의 모든 게시물 댓글 (최근에 본 순서)"""
+        rows = self.conn.execute(
+            "SELECT * FROM comments WHERE author = ? ORDER BY last_seen_at DESC", (author,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_post(self, post_id):
+        """게시물의 최신 정보 (없으면 None)"""
+        row = self.conn.execute("SELECT * FROM posts WHERE post_id = ?", (post_id,)).fetchone()
+        return dict(row) if row else None
+
+    def post_history(self, post_id):
+        """게시물의 실행별 수치 이력 (수집 시각 순서)"""
+        rows = self.conn.execute(
+            "SELECT * FROM post_snapshots WHERE post_id = ? ORDER BY collected_at", (post_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def save_to_sqlite(data, db_path=DEFAULT_DB_PATH, logger=None, run_id=None, store=None):
+    """
+    save_to_json과 같은 결과 데이터를 SQLite에 저장하는 함수
+
+    Args:
+        data: 게시물 하나의 결과 데이터
+        db_path: SQLite 데이터베이스 파일 경로 (store가 없을 때 사용)
+        logger: 로거 인스턴스
+        run_id: 실행 ID (없으면 이 호출만으로 실행 하나를 기록)
+        store: 재사용할 SqliteStore (없으면 열고 닫음)
+
+    Returns:
+        str: 데이터베이스 경로 또는 실패 시 None
+    """
+    own_store = store is None
+    try:
+        if own_store:
+            store = SqliteStore(db_path)
+        own_run = run_id is None
+        if own_run:
+            metadata = data.get("metadata", {})
+            run_id = store.start_run(metadata.get("content_type"), metadata.get("with_login"))
+        written = store.save_result(data, run_id)
+        if own_run:
+            store.finish_run(run_id)
+
+        message = f"{store.db_path} 데이터베이스에 저장 완료 (run {run_id}, 댓글 {written}개)"
+        if logger is not None:
+            logger.info(message)
+        print(message)
+        return store.db_path
+    except sqlite3.Error as e:
+        if logger is not None:
+            logger.error(f"SQLite 저장 중 에러 발생: {str(e)}")
+        print(f"SQLite 저장 중 에러 발생: {e}")
+        return None
+    finally:
+        if own_store and store is not None:
+            store.close()
\ No newline at end of file
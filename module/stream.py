@@ -0,0 +1,120 @@
+import datetime
+import json
+import os
+import time
+
+
+class JsonlWriter:
+    """
+    수집 결과를 JSON Lines 파일에 한 줄씩 추가하는 클래스
+
+    레코드는 즉시 파일 버퍼에 기록되고, flush_interval(초) 또는 flush_every(건) 중 먼저 도달한 시점에
+    디스크로 flush되므로 수집 중 프로세스가 종료되어도 그때까지의 레코드는 남음
+    (새 레코드가 없는 동안에는 flush_if_due()를 호출하는 시점에 시간 간격을 확인함. 댓글 수집은 스크롤 대기마다 호출)
+
+    레코드 형식: {"type": "post_info" | "comment" | "metadata", "written_at": ..., ...}
+    """
+
+    def __init__(self, path, flush_interval=1.0, flush_every=50, fsync=False):
+        """
+        Args:
+            path: 출력 JSONL 파일 경로 (이미 있으면 이어서 기록)
+            flush_interval: flush 간격 (초, 0이면 레코드마다 flush)
+            flush_every: 이 건수만큼 쌓이면 시간과 관계없이 flush
+            fsync: flush 시 os.fsync까지 수행할지 여부 (OS 장애까지 대비할 때)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.records_written = 0
+        self._pending = 0
+        self._last_flush = time.time()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record_type, data):
+        """
+        레코드 한 줄을 기록하는 함수
+
+        Args:
+            record_type: 레코드 종류 ('post_info', 'comment', 'metadata' 등)
+            data: 레코드 본문 딕셔너리
+        """
+        record = {"type": record_type, "written_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        record.update(data)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.records_written += 1
+        self._pending += 1
+
+        if self._pending >= self.flush_every:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        """
+        flush되지 않은 레코드가 있고 마지막 flush 후 flush_interval이 지났으면 flush하는 함수
+
+        Returns:
+            bool: flush했으면 True
+        """
+        if self._pending and time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+            return True
+        return False
+
+    def write_comment(self, comment_id, comment_data):
+        """댓글 레코드 기록"""
+        self.write("comment", {"comment_id": comment_id, **comment_data})
+
+    def flush(self):
+        """버퍼를 디스크로 flush"""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.time()
+
+    def close(self):
+        """남은 레코드를 flush하고 파일을 닫음"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_jsonl(path):
+    """
+    JSONL 파일의 레코드를 한 줄씩 읽어 반환하는 제너레이터 (파일 전체를 메모리에 올리지 않음)
+
+    비정상 종료로 마지막 줄이 잘린 경우 그 줄만 무시하고, 파일 중간의 잘못된 줄은 ValueError 발생
+
+    Args:
+        path: JSONL 파일 경로
+
+    Yields:
+        dict: 레코드 딕셔너리
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        broken_line = None
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if broken_line is not None:
+                raise ValueError(f"{path}:{broken_line}: invalid JSON line")
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 마지막 줄인지는 다음 줄을 읽어야 알 수 있으므로 판단을 미룸
+                broken_line = line_number
+                continue
+            yield record
\ No newline at end of file
@@ -0,0 +1,222 @@
+from collections import deque
+import multiprocessing
+import queue
+import traceback
+
+# 작업 큐 종료 신호
+STOP = None
+
+# 결과 큐를 기다리는 간격 (초, 이 간격마다 워커 생존 여부 확인)
+POLL_INTERVAL = 1.0
+
+
+def _worker_main(worker_id, task_queue, result_queue, setup, crawl, options):
+    """
+    워커 프로세스 본체
+
+    setup(options)으로 자신만의 브라우저(및 로그인 페이지)를 준비하고, 부모가 이 워커의 작업 큐에 넣어 주는
+    URL을 하나씩 처리해 crawl(state, url, options)의 결과를 결과 큐로 바로 보냄
+    어느 워커가 어떤 URL을 처리할지는 부모가 정함 (준비/결과 메시지를 보낸 유휴 워커에 다음 URL 배정)
+
+    메시지 형식: (종류, worker_id, 내용)
+    - ("ready", id, {"login": bool}): 준비 완료 (다음 URL을 받을 수 있음)
+    - ("result", id, {"url", "attempt", "result_data", "error"}): URL 처리 결과 (다음 URL을 받을 수 있음)
+    - ("exit", id, {"error"}): 워커 종료 (부모가 처리 중이던 URL을 다시 배정)
+    """
+    state = None
+    error = None
+    try:
+        state = setup({**options, "worker_id": worker_id})
+        result_queue.put(("ready", worker_id, {"login": state.get("page") is not None}))
+
+        while True:
+            task = task_queue.get()
+            if task is STOP:
+                break
+            url, attempt = task
+
+            result_data = None
+            task_error = None
+            try:
+                result_data = crawl(state, url, options)
+            except Exception as e:
+                task_error = f"{type(e).__name__}: {e}"
+            result_queue.put(("result", worker_id, {
+                "url": url, "attempt": attempt, "result_data": result_data, "error": task_error
+            }))
+    except Exception:
+        error = traceback.format_exc(limit=3)
+    finally:
+        if state is not None and state.get("close"):
+            try:
+                state["close"]()
+            except Exception:
+                pass
+        result_queue.put(("exit", worker_id, {"error": error}))
+
+
+class ShardedCrawl:
+    """
+    URL 목록을 여러 워커 프로세스에 나눠 수집하는 클래스
+
+    워커마다 별도의 프로세스와 브라우저를 사용하므로 sync API의 IPC/JSON 처리가 한 프로세스의 CPU에 묶이지 않음
+    부모가 URL을 먼저 끝난(유휴) 워커에 하나씩 배정하고, 결과는 처리되는 즉시 부모 프로세스로 전달됨
+    실패한 URL(예외 또는 post_info 없음)은 살아 있는 다른 워커에 배정해 max_attempts까지 다시 시도
+
+    setup과 crawl은 워커 프로세스에서 실행되므로 모듈 최상위 함수여야 함 (spawn 방식으로 전달)
+    """
+
+    def __init__(self, setup, crawl, workers=4, max_attempts=2, options=None, mp_context=None):
+        """
+        Args:
+            setup: options -> state 딕셔너리 (browser, page, close 등)를 만드는 함수
+            crawl: (state, url, options) -> result_data를 반환하는 함수
+            workers: 워커 프로세스 수
+            max_attempts: URL 하나를 시도하는 최대 횟수
+            options: 워커에 전달할 옵션 (pickle 가능한 값만)
+            mp_context: Queue/Process를 제공하는 multiprocessing 컨텍스트 (없으면 spawn, 테스트에서는 스레드 기반 대역)
+        """
+        self.setup = setup
+        self.crawl = crawl
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.options = options or {}
+        self.mp_context = mp_context
+        self.stats = {"retried": 0, "worker_deaths": 0, "workers": {}}
+
+    def run(self, urls):
+        """
+        워커를 실행하고 URL별 최종 결과를 도착하는 대로 반환하는 제너레이터
+
+        Yields:
+            dict: {"url", "result_data", "error", "worker", "attempts"}
+        """
+        context = self.mp_context or multiprocessing.get_context("spawn")
+        result_queue = context.Queue()
+
+        processes = {}
+        task_queues = {}
+        for worker_id in range(self.workers):
+            task_queues[worker_id] = context.Queue()
+            process = context.Process(
+                target=_worker_main,
+                args=(worker_id, task_queues[worker_id], result_queue, self.setup, self.crawl, self.options),
+                name=f"crawl-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            processes[worker_id] = process
+            self.stats["workers"][worker_id] = {"processed": 0, "failed": 0, "login": None}
+
+        # 배정 대기 중인 (url, attempt, 피할 워커) - 실패한 URL은 실패한 워커를 피해 다시 배정
+        pending = deque((url, 1, None) for url in urls)
+        outstanding = {url: 1 for url in urls}
+        in_flight = {}
+        idle = set()
+        alive = set(processes)
+
+        def next_task(worker_id):
+            # 이 워커가 맡을 수 있는 첫 URL (피할 워커로 지정되었어도 다른 워커가 모두 종료되었으면 직접 처리)
+            others_alive = bool(alive - {worker_id})
+            for task in pending:
+                if task[2] != worker_id or not others_alive:
+                    pending.remove(task)
+                    return task
+            return None
+
+        def dispatch():
+            for worker_id in sorted(idle):
+                task = next_task(worker_id)
+                if task is None:
+                    continue
+                url, attempt, _ = task
+                idle.discard(worker_id)
+                in_flight[worker_id] = (url, attempt)
+                task_queues[worker_id].put((url, attempt))
+
+        def mark_dead(worker_id):
+            alive.discard(worker_id)
+            idle.discard(worker_id)
+
+        def lost(worker_id):
+            # 처리 중이던 URL을 잃은 경우 다른 워커에 다시 배정하거나, 더 시도할 수 없으면 실패 결과 반환
+            url, attempt = in_flight.pop(worker_id, (None, None))
+            if url is None:
+                return None
+            if attempt < self.max_attempts and alive:
+                retry(url, attempt, worker_id)
+                return None
+            outstanding.pop(url, None)
+            return {"url": url, "result_data": None, "error": "worker exited", "worker": worker_id, "attempts": attempt}
+
+        def retry(url, attempt, worker_id):
+            outstanding[url] = attempt + 1
+            pending.append((url, attempt + 1, worker_id))
+            self.stats["retried"] += 1
+
+        try:
+            while outstanding and alive:
+                dispatch()
+                try:
+                    kind, worker_id, payload = result_queue.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # 메시지 없이 종료된 워커(강제 종료 등)가 처리 중이던 URL을 다시 배정
+                    for worker_id in list(alive):
+                        if not processes[worker_id].is_alive():
+                            mark_dead(worker_id)
+                            self.stats["worker_deaths"] += 1
+                            failure = lost(worker_id)
+                            if failure is not None:
+                                yield failure
+                    continue
+
+                if kind == "ready":
+                    self.stats["workers"][worker_id]["login"] = payload["login"]
+                    idle.add(worker_id)
+                elif kind == "result":
+                    in_flight.pop(worker_id, None)
+                    idle.add(worker_id)
+                    worker_stats = self.stats["workers"][worker_id]
+                    worker_stats["processed"] += 1
+                    result_data = payload["result_data"]
+                    failed = payload["error"] is not None or not (result_data and result_data.get("post_info"))
+                    if failed:
+                        worker_stats["failed"] += 1
+                        if payload["attempt"] < self.max_attempts:
+                            print(f"Worker {worker_id} failed on {payload['url']} "
+                                  f"(attempt {payload['attempt']}); retrying on another worker")
+                            retry(payload["url"], payload["attempt"], worker_id)
+                            continue
+                    outstanding.pop(payload["url"], None)
+                    yield {"url": payload["url"], "result_data": result_data, "error": payload["error"],
+                           "worker": worker_id, "attempts": payload["attempt"]}
+                elif kind == "exit":
+                    mark_dead(worker_id)
+                    if payload.get("error"):
+                        self.stats["workers"][worker_id]["error"] = payload["error"]
+                        print(f"Worker {worker_id} stopped with an error:\n{payload['error']}")
+                    failure = lost(worker_id)
+                    if failure is not None:
+                        yield failure
+        finally:
+            for task_queue in task_queues.values():
+                task_queue.put(STOP)
+            for process in processes.values():
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
+
+        # 모든 워커가 종료되어 처리하지 못한 URL은 실패 결과로 반환
+        self.stats["unprocessed"] = len(outstanding)
+        for url, attempt in list(outstanding.items()):
+            yield {"url": url, "result_data": None, "error": "no live workers", "worker": None, "attempts": attempt}
+
+    def summary(self):
+        """워커별 처리/실패 수와 재시도 횟수 요약"""
+        return {
+            "workers": self.workers,
+            "retried": self.stats["retried"],
+            "worker_deaths": self.stats["worker_deaths"],
+            "unprocessed": self.stats.get("unprocessed", 0),
+            "per_worker": {str(worker_id): stats for worker_id, stats in self.stats["workers"].items()},
+        }
\ No newline at end of file
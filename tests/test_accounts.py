@@ -0,0 +1,224 @@
+import pytest
+
+from module.accounts import AccountChallenged, AccountPool, TokenBucket, detect_challenge
+
+
+class FakeClock:
+    """sleep()이 실제로 기다리지 않고 시각만 앞당기는 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+
+class FakePage:
+    def __init__(self, username, texts=None):
+        self.username = username
+        self.url = "about:blank"
+        self.visited = []
+        self.context = FakeContext()
+        # selector → 해당 요소의 innerText (CHALLENGE_TEXT_JS 대신 selector 목록으로 찾음)
+        self.texts = texts or {}
+
+    def goto(self, url, **kwargs):
+        self.url = url
+        self.visited.append(url)
+        return None
+
+    def evaluate(self, script, arg=None):
+        if arg is None:
+            return None
+        markers, selector = arg
+        for part in selector.split(", "):
+            text = self.texts.get(part, "")
+            for marker in markers:
+                if marker in text:
+                    return marker
+        return None
+
+
+class FakeLogin:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.pages = {}
+
+    def __call__(self, browser, username, password, session_dir, resource_policy):
+        page = FakePage(username)
+        self.pages.setdefault(username, []).append(page)
+        return page, username not in self.failing
+
+
+def test_token_bucket_allows_burst_then_waits():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(2.0)
+
+    assert bucket.acquire() == pytest.approx(2.0)
+    assert clock.sleeps == [pytest.approx(2.0)]
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        bucket.try_acquire()
+
+    clock.now = 100.0
+
+    assert bucket.wait_time() == 0.0
+    assert bucket.tokens == 3
+
+
+def _pool(clock, login, usernames=("alice", "bob"), **kwargs):
+    return AccountPool([(name, "pw") for name in usernames], navigations_per_minute=6, burst=1,
+                       login=login, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_pool_spreads_posts_across_accounts():
+    clock = FakeClock()
+    login = FakeLogin()
+    pool = _pool(clock, login)
+    urls = [f"https://www.instagram.com/p/{i}/" for i in range(4)]
+
+    for url, page in pool.assign(None, urls):
+        page.goto(url)
+
+    assert login.pages["alice"][0].visited == [urls[0], urls[2]]
+    assert login.pages["bob"][0].visited == [urls[1], urls[3]]
+    # 한 계정이라면 세 번 기다려야 하지만, 번갈아 배정하면 alice가 기다리는 동안 bob의 토큰도 채워짐
+    assert clock.sleeps == [pytest.approx(10.0)]
+    summary = pool.summary()
+    assert summary["accounts"]["alice"]["navigations"] == 2
+    assert summary["accounts"]["alice"]["wait_seconds"] == 10.0
+    assert summary["accounts"]["bob"]["wait_seconds"] == 0.0
+
+
+def test_pool_requeues_challenged_post_to_another_account():
+    clock = FakeClock()
+    login = FakeLogin()
+    pool = _pool(clock, login, cooldown=60)
+    url = "https://www.instagram.com/p/1/"
+    results = []
+
+    for assigned_url, page in pool.assign(None, [url]):
+        try:
+            if page.username == "alice":
+                page.goto("https://www.instagram.com/challenge/")
+            page.goto(assigned_url)
+            pool.raise_if_challenged()
+            results.append((assigned_url, page.username))
+        except AccountChallenged as e:
+            assert e.reason == "challenge"
+            assert pool.requeue(assigned_url, e)
+
+    assert results == [(url, "bob")]
+    alice = pool.accounts[0]
+    assert alice.cooldown_until == pytest.approx(60.0)
+    assert alice.page is None
+    assert login.pages["alice"][0].context.closed
+    assert pool.summary()["requeued"] == 1
+    assert pool.summary()["accounts"]["alice"]["challenges"] == 1
+
+
+def test_pool_waits_for_cooldown_when_every_account_rests():
+    clock = FakeClock()
+    login = FakeLogin()
+    pool = _pool(clock, login, usernames=("alice",), cooldown=60, max_attempts=2)
+    url = "https://www.instagram.com/p/1/"
+    attempts = 0
+
+    for assigned_url, page in pool.assign(None, [url]):
+        attempts += 1
+        if attempts == 1:
+            pool.requeue(assigned_url, AccountChallenged("alice", "rate_limited"))
+            continue
+        page.goto(assigned_url)
+
+    assert attempts == 2
+    assert clock.sleeps[0] == pytest.approx(60.0)
+    assert len(login.pages["alice"]) == 2
+    assert login.pages["alice"][1].visited == [url]
+
+
+def test_pool_gives_up_after_max_attempts():
+    clock = FakeClock()
+    pool = _pool(clock, FakeLogin(), max_attempts=1)
+    url = "https://www.instagram.com/p/1/"
+
+    for assigned_url, page in pool.assign(None, [url]):
+        assert not pool.requeue(assigned_url, AccountChallenged(page.username, "challenge"))
+
+    assert pool.summary()["requeued"] == 0
+
+
+def test_pool_skips_accounts_that_fail_to_log_in():
+    clock = FakeClock()
+    pool = _pool(clock, FakeLogin(failing={"alice"}))
+    urls = ["https://www.instagram.com/p/1/", "https://www.instagram.com/p/2/"]
+
+    assigned = [(url, page.username) for url, page in pool.assign(None, urls)]
+
+    assert assigned == [(urls[0], "bob"), (urls[1], "bob")]
+    assert pool.summary()["accounts"]["alice"]["disabled"]
+
+
+def test_pool_yields_no_page_without_usable_accounts():
+    clock = FakeClock()
+    pool = _pool(clock, FakeLogin(failing={"alice", "bob"}))
+    urls = ["https://www.instagram.com/p/1/"]
+
+    assert list(pool.assign(None, urls)) == [(urls[0], None)]
+
+
+def test_challenge_text_in_comments_is_ignored():
+    page = FakePage("alice", texts={"body": "댓글: Try Again Later 노래 좋아요"})
+    page.url = "https://www.instagram.com/p/1/"
+
+    assert detect_challenge(page, FakeResponse(200)) is None
+
+
+def test_challenge_text_in_dialog_is_detected():
+    page = FakePage("alice", texts={'[role="dialog"]': "Try Again Later\nWe restrict certain activity"})
+    page.url = "https://www.instagram.com/p/1/"
+
+    assert detect_challenge(page, FakeResponse(200)) == "rate_limited"
+
+
+def test_challenge_text_in_error_page_body_is_detected():
+    page = FakePage("alice", texts={"body": "Please wait a few minutes before you try again."})
+    page.url = "https://www.instagram.com/p/1/"
+
+    assert detect_challenge(page, FakeResponse(403)) == "rate_limited"
+    assert detect_challenge(page, FakeResponse(429)) == "rate_limited"
+
+
+def test_default_session_dir_matches_session_module():
+    pytest.importorskip("playwright")
+    from module import accounts, session
+
+    assert accounts.DEFAULT_SESSION_DIR == session.DEFAULT_SESSION_DIR
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from module.budget import LatencyBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimeoutError(Exception):
+    """Playwright의 TimeoutError처럼 이름으로 판별되는 예외"""
+
+
+class FakeAsyncPage:
+    def __init__(self, clock, failures=0, seconds=1.0):
+        self.clock = clock
+        self.failures = failures
+        self.seconds = seconds
+        self.timeouts = []
+
+    async def goto(self, url, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        self.clock.now += self.seconds
+        if len(self.timeouts) <= self.failures:
+            raise TimeoutError("navigation timed out")
+        return "response"
+
+
+def _budget(clock, **kwargs):
+    return LatencyBudget(path=None, min_samples=1, clock=clock, **kwargs)
+
+
+def test_goto_async_retries_with_doubled_timeout():
+    clock = FakeClock()
+    budget = _budget(clock, retries=1, floor_ms=1000)
+    budget.record("post", 1.0)
+    page = FakeAsyncPage(clock, failures=1)
+
+    assert asyncio.run(budget.goto_async(page, "https://www.instagram.com/p/1/", "post", timeout=30000)) == "response"
+
+    assert page.timeouts == [2000, 4000]
+    assert budget.stats_counts["retries"] == 1
+    assert budget.stats_counts["timeouts"] == 1
+
+
+def test_goto_async_raises_after_last_retry():
+    clock = FakeClock()
+    budget = _budget(clock, retries=1)
+    page = FakeAsyncPage(clock, failures=2)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(budget.goto_async(page, "https://www.instagram.com/p/1/", "post", timeout=5000))
+
+    assert len(page.timeouts) == 2
+
+
+def test_post_deadline_is_kept_per_task():
+    clock = FakeClock()
+    budget = _budget(clock, post_deadline=10)
+
+    async def crawl(deadline, started):
+        await started.wait()
+        budget.start_post(deadline)
+        await asyncio.sleep(0)
+        remaining = budget.remaining()
+        budget.end_post()
+        return remaining
+
+    async def main():
+        started = asyncio.Event()
+        tasks = [asyncio.create_task(crawl(deadline, started)) for deadline in (5, 20)]
+        started.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == [5.0, 20.0]
+    assert budget.deadline is None
@@ -0,0 +1,71 @@
+from module.cache import PostInfoCache
+
+INFO = {
+    "post_id": "ABC123",
+    "username": "alice",
+    "post_date": "March 10, 2025",
+    "likes": 10,
+    "comments_count": 2,
+}
+
+
+def _expire(cache, post_id, fields, seconds):
+    for field in fields:
+        cache._memory[post_id][field]["stored_at"] -= seconds
+
+
+def test_lookup_returns_fresh_fields_and_stale_counts(tmp_path):
+    cache = PostInfoCache(cache_dir=str(tmp_path))
+    cache.put("ABC123", INFO)
+    _expire(cache, "ABC123", ["likes", "comments_count"], 3600)
+
+    fresh, stale = cache.lookup("ABC123")
+
+    assert sorted(stale) == ["comments_count", "likes"]
+    assert fresh == {"post_id": "ABC123", "username": "alice", "post_date": "March 10, 2025"}
+
+
+def test_put_refreshes_only_given_fields(tmp_path):
+    cache = PostInfoCache(cache_dir=str(tmp_path))
+    cache.put("ABC123", INFO)
+    _expire(cache, "ABC123", ["likes", "comments_count"], 3600)
+    cache.put("ABC123", {"likes": 11, "comments_count": 3})
+
+    fresh, stale = cache.lookup("ABC123")
+
+    assert stale == []
+    assert fresh["likes"] == 11
+    assert fresh["username"] == "alice"
+
+
+def test_entries_survive_on_disk(tmp_path):
+    PostInfoCache(cache_dir=str(tmp_path)).put("ABC123", INFO)
+    cache = PostInfoCache(cache_dir=str(tmp_path))
+
+    fresh, stale = cache.lookup("ABC123")
+
+    assert fresh == INFO and stale == []
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_hit_rate_counts_partial_lookups(tmp_path):
+    cache = PostInfoCache(cache_dir=str(tmp_path))
+    cache.put("ABC123", INFO)
+    cache.lookup("ABC123")
+    _expire(cache, "ABC123", ["likes"], 3600)
+    cache.lookup("ABC123")
+    cache.lookup("MISSING")
+
+    stats = cache.stats()
+
+    assert (stats["hits"], stats["partial"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == round(1 / 3, 3)
+
+
+def test_get_treats_stale_requested_fields_as_miss():
+    cache = PostInfoCache(cache_dir=None)
+    cache.put("ABC123", INFO)
+    _expire(cache, "ABC123", ["likes"], 3600)
+
+    assert cache.get("ABC123", fields=["username"])["username"] == "alice"
+    assert cache.get("ABC123") is None
\ No newline at end of file
@@ -0,0 +1,176 @@
+import datetime
+import json
+
+import pytest
+
+from module.capture import CommentResponseCollector, parse_comment_payload
+
+CREATED_AT = 1741575600
+
+
+def _comment(pk, username, text, likes=0, **extra):
+    return {
+        "pk": pk,
+        "text": text,
+        "created_at": CREATED_AT,
+        "comment_like_count": likes,
+        "user": {"username": username, "pk": "9" + pk},
+        **extra,
+    }
+
+
+def test_parse_graphql_edges_skips_nested_replies():
+    payload = {
+        "data": {
+            "xdt_api__v1__media__media_id__comments__connection": {
+                "edges": [
+                    {"node": _comment("101", "alice", "첫 댓글", likes=3, child_comments=[
+                        _comment("201", "bob", "답글"),
+                    ])},
+                    {"node": _comment("102", "carol", "두 번째 댓글", preview_child_comments={
+                        "edges": [{"node": _comment("202", "dave", "미리보기 답글")}],
+                    })},
+                ],
+                "page_info": {"has_next_page": True, "end_cursor": "abc"},
+            }
+        }
+    }
+
+    comments = parse_comment_payload(payload)
+
+    assert [pk for pk, _ in comments] == ["101", "102"]
+    assert comments[0][1] == {
+        "author": "alice",
+        "content": "첫 댓글",
+        "date": datetime.datetime.fromtimestamp(CREATED_AT).strftime("%Y-%m-%d %H:%M:%S"),
+        "likes": "3",
+        "timestamp": CREATED_AT,
+    }
+
+
+def test_parse_rest_comments():
+    payload = {
+        "comments": [
+            {"id": 7, "text": "rest", "created_at": "bad", "like_count": None, "user": {}},
+        ],
+        "status": "ok",
+    }
+
+    comments = parse_comment_payload(payload)
+
+    assert comments == [("7", {
+        "author": "작성자 미상",
+        "content": "rest",
+        "date": "",
+        "likes": "0",
+        "timestamp": None,
+    })]
+
+
+def test_parse_ignores_non_comment_objects():
+    payload = {"data": {"user": {"pk": "1", "username": "alice"}, "caption": {"text": "캡션", "pk": "5"}}}
+
+    assert parse_comment_payload(payload) == []
+
+
+POST_URL = "https://www.instagram.com/p/ABC123/"
+POST_HTML = """<!DOCTYPE html><html><body><script>
+fetch('/api/v1/media/1/comments/?can_support_threading=true');
+fetch('/api/v1/feed/timeline/');
+</script></body></html>"""
+
+
+@pytest.fixture
+def page():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            pytest.skip(f"Chromium not available: {e}")
+        try:
+            yield browser.new_page()
+        finally:
+            browser.close()
+
+
+def _route_post(page, comments_payload):
+    """instagram.com 요청을 합성 게시물 페이지와 댓글 API 응답으로 대체"""
+    def handle(route):
+        url = route.request.url
+        if "/api/v1/media/1/comments" in url:
+            return route.fulfill(status=200, content_type="application/json", body=json.dumps(comments_payload))
+        if "/api/v1/" in url:
+            return route.fulfill(status=200, content_type="application/json", body=json.dumps({"status": "ok"}))
+        return route.fulfill(status=200, content_type="text/html", body=POST_HTML)
+    page.route("https://www.instagram.com/**", handle)
+
+
+def test_collector_drains_routed_comment_response(page):
+    payload = {"comments": [_comment("11", "alice", "첫 댓글", likes=2), _comment("12", "bob", "두 번째")]}
+    _route_post(page, payload)
+    collector = CommentResponseCollector(page).attach()
+
+    with page.expect_response(lambda response: "/comments" in response.url):
+        page.goto(POST_URL)
+    comments = collector.drain()
+
+    assert [(pk, comment["author"], comment["likes"]) for pk, comment in comments] == [
+        ("11", "alice", "2"), ("12", "bob", "0"),
+    ]
+    assert collector.responses_parsed == 1
+    assert collector.drain() == []
+
+    # 같은 댓글이 다시 응답되면 새 댓글로 반환하지 않음
+    with page.expect_response(lambda response: "/comments" in response.url):
+        page.evaluate("() => fetch('/api/v1/media/1/comments/')")
+    assert collector.drain() == []
+    collector.detach()
+
+
+def test_crawl_falls_back_to_dom_without_comment_response(page):
+    from benchmark.fixtures import FixtureSite
+    from benchmark.harness import install_fixture_routes
+    from module.comment import MOUNT_ID_JS, _CommentCrawl, _comments_xpath, _extract_comments_bulk
+
+    # 댓글이 모두 처음부터 렌더링되어 댓글 API 요청이 없는 게시물
+    site = FixtureSite(comments=5, tiles=1, load_delay_ms=0)
+    install_fixture_routes(page, site)
+    crawl = _CommentCrawl(site.post_url, capture_mode="network")
+    crawl.collector = CommentResponseCollector(page).attach()
+
+    page.goto(site.post_url)
+    network_comments = crawl.collector.drain()
+
+    assert network_comments == []
+    assert crawl.needs_dom()
+    extracted = _extract_comments_bulk(page, _comments_xpath(page.evaluate(MOUNT_ID_JS)))
+    added, _ = crawl.add_comments(network_comments, extracted)
+    assert added == 5
+    assert crawl.store.source_counts == {"dom": 5, "network": 0}
+    crawl.collector.detach()
+
+
+def test_crawl_skips_dom_once_comment_responses_arrive(page):
+    from benchmark.fixtures import FixtureSite
+    from benchmark.harness import install_fixture_routes
+    from module.comment import MOUNT_ID_JS, _CommentCrawl, _comments_xpath, _scroll_comments
+
+    # 처음 15개 이후의 댓글은 스크롤하면 댓글 API(page.route로 합성 응답)로 불러옴
+    site = FixtureSite(comments=30, tiles=1, load_delay_ms=0)
+    install_fixture_routes(page, site)
+    crawl = _CommentCrawl(site.post_url, capture_mode="network")
+    crawl.collector = CommentResponseCollector(page).attach()
+    page.goto(site.post_url)
+    comments_xpath = _comments_xpath(page.evaluate(MOUNT_ID_JS))
+
+    with page.expect_response(lambda response: "/comments" in response.url):
+        _scroll_comments(page, comments_xpath)
+    network_comments = crawl.collector.drain()
+
+    assert [comment["author"] for _, comment in network_comments] == [
+        comment["author"] for comment in site.comments[15:30]
+    ]
+    crawl.add_comments(network_comments, None)
+    assert not crawl.needs_dom()
+    crawl.collector.detach()
\ No newline at end of file
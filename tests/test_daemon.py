@@ -0,0 +1,123 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from module.daemon import CrawlDaemon
+
+POST_URL = "https://www.instagram.com/p/ABC123/"
+
+
+def fake_setup(options):
+    return {"page": object(), "close": options["closed"].set}
+
+
+def fake_crawl(state, job, options):
+    # 테스트가 release를 set할 때까지 작업 스레드를 붙잡아 두어 처리 중 상태를 관찰
+    options["started"].set()
+    if not options["release"].wait(5):
+        raise RuntimeError("test did not release the crawl")
+    if "FAIL" in job["url"]:
+        return {"post_info": None, "metadata": {"error": "post not found"}}
+    return {"post_info": {"url": job["url"], "type": job["type"]}, "comments": None}
+
+
+@pytest.fixture
+def daemon():
+    options = {"started": threading.Event(), "release": threading.Event(), "closed": threading.Event()}
+    daemon = CrawlDaemon(fake_setup, fake_crawl, options, port=0)
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield daemon
+    options["release"].set()
+    daemon.shutdown()
+    thread.join(timeout=5)
+    assert options["closed"].is_set()
+
+
+def _request(daemon, method, path, body=None, raw=None):
+    data = raw if raw is not None else (json.dumps(body).encode("utf-8") if body is not None else None)
+    request = urllib.request.Request(f"http://127.0.0.1:{daemon.port}{path}", data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_post_job_returns_202_and_result_after_crawl(daemon):
+    status, job = _request(daemon, "POST", "/jobs", {"url": POST_URL, "type": "post"})
+
+    assert status == 202
+    assert job["status"] == "queued" and job["type"] == "post"
+    daemon.options["release"].set()
+    status, finished = _request(daemon, "GET", f"/jobs/{job['job_id']}?wait=5")
+    assert status == 200
+    assert finished["status"] == "done"
+    assert finished["result_data"]["post_info"] == {"url": POST_URL, "type": "post"}
+
+
+def test_post_job_with_wait_returns_200_with_result(daemon):
+    daemon.options["release"].set()
+
+    status, job = _request(daemon, "POST", "/jobs", {"url": POST_URL, "wait": True})
+
+    assert status == 200
+    assert job["status"] == "done"
+    assert job["result_data"]["post_info"]["type"] == "reels"
+
+
+def test_failed_crawl_is_reported(daemon):
+    daemon.options["release"].set()
+
+    status, job = _request(daemon, "POST", "/jobs", {"url": "https://www.instagram.com/p/FAIL/", "wait": 5})
+
+    assert status == 200
+    assert job["status"] == "failed"
+    assert job["error"] == "post not found"
+    assert _request(daemon, "GET", "/status")[1]["failed"] == 1
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[1, 2]",
+    json.dumps({"url": "https://example.com/p/1/"}).encode("utf-8"),
+    json.dumps({"url": POST_URL, "type": "story"}).encode("utf-8"),
+    json.dumps({"url": POST_URL, "wait": "soon"}).encode("utf-8"),
+])
+def test_invalid_body_is_rejected(daemon, body):
+    status, response = _request(daemon, "POST", "/jobs", raw=body)
+
+    assert status == 400
+    assert "error" in response
+    assert _request(daemon, "GET", "/status")[1]["submitted"] == 0
+
+
+def test_get_job_wait_times_out_while_running(daemon):
+    _, job = _request(daemon, "POST", "/jobs", {"url": POST_URL})
+    assert daemon.options["started"].wait(5)
+
+    status, running = _request(daemon, "GET", f"/jobs/{job['job_id']}?wait=0.1")
+
+    assert status == 200
+    assert running["status"] == "running"
+    assert _request(daemon, "GET", "/jobs/999")[0] == 404
+    assert _request(daemon, "GET", f"/jobs/{job['job_id']}?wait=abc")[0] == 400
+
+
+def test_status_reports_queue_depth_and_in_flight(daemon):
+    job_ids = [_request(daemon, "POST", "/jobs", {"url": POST_URL})[1]["job_id"] for _ in range(3)]
+    assert daemon.options["started"].wait(5)
+
+    status = _request(daemon, "GET", "/status")[1]
+    assert (status["queue_depth"], status["in_flight"], status["submitted"]) == (2, 1, 3)
+    assert status["ready"] and status["login"]
+
+    daemon.options["release"].set()
+    for job_id in job_ids:
+        assert _request(daemon, "GET", f"/jobs/{job_id}?wait=5")[1]["status"] == "done"
+    status = _request(daemon, "GET", "/status")[1]
+    assert (status["queue_depth"], status["in_flight"], status["completed"]) == (0, 0, 3)
\ No newline at end of file
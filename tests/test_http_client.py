@@ -0,0 +1,126 @@
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from module.http_client import KeepAliveClient, extract_meta_tags
+
+OG_DESCRIPTION = "1,234 likes, 56 comments - alice on March 10, 2025: 테스트 게시물"
+POST_HTML = (
+    '<html><head>'
+    f'<meta property="og:description" content="{OG_DESCRIPTION}">'
+    '<meta name="description" content="desc">'
+    '</head><body></body></html>'
+)
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        body = POST_HTML.encode("utf-8")
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if self.path == "/old/":
+            self.send_response(302)
+            self.send_header("Location", "/p/ABC123/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/gzip/":
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        elif self.path == "/deflate/":
+            body = zlib.compress(body)
+            headers["Content-Encoding"] = "deflate"
+        elif self.path == "/raw-deflate/":
+            body = _raw_deflate(body)
+            headers["Content-Encoding"] = "deflate"
+
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.connections = set()
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    host, port = server.server_address
+    client = KeepAliveClient(base_url=f"http://{host}:{port}", timeout=5)
+    yield client
+    client.close()
+
+
+def test_reuses_connection(server, client):
+    for _ in range(5):
+        status, _, html = client.get("https://www.instagram.com/p/ABC123/")
+        assert status == 200
+        assert OG_DESCRIPTION in html
+
+    assert client.requests_sent == 5
+    assert client.connections_opened == 1
+    assert len(server.connections) == 1
+
+
+def test_follows_redirect_on_same_connection(client):
+    status, final_url, _ = client.get("https://www.instagram.com/old/")
+
+    assert status == 200
+    assert final_url == "https://www.instagram.com/p/ABC123/"
+    assert client.requests_sent == 2
+    assert client.connections_opened == 1
+
+
+@pytest.mark.parametrize("path", ["/gzip/", "/deflate/", "/raw-deflate/"])
+def test_decodes_compressed_body(client, path):
+    _, _, html = client.get("https://www.instagram.com" + path)
+
+    assert html == POST_HTML
+
+
+def test_fetch_post_info_http(client):
+    pytest.importorskip("playwright")
+    from module.getinfo import fetch_post_info_http
+
+    info = fetch_post_info_http("https://www.instagram.com/p/ABC123/", client=client)
+    fetch_post_info_http("https://www.instagram.com/p/ABC123/", client=client)
+
+    assert info["post_id"] == "ABC123"
+    assert info["likes"] == 1234
+    assert info["comments_count"] == 56
+    assert client.connections_opened == 1
+
+
+def test_extract_meta_tags():
+    meta = extract_meta_tags(POST_HTML)
+
+    assert meta == {"og:description": OG_DESCRIPTION, "description": "desc"}
+
+
+def test_extract_meta_tags_from_truncated_html():
+    meta = extract_meta_tags('<meta property="og:title" content="title"><meta property="og:desc')
+
+    assert meta["og:title"] == "title"
\ No newline at end of file
@@ -0,0 +1,121 @@
+import pytest
+
+# jobqueue는 URL 정규화를 위해 module.getinfo(Playwright)를 import함
+pytest.importorskip("playwright")
+
+from module.jobqueue import JobQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _queue(tmp_path, clock, **kwargs):
+    kwargs.setdefault("lease_timeout", 30)
+    kwargs.setdefault("backoff_base", 10)
+    kwargs.setdefault("backoff_max", 25)
+    return JobQueue(str(tmp_path / "queue.db"), clock=clock, **kwargs)
+
+
+def test_enqueue_dedupes_reel_and_post_urls(tmp_path):
+    with _queue(tmp_path, FakeClock()) as queue:
+        assert queue.enqueue("https://www.instagram.com/reel/ABC123/")
+        assert not queue.enqueue("https://www.instagram.com/p/ABC123/")
+        assert queue.enqueue_many(["https://www.instagram.com/p/ABC123/", "https://example.com/",
+                                   "https://www.instagram.com/p/DEF456/"]) == 1
+
+        assert queue.counts()["queued"] == 2
+        with pytest.raises(ValueError):
+            queue.enqueue("https://example.com/")
+
+
+def test_enqueue_only_raises_priority_of_queued_job(tmp_path):
+    with _queue(tmp_path, FakeClock()) as queue:
+        queue.enqueue("https://www.instagram.com/p/LOW/", content_type="post")
+        queue.enqueue("https://www.instagram.com/p/HIGH/", priority=5)
+
+        queue.enqueue("https://www.instagram.com/p/LOW/", priority=20)
+        queue.enqueue("https://www.instagram.com/p/HIGH/", priority=1)
+
+        priorities = {job["post_id"]: job["priority"] for job in queue.jobs()}
+        assert priorities == {"LOW": 20, "HIGH": 5}
+        assert queue.lease("w1")["post_id"] == "LOW"
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(tmp_path):
+    clock = FakeClock()
+    with _queue(tmp_path, clock) as queue:
+        queue.enqueue("https://www.instagram.com/p/ABC123/")
+        job = queue.lease("w1")
+        assert queue.lease("w2") is None
+        assert queue.next_available_in() == pytest.approx(30)
+
+        clock.now += 31
+        reclaimed = queue.lease("w2")
+
+        assert reclaimed["post_id"] == job["post_id"]
+        assert reclaimed["attempts"] == 2
+        assert queue.jobs()[0]["last_error"] == "lease expired"
+        # lease를 잃은 워커의 실패 기록은 무시됨
+        assert queue.fail("ABC123", "w1", "boom") is None
+        assert queue.jobs()[0]["lease_owner"] == "w2"
+
+
+def test_fail_backs_off_until_max_attempts(tmp_path):
+    clock = FakeClock()
+    with _queue(tmp_path, clock, max_attempts=3) as queue:
+        queue.enqueue("https://www.instagram.com/p/ABC123/")
+
+        delays = []
+        for _ in range(3):
+            job = queue.lease("w1")
+            assert queue.lease("w1") is None
+            delays.append(queue.fail(job["post_id"], "w1", "timeout"))
+            if delays[-1] is not None:
+                assert queue.lease("w1") is None
+                assert queue.counts()["delayed"] == 1
+                clock.now += delays[-1]
+
+        assert delays == [10, 20, None]
+        job = queue.jobs()[0]
+        assert (job["status"], job["attempts"], job["last_error"]) == ("failed", 3, "timeout")
+        assert queue.lease("w1") is None
+        assert queue.next_available_in() is None
+
+
+def test_backoff_is_capped(tmp_path):
+    clock = FakeClock()
+    with _queue(tmp_path, clock, max_attempts=5) as queue:
+        queue.enqueue("https://www.instagram.com/p/ABC123/")
+        delays = []
+        for _ in range(4):
+            queue.lease("w1")
+            delays.append(queue.fail("ABC123", "w1", "timeout"))
+            clock.now += delays[-1]
+
+        assert delays == [10, 20, 25, 25]
+
+
+def test_release_returns_job_without_using_an_attempt(tmp_path):
+    clock = FakeClock()
+    with _queue(tmp_path, clock, max_attempts=1) as queue:
+        queue.enqueue("https://www.instagram.com/p/ABC123/")
+        job = queue.lease("w1")
+
+        queue.release(job["post_id"], "w2")
+        assert queue.counts()["leased"] == 1
+
+        queue.release(job["post_id"], "w1")
+        assert queue.counts()["ready"] == 1
+
+        job = queue.lease("w2")
+        assert job["attempts"] == 1
+        queue.complete(job["post_id"], "w2", result_file="out.json")
+        done = queue.jobs(status="done")[0]
+        assert done["result_file"] == "out.json"
+        assert not queue.enqueue("https://www.instagram.com/p/ABC123/")
+        assert queue.enqueue("https://www.instagram.com/p/ABC123/", recrawl=True)
\ No newline at end of file
@@ -0,0 +1,82 @@
+from module.metrics import MetricsRecorder
+
+
+class Response:
+    def __init__(self, length):
+        self.headers = {"content-length": str(length)}
+
+
+class Page:
+    def __init__(self):
+        self.listeners = []
+        self.context = Context(self)
+
+    def on(self, event, callback):
+        self.listeners.append((event, callback))
+
+    def locator(self, selector):
+        return Locator(self)
+
+    def emit_response(self, length):
+        for event, callback in self.listeners:
+            if event == "response":
+                callback(Response(length))
+
+
+class Locator:
+    def __init__(self, page):
+        self.page = page
+
+
+class Context:
+    def __init__(self, page):
+        self._page = page
+
+    @property
+    def pages(self):
+        return [self._page]
+
+
+class Browser:
+    def __init__(self):
+        self.opened = []
+
+    def new_page(self):
+        page = Page()
+        self.opened.append(page)
+        return page
+
+
+# CountingProxy는 playwright 모듈의 객체만 감싸므로 가짜 객체도 같은 모듈 이름을 사용
+for cls in (Page, Locator, Context, Browser):
+    cls.__module__ = "playwright.sync_api._generated"
+
+
+def test_page_seen_through_several_paths_is_watched_once():
+    recorder = MetricsRecorder()
+    browser = recorder.instrument(Browser())
+
+    page = browser.new_page()
+    page.locator("div").page
+    page.context.pages
+    browser.new_page()
+
+    first, second = browser._target.opened
+    assert len(first.listeners) == 1
+    assert len(second.listeners) == 1
+
+    first.emit_response(100)
+    summary = recorder.summary()
+    assert summary["counters"]["responses"] == 1
+    assert summary["counters"]["bytes_received"] == 100
+
+
+def test_counts_round_trips_but_not_local_methods():
+    recorder = MetricsRecorder()
+    page = recorder.instrument(Browser()).new_page()
+
+    page.locator("div")
+    page.context.pages
+
+    calls = recorder.summary()["playwright_calls"]
+    assert calls == {"Browser.new_page": 1}
@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+
+from module.normalize import parse_comment_date, parse_count, parse_counts
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1,234", 1234),
+    ("좋아요 1,234개", 1234),
+    ("1.234.567", 1234567),
+    ("3.8만", 38000),
+    ("1,234만", 12340000),
+    ("1.2M views", 1200000),
+    ("12K", 12000),
+    ("2억", 200000000),
+    ("조회수 12,345회", 12345),
+    # 구분자 뒤가 세 자리가 아니면 소수점
+    ("1.5", 2),
+    ("1,2만", 12000),
+    ("1,234.5", 1234),
+    ("답글 달기", 0),
+    (42, 42),
+    ("", None),
+    (None, None),
+    ("좋아요", None),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+def test_parse_counts_matches_parse_count():
+    values = ["3.8만", "3.8만", None, "12K"]
+    assert parse_counts(values) == [38000, 38000, None, 12000]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3일 전", datetime.datetime(2025, 3, 7, 12, 0)),
+    ("5시간", datetime.datetime(2025, 3, 10, 7, 0)),
+    ("2 days ago", datetime.datetime(2025, 3, 8, 12, 0)),
+    ("3월 5일", datetime.datetime(2025, 3, 5)),
+    # 연도가 없는 날짜가 수집 시각 이후면 작년 날짜
+    ("12월 25일", datetime.datetime(2024, 12, 25)),
+    ("2023-01-02 03:04:05", datetime.datetime(2023, 1, 2, 3, 4, 5)),
+    ("알 수 없음", None),
+])
+def test_parse_comment_date(text, expected):
+    assert parse_comment_date(text, "2025-03-10 12:00:00") == expected
\ No newline at end of file
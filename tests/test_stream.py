@@ -0,0 +1,32 @@
+from module.stream import JsonlWriter, read_jsonl
+
+
+def _lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_flush_if_due_flushes_after_interval(tmp_path):
+    path = str(tmp_path / "comments.jsonl")
+    writer = JsonlWriter(path, flush_interval=60, flush_every=50)
+    writer.write_comment("c1", {"text": "hello"})
+
+    assert not writer.flush_if_due()
+    assert _lines(path) == []
+
+    # 새 레코드 없이 flush_interval이 지난 상황
+    writer._last_flush -= 60
+    assert writer.flush_if_due()
+    assert len(_lines(path)) == 1
+    assert not writer.flush_if_due()
+    writer.close()
+
+
+def test_flush_every_flushes_regardless_of_interval(tmp_path):
+    path = str(tmp_path / "comments.jsonl")
+    with JsonlWriter(path, flush_interval=60, flush_every=2) as writer:
+        writer.write_comment("c1", {"text": "a"})
+        writer.write_comment("c2", {"text": "b"})
+        assert len(_lines(path)) == 2
+
+    assert [record["comment_id"] for record in read_jsonl(path)] == ["c1", "c2"]
\ No newline at end of file
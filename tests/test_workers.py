@@ -0,0 +1,100 @@
+import queue
+import threading
+
+from module.workers import ShardedCrawl
+
+
+class ThreadContext:
+    """ShardedCrawl의 워커를 같은 프로세스의 스레드로 실행하는 multiprocessing 컨텍스트 대역"""
+
+    Queue = queue.Queue
+
+    def Process(self, target, args, name, daemon):
+        def run():
+            # 워커 프로세스의 종료(SystemExit)는 스레드 밖으로 내보내지 않음
+            try:
+                target(*args)
+            except SystemExit:
+                pass
+
+        return threading.Thread(target=run, name=name, daemon=daemon)
+
+
+def fake_setup(options):
+    if options["worker_id"] in options.get("broken_setup", ()):
+        raise RuntimeError("browser failed to start")
+    return {"worker_id": options["worker_id"], "page": object()}
+
+
+def fake_crawl(state, url, options):
+    calls = options["calls"]
+    worker_id = state["worker_id"]
+    first_try = url not in [called_url for _, called_url in calls]
+    calls.append((worker_id, url))
+    if first_try and url in options.get("die_on", ()):
+        # 워커가 도중에 종료된 상황 (crawl의 Exception 처리에 잡히지 않음)
+        raise SystemExit(1)
+    if first_try and url in options.get("fail_once", ()):
+        return {"post_info": None}
+    return {"post_info": {"post_id": url}, "worker": worker_id}
+
+
+def _run(urls, workers=2, max_attempts=2, **options):
+    options["calls"] = []
+    crawl = ShardedCrawl(fake_setup, fake_crawl, workers=workers, max_attempts=max_attempts, options=options,
+                         mp_context=ThreadContext())
+    results = {result["url"]: result for result in crawl.run(urls)}
+    return results, options["calls"], crawl.summary()
+
+
+def test_processes_every_url_once():
+    urls = [f"u{i}" for i in range(6)]
+
+    results, calls, summary = _run(urls, workers=3)
+
+    assert sorted(results) == urls
+    assert all(result["error"] is None and result["attempts"] == 1 for result in results.values())
+    assert sorted(url for _, url in calls) == urls
+    assert summary["retried"] == 0
+    assert sum(stats["processed"] for stats in summary["per_worker"].values()) == 6
+
+
+def test_failed_url_is_retried_on_another_worker():
+    results, calls, summary = _run(["a", "b", "c"], fail_once={"b"})
+
+    attempts = [worker_id for worker_id, url in calls if url == "b"]
+    assert len(attempts) == 2
+    assert attempts[0] != attempts[1]
+    assert results["b"]["attempts"] == 2
+    assert results["b"]["worker"] == attempts[1]
+    assert results["b"]["result_data"]["post_info"] == {"post_id": "b"}
+    assert summary["retried"] == 1
+
+
+def test_retry_stays_on_failed_worker_when_no_other_is_alive():
+    results, calls, summary = _run(["a", "b"], fail_once={"a"}, broken_setup={1})
+
+    assert [worker_id for worker_id, _ in calls] == [0, 0, 0]
+    assert results["a"]["attempts"] == 2
+    assert results["a"]["result_data"]["post_info"] == {"post_id": "a"}
+    assert "browser failed to start" in summary["per_worker"]["1"]["error"]
+
+
+def test_url_of_dead_worker_is_reassigned():
+    results, calls, summary = _run(["a", "b", "c"], die_on={"b"})
+
+    died, retried = [worker_id for worker_id, url in calls if url == "b"]
+    assert died != retried
+    assert results["b"]["worker"] == retried
+    assert results["b"]["attempts"] == 2
+    assert all(result["result_data"]["post_info"] for result in results.values())
+    assert [worker_id for worker_id, _ in calls if worker_id == died] == [died]
+
+
+def test_gives_up_after_max_attempts():
+    results, calls, summary = _run(["a"], workers=2, max_attempts=1, fail_once={"a"})
+
+    assert len(calls) == 1
+    assert results["a"]["attempts"] == 1
+    assert results["a"]["result_data"] == {"post_info": None}
+    assert summary["retried"] == 0